@@ -1,42 +1,104 @@
 #EC2 Instances collector module
+from aws_inventory.utils.boto_helpers import paginate, build_ec2_filters
 from aws_inventory.utils.common import get_name
-def collect_instances(ec2_client, sg_map):
+from aws_inventory.collectors.model import Instance
+
+
+def parse_instances(reservations):
+    """
+    Build Instance records from describe_instances reservations
+
+    Args:
+        reservations: iterable of raw reservations
+
+    Yields: Instance records with their subnet and security group IDs
+    """
+    for reservation in reservations:
+        for instance in reservation["Instances"]:
+            yield Instance(
+                id=instance["InstanceId"],
+                name=get_name(instance.get("Tags")),
+                type=instance["InstanceType"],
+                state=instance["State"]["Name"],
+                private_ip=instance.get("PrivateIpAddress"),
+                public_ip=instance.get("PublicIpAddress"),
+                subnet_id=instance.get("SubnetId"),
+                security_group_ids=[sg["GroupId"] for sg in instance.get("SecurityGroups", [])],
+            )
+
+
+def collect_instances(ec2_client, page_size=None, filters=None):
     """
-    Collect EC2 instances grouped by subnet
+    Collect EC2 instances
 
     Args: 
         ec2_client: boto3 EC2 client
-        sg_map: dictionary of security groups
+        page_size: number of instances requested per page
+        filters: inventory filters (VPC IDs, states, tags) applied server-side
 
-    Returns: dictionary: map of subnet ID to list of instances
+    Returns: list: Instance records with their subnet and security group IDs
+    """
+    reservations = paginate(
+        ec2_client, "describe_instances", "Reservations", page_size,
+        **build_ec2_filters(filters, with_states=True)
+    )
+    return list(parse_instances(reservations))
+
+
+def collect_instance_states(ec2_client, page_size=None):
+    """
+    Collect the ID and state of every instance
+
+    A much lighter call than describe_instances, used to detect whether the
+    instances of a region changed since the previous run.
+
+    Args: 
+        ec2_client: boto3 EC2 client
+        page_size: number of instances requested per page
+
+    Returns: dict: map of instance ID to state name
+    """
+    statuses = paginate(
+        ec2_client, "describe_instance_status", "InstanceStatuses", page_size,
+        IncludeAllInstances=True
+    )
+    return build_instance_states(statuses)
+
+
+def parse_instance_state(status):
+    """Return (instance ID, state name) from a raw describe_instance_status item"""
+    return status["InstanceId"], status["InstanceState"]["Name"]
+
+
+def build_instance_states(statuses):
+    """
+    Map instance IDs to state names from raw describe_instance_status items
+
+    Args:
+        statuses: iterable of raw instance statuses
+
+    Returns: dict: map of instance ID to state name
+    """
+    return dict(parse_instance_state(status) for status in statuses)
+
+
+def group_instances_by_subnet(instances):
+    """
+    Group instances by subnet
+
+    Instances keep only the IDs of their security groups; they are resolved
+    through RegionInventory.instance_security_groups when needed.
+
+    Args: 
+        instances: list of instances from collect_instances
+
+    Returns: dictionary: map of subnet ID to tuple of instances
     """
-    reservations = ec2_client.describe_instances()["Reservations"]
     instances_by_subnet = {}
-    
-    for reservation in reservations:
-        for instance in reservation["Instances"]:
-            subnet_id = instance.get("SubnetId")
-            if not subnet_id:
-                continue
-            
-            if subnet_id not in instances_by_subnet:
-                instances_by_subnet[subnet_id] = []
-            
-            # Get security groups with full details
-            instance_sgs = []
-            for sg in instance.get("SecurityGroups", []):
-                sg_id = sg["GroupId"]
-                if sg_id in sg_map:
-                    instance_sgs.append(sg_map[sg_id])
-            
-            instances_by_subnet[subnet_id].append({
-                "id": instance["InstanceId"],
-                "name": get_name(instance.get("Tags")),
-                "type": instance["InstanceType"],
-                "state": instance["State"]["Name"],
-                "private_ip": instance.get("PrivateIpAddress"),
-                "public_ip": instance.get("PublicIpAddress"),
-                "security_groups": instance_sgs,
-            })
-    
-    return instances_by_subnet
\ No newline at end of file
+
+    for instance in instances:
+        if not instance.subnet_id:
+            continue
+        instances_by_subnet.setdefault(instance.subnet_id, []).append(instance)
+
+    return {subnet_id: tuple(group) for subnet_id, group in instances_by_subnet.items()}
@@ -0,0 +1,259 @@
+"""
+Compact, normalized in-memory model of an EC2 inventory.
+
+Each resource is stored once, as a slotted record that references related
+resources by ID, instead of as nested dicts where every instance carries
+its own copies of the security groups and every record repeats its key
+names. Values that repeat across many records (IDs used as references,
+states, instance types, AZs, protocols) are interned so each distinct
+string is kept in memory only once.
+
+The collectors produce these records and RegionInventory groups them per
+region and holds its precomputed statistics; renderers navigate the
+inventory through its indexes.
+"""
+import sys
+from aws_inventory.utils.stats import calculate_region_stats
+
+# Bumped whenever the serialized layout changes, so stored snapshots from
+# an older layout are never reused
+MODEL_VERSION = 1
+
+
+def intern_str(value):
+    """Intern a string so equal values share one object; other values pass through."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Record:
+    """
+    Base class of the inventory records.
+
+    Fields are declared with ``__slots__`` (no per-record __dict__) and can
+    be given positionally, in slot order, or by keyword; missing fields are
+    None. Fields listed in ``_interned`` are interned on construction.
+    Unknown fields raise TypeError, like a regular function call.
+    """
+
+    __slots__ = ()
+    _interned = ()
+
+    def __init__(self, *args, **kwargs):
+        if len(args) > len(self.__slots__):
+            raise TypeError(
+                f"{type(self).__name__} takes at most {len(self.__slots__)} fields, got {len(args)}"
+            )
+        if kwargs:
+            unknown = kwargs.keys() - set(self.__slots__)
+            if unknown:
+                raise TypeError(f"{type(self).__name__} got unexpected field(s): {', '.join(sorted(unknown))}")
+            repeated = kwargs.keys() & set(self.__slots__[:len(args)])
+            if repeated:
+                raise TypeError(
+                    f"{type(self).__name__} got multiple values for field(s): {', '.join(sorted(repeated))}"
+                )
+        values = dict(zip(self.__slots__, args), **kwargs)
+        for name in self.__slots__:
+            value = values.get(name)
+            if name in self._interned:
+                value = intern_str(value)
+            setattr(self, name, value)
+
+    def to_list(self):
+        """Return the field values in slot order, nested records included."""
+        return [_to_plain(getattr(self, name)) for name in self.__slots__]
+
+    @classmethod
+    def from_list(cls, values):
+        """Rebuild a record from the output of to_list()."""
+        return cls(*values)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_list() == other.to_list()
+
+    __hash__ = None
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+def _to_plain(value):
+    if isinstance(value, Record):
+        return value.to_list()
+    if isinstance(value, (list, tuple)):
+        return [_to_plain(item) for item in value]
+    return value
+
+
+class Peer(Record):
+    """Source or destination of a rule: a CIDR block or a security group ID."""
+
+    __slots__ = ("type", "value", "description")
+    _interned = ("type", "value", "description")
+
+
+class Rule(Record):
+    """Security group rule; ``peers`` are its sources (inbound) or destinations (outbound)."""
+
+    __slots__ = ("protocol", "from_port", "to_port", "peers")
+    _interned = ("protocol", "from_port", "to_port")
+
+    @classmethod
+    def from_list(cls, values):
+        protocol, from_port, to_port, peers = values
+        return cls(protocol, from_port, to_port, tuple(Peer.from_list(peer) for peer in peers))
+
+
+class SecurityGroup(Record):
+    __slots__ = ("id", "name", "description", "vpc_id", "inbound_rules", "outbound_rules")
+    _interned = ("id", "vpc_id", "description")
+
+    @classmethod
+    def from_list(cls, values):
+        sg_id, name, description, vpc_id, inbound_rules, outbound_rules = values
+        return cls(
+            sg_id, name, description, vpc_id,
+            tuple(Rule.from_list(rule) for rule in inbound_rules),
+            tuple(Rule.from_list(rule) for rule in outbound_rules),
+        )
+
+
+class InternetGateway(Record):
+    __slots__ = ("id", "name")
+
+
+class Vpc(Record):
+    __slots__ = ("id", "name", "cidr")
+    _interned = ("id",)
+
+
+class Subnet(Record):
+    __slots__ = ("id", "vpc_id", "name", "cidr", "az")
+    _interned = ("id", "vpc_id", "az")
+
+
+class Instance(Record):
+    __slots__ = (
+        "id", "name", "type", "state", "private_ip", "public_ip",
+        "subnet_id", "security_group_ids",
+    )
+    _interned = ("type", "state", "subnet_id")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.security_group_ids = tuple(intern_str(sg_id) for sg_id in self.security_group_ids or ())
+
+
+class RegionInventory:
+    """
+    Normalized EC2 inventory of one region.
+
+    Records are stored once and joined through ID indexes: VPC -> subnets,
+    subnet -> instances, VPC -> security groups and VPC -> internet
+    gateways. Instances keep only the IDs of their security groups, which
+    are resolved against ``security_groups``.
+
+    ``stats`` is computed once, when the inventory is assembled, by
+    utils.stats.calculate_region_stats.
+
+    ``summary`` is set on regions the collection probe found "empty" or
+    "default-only" (only the default VPC, no instance): they were not
+    collected in full and hold at most their default VPC.
+    """
+
+    __slots__ = (
+        "vpcs", "security_groups", "subnets_by_vpc", "instances_by_subnet",
+        "sgs_by_vpc", "igws_by_vpc", "summary", "stats",
+    )
+
+    def __init__(self, vpcs=(), security_groups=None, subnets_by_vpc=None,
+                 instances_by_subnet=None, sgs_by_vpc=None, igws_by_vpc=None, summary=None):
+        self.vpcs = tuple(vpcs)
+        self.security_groups = security_groups or {}
+        self.subnets_by_vpc = subnets_by_vpc or {}
+        self.instances_by_subnet = instances_by_subnet or {}
+        self.sgs_by_vpc = sgs_by_vpc or {}
+        self.igws_by_vpc = igws_by_vpc or {}
+        self.summary = summary
+        self.stats = calculate_region_stats(self)
+
+    def __len__(self):
+        return len(self.vpcs)
+
+    def subnets_of(self, vpc_id):
+        """Return the subnets of a VPC."""
+        return self.subnets_by_vpc.get(vpc_id, ())
+
+    def instances_of(self, subnet_id):
+        """Return the instances of a subnet."""
+        return self.instances_by_subnet.get(subnet_id, ())
+
+    def security_groups_of(self, vpc_id):
+        """Return the security groups of a VPC."""
+        return self.sgs_by_vpc.get(vpc_id, ())
+
+    def igws_of(self, vpc_id):
+        """Return the internet gateways attached to a VPC."""
+        return self.igws_by_vpc.get(vpc_id, ())
+
+    def instance_security_groups(self, instance):
+        """Resolve the security group IDs of an instance, skipping unknown ones."""
+        return [
+            self.security_groups[sg_id]
+            for sg_id in instance.security_group_ids
+            if sg_id in self.security_groups
+        ]
+
+    def to_dict(self):
+        """Return a JSON-serializable form, used by the snapshot store."""
+        return {
+            "vpcs": [vpc.to_list() for vpc in self.vpcs],
+            "security_groups": [sg.to_list() for sg in self.security_groups.values()],
+            "subnets_by_vpc": {
+                vpc_id: [subnet.to_list() for subnet in subnets]
+                for vpc_id, subnets in self.subnets_by_vpc.items()
+            },
+            "instances_by_subnet": {
+                subnet_id: [instance.to_list() for instance in instances]
+                for subnet_id, instances in self.instances_by_subnet.items()
+            },
+            "sgs_by_vpc": {
+                vpc_id: [sg.id for sg in sgs] for vpc_id, sgs in self.sgs_by_vpc.items()
+            },
+            "igws_by_vpc": {
+                vpc_id: [igw.to_list() for igw in igws]
+                for vpc_id, igws in self.igws_by_vpc.items()
+            },
+            "summary": self.summary,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild an inventory from the output of to_dict()."""
+        security_groups = {}
+        for values in data["security_groups"]:
+            sg = SecurityGroup.from_list(values)
+            security_groups[sg.id] = sg
+
+        return cls(
+            vpcs=[Vpc.from_list(values) for values in data["vpcs"]],
+            security_groups=security_groups,
+            subnets_by_vpc={
+                intern_str(vpc_id): tuple(Subnet.from_list(values) for values in subnets)
+                for vpc_id, subnets in data["subnets_by_vpc"].items()
+            },
+            instances_by_subnet={
+                intern_str(subnet_id): tuple(Instance.from_list(values) for values in instances)
+                for subnet_id, instances in data["instances_by_subnet"].items()
+            },
+            sgs_by_vpc={
+                intern_str(vpc_id): tuple(security_groups[sg_id] for sg_id in sg_ids)
+                for vpc_id, sg_ids in data["sgs_by_vpc"].items()
+            },
+            igws_by_vpc={
+                intern_str(vpc_id): tuple(InternetGateway.from_list(values) for values in igws)
+                for vpc_id, igws in data["igws_by_vpc"].items()
+            },
+            summary=data.get("summary"),
+        )
@@ -1,75 +1,107 @@
 #Security groups collector module
+from aws_inventory.utils.boto_helpers import paginate, build_ec2_filters
+from aws_inventory.collectors.model import Peer, Rule, SecurityGroup
+
 def parse_rule_sources(rule, source_type="sources"):
     # Parse the sources or destinations of a security group rule
     sources = []
 
     # IP RANGES (IPv4)
     for ip_range in rule.get("IpRanges", []):
-        sources.append({
-            "type": "cidr",
-            "value": ip_range.get("CidrIp"),
-            "description": ip_range.get("Description"),
-        })
+        sources.append(Peer(
+            type="cidr",
+            value=ip_range.get("CidrIp"),
+            description=ip_range.get("Description"),
+        ))
 
     # IP RANGES (IPv6)
     for ip_range in rule.get("Ipv6Ranges", []):
-        sources.append({
-            "type": "cidr",
-            "value": ip_range.get("CidrIpv6"),
-            "description": ip_range.get("Description"),
-        })
+        sources.append(Peer(
+            type="cidr",
+            value=ip_range.get("CidrIpv6"),
+            description=ip_range.get("Description"),
+        ))
 
     # Security Group references
     for sg_ref in rule.get("UserIdGroupPairs", []):
-        sources.append({
-            "type": "sg",
-            "value": sg_ref.get("GroupId"),
-            "description": sg_ref.get("Description", "")
-        })
+        sources.append(Peer(
+            type="sg",
+            value=sg_ref.get("GroupId"),
+            description=sg_ref.get("Description", "")
+        ))
     
-    return sources
+    return tuple(sources)
 
 def parse_rule(rule):
-    # Parse a security group rule.
-    return {
-        "protocol": rule.get("IpProtcol", "all"),
-        "from_port": rule.get("FromPort", all),
-        "to_port": rule.get("ToPort", all),
-    }
-
-def collect_security_groups(ec2_client):
+    # Parse a security group rule with its sources or destinations.
+    return Rule(
+        protocol=rule.get("IpProtocol", "all"),
+        from_port=rule.get("FromPort", "all"),
+        to_port=rule.get("ToPort", "all"),
+        peers=parse_rule_sources(rule),
+    )
+
+def parse_security_group(sg):
+    # Build a SecurityGroup record from a raw describe_security_groups item
+    return SecurityGroup(
+        id=sg["GroupId"],
+        name=sg.get("GroupName"),
+        description=sg.get("Description"),
+        vpc_id=sg.get("VpcId"),
+        # Inbound rules list their sources, outbound rules their destinations
+        inbound_rules=tuple(parse_rule(rule) for rule in sg.get("IpPermissions", [])),
+        outbound_rules=tuple(parse_rule(rule) for rule in sg.get("IpPermissionsEgress", [])),
+    )
+
+def build_security_groups(sgs):
     """
-    Collect all security groups with their rules
+    Build SecurityGroup records from raw describe_security_groups items
 
-    Args: 
-        ec2_client: boto3 EC2 client
+    Args:
+        sgs: iterable of raw security groups
 
-    Returns: dict: Map of security group ID to security groups details
+    Returns: dict: Map of security group ID to SecurityGroup records
     """
-    sgs = ec2_client.describe_security_groups()["SecurityGroups"]
     sg_map = {}
 
     for sg in sgs:
-        sg_id = sg["GroupId"]
-        sg_map[sg_id] = {
-            "id": sg_id,
-            "name": sg.get("GroupName"),
-            "description": sg.get("Description"),
-            "vpc_id": sg.get("VpcId"),
-            "inbound_rules": [],
-            "outbound_rules": []
-        }
-        
-        # Process inbound rules
-        for rule in sg.get("IpPermissions", []):
-            rule_entry = parse_rule(rule)
-            rule_entry["sources"] = parse_rule_sources(rule)
-            sg_map[sg_id]["inbound_rules"].append(rule_entry)
-
-        # Process outbound rules
-        for rule in sg.get("IpPermissionsEgress", []):
-            rule_entry = parse_rule(rule)
-            rule_entry["destinations"] = parse_rule_sources(rule)
-            sg_map[sg_id]["outbound_rules"].append(rule_entry)
+        record = parse_security_group(sg)
+        sg_map[record.id] = record
 
     return sg_map
+
+
+def collect_security_groups(ec2_client, page_size=None, filters=None):
+    """
+    Collect all security groups with their rules
+
+    Args: 
+        ec2_client: boto3 EC2 client
+        page_size: number of security groups requested per page
+        filters: inventory filters; only the VPC IDs apply server-side
+
+    Returns: dict: Map of security group ID to SecurityGroup records
+    """
+    sgs = paginate(
+        ec2_client, "describe_security_groups", "SecurityGroups", page_size,
+        **build_ec2_filters(filters)
+    )
+    return build_security_groups(sgs)
+
+
+def group_security_groups_by_vpc(sg_map):
+    """
+    Index security groups by VPC in a single pass.
+
+    Args:
+        sg_map: Dictionary of security groups from collect_security_groups
+
+    Returns:
+        dict: Map of VPC ID to tuple of SecurityGroup records
+    """
+    sgs_by_vpc = {}
+
+    for sg in sg_map.values():
+        sgs_by_vpc.setdefault(sg.vpc_id, []).append(sg)
+
+    return {vpc_id: tuple(sgs) for vpc_id, sgs in sgs_by_vpc.items()}
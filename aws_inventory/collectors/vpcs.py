@@ -1,89 +1,141 @@
 """VPC and Subnet collector module."""
+from aws_inventory.utils.boto_helpers import paginate, build_ec2_filters
 from aws_inventory.utils.common import get_name
+from aws_inventory.collectors.model import InternetGateway, RegionInventory, Subnet, Vpc
 
 
-def collect_internet_gateways(ec2_client):
-    """Collect internet gateways grouped by VPC."""
-    igws = ec2_client.describe_internet_gateways()["InternetGateways"]
+def add_internet_gateway(igws_by_vpc, igw):
+    """Add the InternetGateway record of a raw describe_internet_gateways item to each VPC it is attached to."""
+    igw_data = InternetGateway(
+        id=igw["InternetGatewayId"],
+        name=get_name(igw.get("Tags"))
+    )
+    
+    for attachment in igw.get("Attachments", []):
+        vpc_id = attachment.get("VpcId")  # FIXED: was attachment("VpcId")
+        if vpc_id:
+            if vpc_id not in igws_by_vpc:
+                igws_by_vpc[vpc_id] = []
+            igws_by_vpc[vpc_id].append(igw_data)
+
+
+def build_internet_gateways(igws):
+    """Group InternetGateway records from raw describe_internet_gateways items by VPC."""
     igws_by_vpc = {}
     
     for igw in igws:
-        igw_data = {
-            "id": igw["InternetGatewayId"],
-            "name": get_name(igw.get("Tags"))
-        }
-        
-        for attachment in igw.get("Attachments", []):
-            vpc_id = attachment.get("VpcId")  # FIXED: was attachment("VpcId")
-            if vpc_id:
-                if vpc_id not in igws_by_vpc:
-                    igws_by_vpc[vpc_id] = []
-                igws_by_vpc[vpc_id].append(igw_data)
+        add_internet_gateway(igws_by_vpc, igw)
     
     return igws_by_vpc  # FIXED: moved outside the loop
 
 
-def collect_subnets(ec2_client, instances_by_subnet):  # FIXED: unindented
+def collect_internet_gateways(ec2_client, page_size=None, filters=None):
+    """Collect internet gateways grouped by VPC."""
+    igws = paginate(
+        ec2_client, "describe_internet_gateways", "InternetGateways", page_size,
+        **build_ec2_filters(filters, vpc_filter="attachment.vpc-id")
+    )
+    return build_internet_gateways(igws)
+
+
+def parse_subnet(subnet):
+    """Build a Subnet record from a raw describe_subnets item."""
+    return Subnet(
+        id=subnet["SubnetId"],
+        vpc_id=subnet["VpcId"],
+        name=get_name(subnet.get("Tags")),
+        cidr=subnet.get("CidrBlock"),
+        az=subnet.get("AvailabilityZone"),
+    )
+
+
+def collect_subnets(ec2_client, page_size=None, filters=None):
     """
-    Collect subnets grouped by VPC.
+    Collect subnets.
     
     Args:
         ec2_client: Boto3 EC2 client
-        instances_by_subnet: Dictionary mapping subnet IDs to instances
+        page_size: Number of subnets requested per page
+        filters: Inventory filters; only the VPC IDs apply server-side
+        
+    Returns:
+        list: Subnet records with their VPC ID
+    """
+    subnets = paginate(
+        ec2_client, "describe_subnets", "Subnets", page_size,
+        **build_ec2_filters(filters)
+    )
+    
+    return [parse_subnet(subnet) for subnet in subnets]
+
+
+def group_subnets_by_vpc(subnets):
+    """
+    Group subnets by VPC.
+    
+    Args:
+        subnets: List of subnets from collect_subnets
         
     Returns:
-        dict: Map of VPC ID to list of subnets
+        dict: Map of VPC ID to tuple of subnets
     """
-    subnets = ec2_client.describe_subnets()["Subnets"]  # FIXED: was .get["Subnets"]
     subnets_by_vpc = {}
     
     for subnet in subnets:
-        vpc_id = subnet["VpcId"]
-        subnet_id = subnet["SubnetId"]
-        
-        if vpc_id not in subnets_by_vpc:
-            subnets_by_vpc[vpc_id] = []
-        
-        subnets_by_vpc[vpc_id].append({
-            "id": subnet_id,
-            "name": get_name(subnet.get("Tags")),
-            "cidr": subnet.get("CidrBlock"),
-            "az": subnet.get("AvailabilityZone"),
-            "instances": instances_by_subnet.get(subnet_id, []),
-        })
+        subnets_by_vpc.setdefault(subnet.vpc_id, []).append(subnet)
     
-    return subnets_by_vpc  # FIXED: moved outside the loop
+    return {vpc_id: tuple(group) for vpc_id, group in subnets_by_vpc.items()}
+
 
+def parse_vpc(vpc):
+    """Build a Vpc record from a raw describe_vpcs item."""
+    return Vpc(
+        id=vpc["VpcId"],
+        name=get_name(vpc.get("Tags")),
+        cidr=vpc.get("CidrBlock"),
+    )
 
-def collect_vpcs(ec2_client, subnets_by_vpc, igws_by_vpc, sg_map):  # FIXED: unindented
+
+def collect_vpcs(ec2_client, page_size=None, filters=None):
     """
-    Collect VPCs with all associated resources.
+    Collect VPCs.
     
     Args:
         ec2_client: Boto3 EC2 client
-        subnets_by_vpc: Dictionary mapping VPC IDs to subnets
-        igws_by_vpc: Dictionary mapping VPC IDs to internet gateways
-        sg_map: Dictionary of security groups
+        page_size: Number of VPCs requested per page
+        filters: Inventory filters; only the VPC IDs apply server-side
         
     Returns:
-        list: List of VPC dictionaries with all nested resources
+        list: Vpc records
     """
-    vpcs = ec2_client.describe_vpcs()["Vpcs"]  # FIXED: was .get["Vpcs"]
-    inventory = []
+    vpcs = paginate(
+        ec2_client, "describe_vpcs", "Vpcs", page_size,
+        **build_ec2_filters(filters)
+    )
     
-    for vpc in vpcs:
-        vpc_id = vpc["VpcId"]
-        
-        # Filter security groups for this VPC
-        vpc_sgs = [sg for sg in sg_map.values() if sg["vpc_id"] == vpc_id]
-        
-        inventory.append({
-            "id": vpc_id,
-            "name": get_name(vpc.get("Tags")),
-            "cidr": vpc.get("CidrBlock"),
-            "subnets": subnets_by_vpc.get(vpc_id, []),
-            "igws": igws_by_vpc.get(vpc_id, []),
-            "security_groups": vpc_sgs,
-        })
+    return [parse_vpc(vpc) for vpc in vpcs]
+
+
+def build_region_inventory(vpcs, subnets_by_vpc, instances_by_subnet, sg_map, sgs_by_vpc, igws_by_vpc):
+    """
+    Assemble the normalized inventory of a region.
     
-    return inventory
\ No newline at end of file
+    Args:
+        vpcs: List of VPCs from collect_vpcs
+        subnets_by_vpc: Dictionary mapping VPC IDs to subnets
+        instances_by_subnet: Dictionary mapping subnet IDs to instances
+        sg_map: Dictionary of security groups
+        sgs_by_vpc: Dictionary mapping VPC IDs to security groups
+        igws_by_vpc: Dictionary mapping VPC IDs to internet gateways
+        
+    Returns:
+        RegionInventory: Records of the region joined by ID
+    """
+    return RegionInventory(
+        vpcs=vpcs,
+        security_groups=sg_map,
+        subnets_by_vpc=subnets_by_vpc,
+        instances_by_subnet=instances_by_subnet,
+        sgs_by_vpc=sgs_by_vpc,
+        igws_by_vpc={vpc_id: tuple(igws) for vpc_id, igws in igws_by_vpc.items()},
+    )
@@ -0,0 +1,251 @@
+"""
+Command line arguments shared by the commands, and their parsing.
+"""
+from aws_inventory.commands.collection import DEFAULT_MAX_ACCOUNTS, DEFAULT_MAX_WORKERS
+from aws_inventory.utils.aio_helpers import AioSession
+from aws_inventory.utils.boto_helpers import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, MIN_PAGE_SIZE
+from aws_inventory.utils.cache import DEFAULT_CACHE_DIR, DEFAULT_CACHE_TTL
+from aws_inventory.utils.export import EXPORT_FORMATS
+from aws_inventory.utils.inventory_db import DEFAULT_DB_KEEP, DEFAULT_DB_PATH
+from aws_inventory.utils.regions import DEFAULT_REGIONS_TTL, REGION_STATUSES, ENABLED_REGION_STATUSES
+from aws_inventory.utils.scheduler import DEFAULT_RATE
+from aws_inventory.utils.snapshot import DEFAULT_SNAPSHOT_MAX_AGE
+
+ENGINES = ("threads", "async")
+OUTPUT_FORMATS = ("html",) + EXPORT_FORMATS
+
+
+def parse_region_statuses(statuses_arg):
+    """Parse the --region-status argument into a list of opt-in statuses."""
+    statuses = [s.strip().lower() for s in statuses_arg.split(",") if s.strip()]
+    unknown = [s for s in statuses if s not in REGION_STATUSES]
+    if unknown or not statuses:
+        raise ValueError(
+            f"Invalid --region-status '{statuses_arg}', expected a comma-separated list of {', '.join(REGION_STATUSES)}"
+        )
+    return statuses
+
+
+def parse_profiles(args):
+    """Return the profiles to inventory from --profile, --profiles or --profiles-file, without duplicates."""
+    if args.profiles_file:
+        with open(args.profiles_file, encoding="utf-8") as f:
+            # One profile per line; blank lines and "#" comments are ignored
+            profiles = [line.split("#", 1)[0].strip() for line in f]
+    elif args.profiles:
+        profiles = [p.strip() for p in args.profiles.split(",")]
+    else:
+        profiles = [args.profile]
+
+    profiles = list(dict.fromkeys(p for p in profiles if p))
+    if not profiles:
+        raise ValueError("No AWS profile given")
+    return profiles
+
+
+def parse_filters(args):
+    """Build the server-side filters from the --vpc-ids, --instance-states and --tag-filter arguments."""
+    tags = {}
+    for tag_filter in args.tag_filter or []:
+        key, sep, value = tag_filter.partition("=")
+        if not sep or not key:
+            raise ValueError(f"Invalid --tag-filter '{tag_filter}', expected KEY=VALUE")
+        tags.setdefault(key, []).append(value)
+
+    return {
+        "vpc_ids": [v.strip() for v in args.vpc_ids.split(",")] if args.vpc_ids else [],
+        "instance_states": [s.strip() for s in args.instance_states.split(",")] if args.instance_states else [],
+        "tags": tags,
+    }
+
+
+def parse_formats(formats_arg):
+    """Parse the --format argument into a list of output formats."""
+    formats = [f.strip().lower() for f in formats_arg.split(",") if f.strip()]
+    unknown = [f for f in formats if f not in OUTPUT_FORMATS]
+    if unknown or not formats:
+        raise ValueError(
+            f"Invalid --format '{formats_arg}', expected a comma-separated list of {', '.join(OUTPUT_FORMATS)}"
+        )
+    return formats
+
+
+def add_collection_arguments(parser):
+    """Add the account, region, collection, cache and filter arguments shared by every command."""
+    profile_group = parser.add_mutually_exclusive_group(required=True)
+    profile_group.add_argument("--profile", help="AWS profile name")
+    profile_group.add_argument(
+        "--profiles",
+        help="Comma-separated AWS profiles, collected in parallel into one report"
+    )
+    profile_group.add_argument(
+        "--profiles-file",
+        metavar="PATH",
+        help="File listing one AWS profile per line ('#' starts a comment)"
+    )
+    parser.add_argument(
+        "--max-accounts",
+        type=int,
+        default=DEFAULT_MAX_ACCOUNTS,
+        help=f"Number of accounts collected concurrently, each in its own process (default: {DEFAULT_MAX_ACCOUNTS})"
+    )
+    parser.add_argument(
+        "--regions",
+        default="us-east-1",
+        help="Comma-separated regions or 'all'"
+    )
+    parser.add_argument(
+        "--region-status",
+        default=",".join(ENABLED_REGION_STATUSES),
+        help=f"Comma-separated opt-in statuses of the regions included by '--regions all': "
+             f"{', '.join(REGION_STATUSES)} (default: {','.join(ENABLED_REGION_STATUSES)})"
+    )
+    parser.add_argument(
+        "--regions-ttl",
+        type=int,
+        default=DEFAULT_REGIONS_TTL,
+        help=f"Seconds the discovered region list is reused from the cache (default: {DEFAULT_REGIONS_TTL})"
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=DEFAULT_MAX_WORKERS,
+        help=f"Number of regions collected concurrently (default: {DEFAULT_MAX_WORKERS})"
+    )
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default="threads",
+        help="Collect regions on a thread pool, or on one asyncio event loop (requires aiobotocore) (default: threads)"
+    )
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=DEFAULT_PAGE_SIZE,
+        help=f"Items requested per API page, {MIN_PAGE_SIZE}-{MAX_PAGE_SIZE} (default: {DEFAULT_PAGE_SIZE})"
+    )
+    parser.add_argument(
+        "--api-rate",
+        type=float,
+        default=DEFAULT_RATE,
+        help=f"Max requests per second per region and API, lowered automatically on throttling (default: {DEFAULT_RATE})"
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=int,
+        default=DEFAULT_CACHE_TTL,
+        help=f"Seconds API responses are reused from the local cache (default: {DEFAULT_CACHE_TTL})"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=DEFAULT_CACHE_DIR,
+        help=f"Directory of the local response cache (default: {DEFAULT_CACHE_DIR})"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always call the AWS APIs and don't store responses"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reuse the previous run's inventory for regions whose resources haven't changed"
+    )
+    parser.add_argument(
+        "--snapshot-max-age",
+        type=int,
+        default=DEFAULT_SNAPSHOT_MAX_AGE,
+        help=f"Seconds an incremental snapshot is reused before its region is collected in full again "
+             f"(default: {DEFAULT_SNAPSHOT_MAX_AGE})"
+    )
+    parser.add_argument(
+        "--full-scan",
+        action="store_true",
+        help="Collect every region in full, including those holding nothing or only the default VPC"
+    )
+    parser.add_argument(
+        "--vpc-ids",
+        help="Comma-separated VPC IDs to inventory (default: all VPCs)"
+    )
+    parser.add_argument(
+        "--instance-states",
+        help="Comma-separated instance states to include, e.g. 'running,stopped'"
+    )
+    parser.add_argument(
+        "--tag-filter",
+        action="append",
+        metavar="KEY=VALUE",
+        help="Only include instances with this tag, and the VPCs, subnets and security groups they use (repeatable)"
+    )
+
+
+def parse_collection_args(parser, args):
+    """
+    Validate the arguments added by add_collection_arguments.
+
+    Exits through ``parser.error`` on invalid values.
+
+    Returns:
+        tuple: (profiles, filters, region_statuses)
+    """
+    try:
+        profiles = parse_profiles(args)
+        filters = parse_filters(args)
+        region_statuses = parse_region_statuses(args.region_status)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    if not MIN_PAGE_SIZE <= args.page_size <= MAX_PAGE_SIZE:
+        parser.error(f"--page-size must be between {MIN_PAGE_SIZE} and {MAX_PAGE_SIZE}")
+    if args.engine == "async" and AioSession is None:
+        parser.error("--engine async requires aiobotocore: pip install aws_inventory[async]")
+    return profiles, filters, region_statuses
+
+
+def add_report_arguments(parser, formats=True):
+    """Add the report arguments: --format (unless ``formats`` is False) and --lazy."""
+    if formats:
+        parser.add_argument(
+            "--format",
+            default="html",
+            help=f"Comma-separated output formats: {', '.join(OUTPUT_FORMATS)} (default: html)"
+        )
+    parser.add_argument(
+        "--lazy",
+        action="store_true",
+        help="Embed the inventory as JSON and render VPCs and security groups in the browser on demand"
+    )
+
+
+def add_database_arguments(parser, db_help, optional=True):
+    """
+    Add the inventory database arguments: --db, and --no-db and --db-keep
+    when storing the inventory is ``optional``.
+    """
+    parser.add_argument(
+        "--db",
+        metavar="PATH",
+        default=DEFAULT_DB_PATH,
+        help=f"{db_help} (default: {DEFAULT_DB_PATH})"
+    )
+    if optional:
+        parser.add_argument(
+            "--no-db",
+            action="store_true",
+            help="Don't store the inventory in the database"
+        )
+        parser.add_argument(
+            "--db-keep",
+            type=int,
+            default=DEFAULT_DB_KEEP,
+            metavar="N",
+            help=f"Number of most recent runs kept in the database, 0 to keep them all "
+                 f"(default: {DEFAULT_DB_KEEP})"
+        )
+
+
+def parse_format_args(parser, args):
+    """Return the formats of the --format argument, exiting through ``parser.error`` if invalid."""
+    try:
+        return parse_formats(args.format)
+    except ValueError as e:
+        parser.error(str(e))
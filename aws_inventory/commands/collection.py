@@ -0,0 +1,336 @@
+"""
+Collection pipeline shared by the commands: regions of an account on a
+thread pool or an event loop, and accounts in parallel processes.
+"""
+import asyncio
+import os
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from tqdm import tqdm
+from aws_inventory.regional.ec2 import collect_ec2
+from aws_inventory.regional.ec2_async import iter_regions_async
+from aws_inventory.utils.boto_helpers import ClientFactory, DEFAULT_PAGE_SIZE, skip_region_error
+from aws_inventory.utils.aio_helpers import AsyncClientFactory
+from aws_inventory.utils.scheduler import RequestScheduler
+from aws_inventory.utils.cache import ResponseCache
+from aws_inventory.utils.common import region_key
+from aws_inventory.utils.metrics import RunMetrics
+from aws_inventory.utils.snapshot import SnapshotStore
+from aws_inventory.utils.regions import discover_regions, DEFAULT_REGIONS_TTL, ENABLED_REGION_STATUSES
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_MAX_ACCOUNTS = 4
+
+
+def parse_regions(regions_arg, client_factory, cache_dir=None, ttl=DEFAULT_REGIONS_TTL,
+                  statuses=ENABLED_REGION_STATUSES):
+    """Parse the regions argument into a list of region names; "all" is discovered through discover_regions."""
+    if regions_arg.lower() == "all":
+        return discover_regions(client_factory, cache_dir, ttl, statuses)
+    return [r.strip() for r in regions_arg.split(",")]
+
+
+def collect_regions(client_factory, regions, max_workers=DEFAULT_MAX_WORKERS,
+                    page_size=DEFAULT_PAGE_SIZE, filters=None, snapshots=None, on_region=None,
+                    progress=True, probe=True):
+    """
+    Collect EC2 inventory for several regions concurrently.
+
+    Regions are scheduled on a thread pool and reported through tqdm as
+    they finish. The result is ordered like ``regions`` regardless of
+    completion order, so the report layout stays stable between runs.
+    Regions the credentials aren't authorized for are left out with a
+    warning (see skip_region_error).
+
+    Args:
+        client_factory: ClientFactory shared by all regions
+        regions: List of region names
+        max_workers: Maximum number of regions collected at the same time
+        page_size: Number of items requested per describe_* page
+        filters: Server-side filters applied to every describe call
+        snapshots: Optional SnapshotStore enabling incremental collection
+        on_region: Optional callback called with (region, inventory) as soon
+            as each region is collected, e.g. to stream exports
+        progress: Show the tqdm progress bar
+        probe: Skip the full collection of empty and default-only regions
+
+    Returns:
+        dict: Map of region name to RegionInventory
+    """
+    results = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {
+            executor.submit(
+                collect_ec2, client_factory, region, page_size, filters, snapshots, probe
+            ): region
+            for region in regions
+        }
+        with tqdm(total=len(futures), desc="Collecting EC2 data", unit="region",
+                  disable=not progress) as bar:
+            for future in as_completed(futures):
+                region = futures[future]
+                bar.set_postfix_str(region)
+                bar.update(1)
+                try:
+                    results[region] = future.result()
+                except Exception as e:
+                    if not skip_region_error(region, e):
+                        raise
+                    continue
+                if on_region:
+                    on_region(region, results[region])
+
+    return {region: results[region] for region in regions if region in results}
+
+
+async def collect_regions_async(client_factory, regions, max_workers=DEFAULT_MAX_WORKERS,
+                                page_size=DEFAULT_PAGE_SIZE, filters=None, snapshots=None,
+                                on_region=None, progress=True, probe=True):
+    """
+    Collect EC2 inventory for several regions on one event loop.
+
+    The asyncio counterpart of collect_regions, taking the same arguments
+    with an AsyncClientFactory; ``max_workers`` bounds the number of
+    regions in flight. The factory's clients are closed on return.
+
+    Returns:
+        dict: Map of region name to RegionInventory, ordered like ``regions``
+        (without the skipped regions)
+    """
+    results = {}
+
+    async with client_factory:
+        with tqdm(total=len(regions), desc="Collecting EC2 data", unit="region",
+                  disable=not progress) as bar:
+            async for region, inventory in iter_regions_async(
+                client_factory, regions, max_workers, page_size, filters, snapshots, probe
+            ):
+                bar.set_postfix_str(region)
+                bar.update(1)
+                if inventory is None:
+                    continue
+                results[region] = inventory
+                if on_region:
+                    on_region(region, inventory)
+
+    return {region: results[region] for region in regions if region in results}
+
+
+def open_account(profile, args, metrics, response_cache=True):
+    """
+    Create the session and shared clients of an account.
+
+    Args:
+        profile: AWS profile of the account
+        args: Parsed command line arguments
+        metrics: RunMetrics timing the API calls of the clients
+        response_cache: Serve responses from the ResponseCache, unless
+            ``args.no_cache``
+
+    Returns:
+        ClientFactory: With its own RequestScheduler and ResponseCache
+    """
+    with metrics.phase("session"):
+        scheduler = RequestScheduler(rate=args.api_rate)
+        cache = None
+        if response_cache and not args.no_cache:
+            cache = ResponseCache(args.cache_dir, args.cache_ttl)
+        return ClientFactory(profile, scheduler=scheduler, cache=cache, metrics=metrics)
+
+
+def collect_account(profile, args, filters, metrics, on_region=None, progress=True,
+                    region_statuses=ENABLED_REGION_STATUSES, client_factory=None, snapshots=None):
+    """
+    Collect the EC2 inventory of every requested region of one account.
+
+    The account gets its own session, clients, rate limiter and response
+    cache, and collects its regions on a thread pool of ``args.max_workers``,
+    or on an event loop with ``args.engine`` "async".
+
+    Args:
+        profile: AWS profile of the account
+        args: Parsed command line arguments
+        filters: Server-side filters, from parse_filters
+        metrics: RunMetrics timing the phases and API calls of the account
+        on_region: Optional callback called with (region, inventory) as soon
+            as each region is collected
+        progress: Show the region progress bar
+        region_statuses: Opt-in statuses of the regions kept by "--regions all"
+        client_factory: ClientFactory from open_account to reuse, e.g. kept
+            warm between the refreshes of ``serve`` (default: a new one)
+        snapshots: SnapshotStore to reuse (default: a new one with
+            ``args.incremental``)
+
+    Returns:
+        dict: "regions" ({region: RegionInventory}), plus the "scheduler"
+        and "cache" counters of the account
+    """
+    if client_factory is None:
+        client_factory = open_account(profile, args, metrics)
+    scheduler = client_factory.scheduler
+    cache = client_factory.cache
+    with metrics.phase("region_discovery"):
+        regions = parse_regions(
+            args.regions, client_factory,
+            None if args.no_cache else args.cache_dir, args.regions_ttl, region_statuses
+        )
+
+    if progress:
+        print(f"\nStarting AWS inventory collection for {len(regions)} region(s)...\n")
+
+    if snapshots is None and args.incremental:
+        snapshot_path = os.path.join(args.cache_dir, "snapshots", f"{profile}.json")
+        snapshots = SnapshotStore(snapshot_path, args.snapshot_max_age)
+
+    with metrics.phase("collect"):
+        if args.engine == "async":
+            async_factory = AsyncClientFactory(
+                profile, scheduler=scheduler, cache=cache, metrics=metrics
+            )
+            regions_data = asyncio.run(collect_regions_async(
+                async_factory, regions, args.max_workers, args.page_size, filters, snapshots,
+                on_region=on_region, progress=progress, probe=not args.full_scan
+            ))
+        else:
+            regions_data = collect_regions(
+                client_factory, regions, args.max_workers, args.page_size, filters, snapshots,
+                on_region=on_region, progress=progress, probe=not args.full_scan
+            )
+
+    if snapshots is not None:
+        with metrics.phase("save"):
+            snapshots.save()
+
+    return {
+        "regions": regions_data,
+        "scheduler": scheduler.stats,
+        "cache": cache.stats if cache else None,
+    }
+
+
+def _collect_account_process(profile, args, filters, region_statuses):
+    """Collect one account in a worker process, returning its metrics with the result."""
+    metrics = RunMetrics()
+    result = collect_account(
+        profile, args, filters, metrics, progress=False, region_statuses=region_statuses
+    )
+    result["api"] = metrics.api
+    result["phases"] = metrics.phases
+    return result
+
+
+def collect_accounts(profiles, args, filters, max_accounts=DEFAULT_MAX_ACCOUNTS, on_account=None,
+                     region_statuses=ENABLED_REGION_STATUSES):
+    """
+    Collect several accounts in parallel worker processes.
+
+    Each account runs collect_account in its own process, with its own
+    regional thread pool. An account that fails (e.g. expired credentials)
+    is reported and skipped, so it doesn't cost the results of the others.
+
+    Args:
+        profiles: List of AWS profiles
+        args: Parsed command line arguments
+        filters: Server-side filters, from parse_filters
+        max_accounts: Maximum number of accounts collected at the same time
+        on_account: Optional callback called with (profile, result) as soon
+            as each account is collected
+        region_statuses: Opt-in statuses of the regions kept by "--regions all"
+
+    Returns:
+        dict: Map of profile to collect_account result, ordered like
+        ``profiles``, plus the worker's "api" metrics and "phases"
+    """
+    results = {}
+
+    with ProcessPoolExecutor(max_workers=max(1, min(max_accounts, len(profiles)))) as executor:
+        futures = {
+            executor.submit(
+                _collect_account_process, profile, args, filters, region_statuses
+            ): profile
+            for profile in profiles
+        }
+        with tqdm(total=len(futures), desc="Collecting accounts", unit="account") as bar:
+            for future in as_completed(futures):
+                profile = futures[future]
+                try:
+                    results[profile] = future.result()
+                except Exception as e:
+                    tqdm.write(f"Skipping account {profile}: {e}")
+                else:
+                    if on_account:
+                        on_account(profile, results[profile])
+                bar.set_postfix_str(profile)
+                bar.update(1)
+
+    return {profile: results[profile] for profile in profiles if profile in results}
+
+
+def collect_inventory(profiles, args, filters, metrics, on_region=None,
+                      region_statuses=ENABLED_REGION_STATUSES):
+    """
+    Collect the EC2 inventory of one or several accounts.
+
+    A single account is collected in this process; several accounts are
+    collected in parallel by collect_accounts and their API metrics merged
+    into ``metrics``.
+
+    Args:
+        profiles: List of AWS profiles, from parse_profiles
+        args: Parsed command line arguments
+        filters: Server-side filters, from parse_filters
+        metrics: RunMetrics of the run
+        on_region: Optional callback called with (profile, region, inventory)
+            as soon as each region (single account) or account is collected
+        region_statuses: Opt-in statuses of the regions kept by "--regions all"
+
+    Returns:
+        tuple: (accounts, regions) - the collect_account result of each
+        profile, and the map of region to RegionInventory from
+        merge_accounts
+    """
+    if len(profiles) == 1:
+        profile = profiles[0]
+        accounts = {
+            profile: collect_account(
+                profile, args, filters, metrics,
+                on_region=partial(on_region, profile) if on_region else None,
+                region_statuses=region_statuses
+            )
+        }
+        return accounts, merge_accounts(accounts, profiles)
+
+    def on_account(profile, result):
+        for region, inventory in result["regions"].items():
+            on_region(profile, region, inventory)
+
+    print(f"\nStarting AWS inventory collection for {len(profiles)} account(s)...\n")
+    with metrics.phase("collect"):
+        accounts = collect_accounts(
+            profiles, args, filters, args.max_accounts,
+            on_account=on_account if on_region else None,
+            region_statuses=region_statuses
+        )
+    for result in accounts.values():
+        metrics.merge(result["api"])
+    return accounts, merge_accounts(accounts, profiles)
+
+
+def merge_accounts(accounts, profiles):
+    """
+    Merge the regions collected for each account into the inventory of a run.
+
+    Args:
+        accounts: Map of profile to collect_account result
+        profiles: All the profiles of the run, including the ones that
+            failed; they decide how regions are keyed (see region_key)
+
+    Returns:
+        dict: Map of region key to RegionInventory, account by account
+    """
+    return {
+        region_key(profile, region, profiles): inventory
+        for profile, result in accounts.items()
+        for region, inventory in result["regions"].items()
+    }
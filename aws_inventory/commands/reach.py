@@ -0,0 +1,106 @@
+"""
+``aws-inventory reach``: instance reachability from the security group graph.
+"""
+import argparse
+import time
+from aws_inventory.commands.arguments import add_collection_arguments, parse_collection_args
+from aws_inventory.commands.collection import collect_inventory
+from aws_inventory.utils.metrics import RunMetrics
+from aws_inventory.utils.sg_graph import SecurityGroupGraph, normalize_protocol
+
+
+def _describe_grant(grant, instances):
+    # One line of the reach output: the other instance and the rule allowing it
+    rule = grant.rule
+    ports = "all" if rule.from_port in (None, "all", -1) else (
+        rule.from_port if rule.from_port == rule.to_port else f"{rule.from_port}-{rule.to_port}"
+    )
+    via = f"{grant.sg_id} allows {normalize_protocol(rule.protocol)}/{ports} from {grant.peer.value}"
+    if grant.instance_id is None:
+        return f"  {grant.peer.value} (address range)  [{via}]"
+    instance = instances[grant.instance_id]
+    name = f" ({instance.name})" if instance.name else ""
+    return f"  {instance.id}{name} {instance.private_ip} {instance.state}  [{via}]"
+
+
+def main(argv):
+    """
+    ``aws-inventory reach``: answer reachability questions from the
+    security group graph of the collected regions.
+    """
+    parser = argparse.ArgumentParser(
+        prog="aws-inventory reach",
+        description="Which instances can reach an instance on a port, or be reached from it"
+    )
+    add_collection_arguments(parser)
+    parser.add_argument(
+        "--to",
+        metavar="INSTANCE_ID",
+        help="List the instances (and address ranges) that can reach this instance"
+    )
+    parser.add_argument(
+        "--from",
+        dest="source",
+        metavar="INSTANCE_ID",
+        help="List the instances this instance can reach; with --to, check that single path"
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        help="Destination port (default: any port)"
+    )
+    parser.add_argument(
+        "--protocol",
+        default="tcp",
+        help="Protocol name or number, e.g. tcp, udp, icmp, 6; 'all' or -1 matches any protocol (default: tcp)"
+    )
+    parser.add_argument(
+        "--no-egress-check",
+        action="store_true",
+        help="Only evaluate inbound rules, ignoring the source's outbound rules"
+    )
+    args = parser.parse_args(argv)
+    if not args.to and not args.source:
+        parser.error("one of --to or --from is required")
+
+    profiles, filters, region_statuses = parse_collection_args(parser, args)
+    metrics = RunMetrics()
+    _, regions_data = collect_inventory(profiles, args, filters, metrics, region_statuses=region_statuses)
+
+    start = time.perf_counter()
+    with metrics.phase("graph"):
+        graphs = {region: SecurityGroupGraph(inventory) for region, inventory in regions_data.items()}
+    built = time.perf_counter()
+
+    instance_id = args.to or args.source
+    region = next((region for region, graph in graphs.items() if instance_id in graph.instances), None)
+    if region is None:
+        parser.error(f"Instance {instance_id} not found in {', '.join(graphs) or 'any region'}")
+    graph = graphs[region]
+
+    check_egress = not args.no_egress_check
+    if args.to:
+        grants = graph.sources_of(args.to, args.port, args.protocol, check_egress)
+        if args.source:
+            grants = [grant for grant in grants if grant.instance_id == args.source]
+    else:
+        grants = graph.targets_of(args.source, args.port, args.protocol, check_egress)
+    queried = time.perf_counter()
+
+    port = "any port" if args.port is None else f"port {args.port}"
+    if args.to and args.source:
+        verdict = "can" if grants else "cannot"
+        print(f"\n{args.source} {verdict} reach {args.to} on {normalize_protocol(args.protocol)} {port} ({region})")
+    elif args.to:
+        print(f"\nSources that can reach {args.to} on {normalize_protocol(args.protocol)} {port} ({region}):")
+    else:
+        print(f"\nInstances {args.source} can reach on {normalize_protocol(args.protocol)} {port} ({region}):")
+    for grant in grants:
+        print(_describe_grant(grant, graph.instances))
+    if not grants and not (args.to and args.source):
+        print("  none")
+
+    print(
+        f"\nGraph of {len(graphs)} region(s) built in {(built - start) * 1000:.1f} ms, "
+        f"query answered in {(queried - built) * 1000:.2f} ms"
+    )
@@ -0,0 +1,74 @@
+"""
+``aws-inventory render``: rebuild the report and exports of a stored run.
+"""
+import argparse
+import os
+from aws_inventory.commands.arguments import add_database_arguments, add_report_arguments, parse_format_args
+from aws_inventory.utils.export import open_exporters
+from aws_inventory.utils.html_report import build_inventories, render_html, save_output
+from aws_inventory.utils.inventory_db import InventoryDatabase
+
+
+def main(argv):
+    """
+    ``aws-inventory render``: rebuild the report and exports of a run
+    stored in the database, without calling AWS.
+    """
+    parser = argparse.ArgumentParser(
+        prog="aws-inventory render",
+        description="Build the report of a stored run from the inventory database"
+    )
+    add_database_arguments(parser, "Inventory database", optional=False)
+    parser.add_argument(
+        "--run",
+        type=int,
+        help="ID of the run to render (default: the latest run)"
+    )
+    parser.add_argument(
+        "--list",
+        action="store_true",
+        help="List the stored runs and exit"
+    )
+    add_report_arguments(parser)
+    args = parser.parse_args(argv)
+    formats = parse_format_args(parser, args)
+    if not os.path.exists(args.db):
+        parser.error(f"No inventory database at {args.db}")
+
+    with InventoryDatabase(args.db) as db:
+        if args.list:
+            for run in db.runs():
+                print(
+                    f"{run['id']:>5}  {run['started']}  {', '.join(run['profiles'])}  "
+                    f"{run['regions']} region(s), {run['instances']} instance(s)"
+                )
+            return
+
+        run = db.get_run(args.run)
+        if run is None:
+            parser.error(f"No run {args.run} in {args.db}" if args.run else f"No run stored in {args.db}")
+        print(f"\nRendering run {run['id']} ({', '.join(run['profiles'])}, collected {run['started']})...")
+
+        # Exports are written as regions are read; the HTML report needs every
+        # region at once (summary, tabs, search index), so only it keeps them
+        exporters = open_exporters(formats)
+        regions_data = {}
+        try:
+            for key, account, region, inventory in db.iter_regions(run["id"]):
+                for exporter in exporters:
+                    exporter.write_region(region, inventory, account=account)
+                if "html" in formats:
+                    regions_data[key] = inventory
+        finally:
+            for exporter in exporters:
+                exporter.close()
+
+    for exporter in exporters:
+        print(f"Exported {exporter.count} record(s) to {exporter.path}")
+
+    if "html" in formats:
+        html_content = render_html(
+            build_inventories(regions_data, run["profiles"]), ", ".join(run["profiles"]), lazy=args.lazy,
+            timestamp=run["started"].replace("T", " ")
+        )
+        save_output(html_content, "inventory_report.html")
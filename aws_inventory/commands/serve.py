@@ -0,0 +1,221 @@
+"""
+``aws-inventory serve``: collect on a schedule and serve the latest report.
+"""
+import argparse
+import json
+import os
+import time
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from aws_inventory.commands.arguments import (
+    add_collection_arguments, add_database_arguments, add_report_arguments, parse_collection_args
+)
+from aws_inventory.commands.collection import collect_account, merge_accounts, open_account
+from aws_inventory.utils.common import split_region_key
+from aws_inventory.utils.export import dumps_inventory
+from aws_inventory.utils.html_report import build_inventories, render_html
+from aws_inventory.utils.inventory_db import InventoryDatabase
+from aws_inventory.utils.metrics import RunMetrics
+from aws_inventory.utils.regions import ENABLED_REGION_STATUSES
+from aws_inventory.utils.report_server import Document, ReportServer
+from aws_inventory.utils.snapshot import SnapshotStore
+from aws_inventory.utils.stats import calculate_ec2_stats
+
+DEFAULT_SERVE_HOST = "127.0.0.1"
+DEFAULT_SERVE_PORT = 8080
+DEFAULT_SERVE_INTERVAL = 900
+SERVE_PATHS = ("/", "/inventory.json", "/status.json")
+
+
+def refresh_accounts(profiles, args, filters, factories, snapshots, previous=None,
+                     region_statuses=ENABLED_REGION_STATUSES):
+    """
+    Collect every account again with its warm clients, for ``serve``.
+
+    Accounts are collected on threads, each with the ClientFactory and
+    SnapshotStore kept for it, so regions whose fingerprint is unchanged are
+    reused instead of downloaded again. An account that fails is reported
+    and keeps its ``previous`` result.
+
+    Args:
+        previous: Accounts returned by the previous refresh
+
+    Returns:
+        tuple: (accounts, regions) like collect_inventory
+
+    Raises:
+        RuntimeError: When no account could be collected
+    """
+    previous = previous or {}
+    accounts = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, min(args.max_accounts, len(profiles)))) as executor:
+        futures = {
+            profile: executor.submit(
+                # Phases overlap between threads, so each account times its own
+                collect_account, profile, args, filters, RunMetrics(), progress=False,
+                region_statuses=region_statuses, client_factory=factories[profile],
+                snapshots=snapshots[profile]
+            )
+            for profile in profiles
+        }
+        for profile, future in futures.items():
+            try:
+                accounts[profile] = future.result()
+            except Exception as e:
+                if profile in previous:
+                    print(f"Account {profile} failed, keeping its previous inventory: {e}")
+                    accounts[profile] = previous[profile]
+                else:
+                    print(f"Skipping account {profile}: {e}")
+
+    if not accounts:
+        raise RuntimeError("No account could be collected")
+    return accounts, merge_accounts(accounts, profiles)
+
+
+def _inventory_state(regions_data, snapshots, profiles):
+    # What a refresh is compared on: the hash of the inventory of every
+    # collected region, and the VPCs of the regions the probe summarized
+    state = {}
+    for key, inventory in regions_data.items():
+        account, region = split_region_key(key, profiles)
+        if inventory.summary:
+            state[key] = (inventory.summary, [vpc.to_list() for vpc in inventory.vpcs])
+        else:
+            state[key] = (None, snapshots[account].digest_of(region))
+    return state
+
+
+def main(argv):
+    """
+    ``aws-inventory serve``: keep the clients of every account warm,
+    collect again every ``--interval`` seconds, and serve the latest report
+    and inventory over HTTP.
+
+    Regions are collected incrementally: unchanged regions are reused from
+    the snapshots, and when nothing changed the published documents (and
+    their ETags) are kept as is, so nothing is rendered again. Snapshots
+    older than ``--snapshot-max-age`` are collected in full, which picks up
+    the changes the incremental fingerprint can't see (renames, security
+    group and IP changes).
+    """
+    parser = argparse.ArgumentParser(
+        prog="aws-inventory serve",
+        description="Collect on a schedule and serve the latest report and inventory JSON over HTTP"
+    )
+    add_collection_arguments(parser)
+    parser.add_argument(
+        "--host",
+        default=DEFAULT_SERVE_HOST,
+        help=f"Address the HTTP server listens on (default: {DEFAULT_SERVE_HOST})"
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=DEFAULT_SERVE_PORT,
+        help=f"Port of the HTTP server (default: {DEFAULT_SERVE_PORT})"
+    )
+    parser.add_argument(
+        "--interval",
+        type=int,
+        default=DEFAULT_SERVE_INTERVAL,
+        help=f"Seconds between two collections (default: {DEFAULT_SERVE_INTERVAL})"
+    )
+    add_report_arguments(parser, formats=False)
+    add_database_arguments(parser, "SQLite database every changed inventory is stored in")
+    args = parser.parse_args(argv)
+    profiles, filters, region_statuses = parse_collection_args(parser, args)
+    if args.interval <= 0:
+        parser.error("--interval must be a positive number of seconds")
+    if args.db_keep < 0:
+        parser.error("--db-keep must be 0 or a positive number of runs")
+
+    # Unchanged regions are detected through the incremental snapshots; a
+    # response cache outliving the interval would hide changes instead
+    args.incremental = True
+
+    metrics = RunMetrics()
+    factories = {
+        profile: open_account(profile, args, metrics, response_cache=False) for profile in profiles
+    }
+    snapshots = {
+        profile: SnapshotStore(
+            os.path.join(args.cache_dir, "snapshots", f"{profile}.json"), args.snapshot_max_age
+        )
+        for profile in profiles
+    }
+    db = None if args.no_db else InventoryDatabase(args.db)
+
+    server = ReportServer((args.host, args.port), SERVE_PATHS)
+    server.start()
+    print(f"Serving the inventory report on http://{args.host}:{args.port}/ every {args.interval}s (Ctrl-C to stop)")
+
+    status = {
+        "started": datetime.now().isoformat(timespec="seconds"),
+        "profiles": profiles,
+        "refreshes": 0,
+        "last_refresh": None,
+        "last_change": None,
+        "last_error": None,
+        "next_refresh": None,
+    }
+    state = None
+    accounts = {}
+
+    try:
+        while True:
+            started = datetime.now()
+            start = time.monotonic()
+            try:
+                accounts, regions_data = refresh_accounts(
+                    profiles, args, filters, factories, snapshots, accounts, region_statuses
+                )
+                current = _inventory_state(regions_data, snapshots, profiles)
+                changed = current != state
+                if changed:
+                    generated = started.strftime("%Y-%m-%d %H:%M:%S")
+                    stats = calculate_ec2_stats(regions_data)
+                    html = "".join(render_html(
+                        build_inventories(regions_data, accounts), ", ".join(accounts),
+                        lazy=args.lazy, timestamp=generated
+                    ))
+                    inventory_json = dumps_inventory(
+                        (split_region_key(key, profiles) + (inventory,) for key, inventory in regions_data.items()),
+                        generated=started.isoformat(timespec="seconds"),
+                        profiles=list(accounts),
+                        stats=stats,
+                    )
+                    server.publish({
+                        "/": Document(html.encode("utf-8"), "text/html; charset=utf-8"),
+                        "/inventory.json": Document(inventory_json, "application/json"),
+                    })
+                    if db is not None and regions_data:
+                        db.save_run(profiles, regions_data, started, args.db_keep)
+                    state = current
+                    status["last_change"] = started.isoformat(timespec="seconds")
+            except Exception as e:
+                # Keep serving the last report until a refresh succeeds
+                status["last_error"] = f"{started.isoformat(timespec='seconds')}: {e}"
+                print(f"[{started:%H:%M:%S}] Refresh failed: {e}")
+            else:
+                status["refreshes"] += 1
+                status["last_refresh"] = started.isoformat(timespec="seconds")
+                print(
+                    f"[{started:%H:%M:%S}] Refreshed {len(regions_data)} region(s) in "
+                    f"{time.monotonic() - start:.1f}s: {'report updated' if changed else 'no change'}"
+                )
+
+            delay = max(0.0, args.interval - (time.monotonic() - start))
+            status["next_refresh"] = (datetime.now() + timedelta(seconds=delay)).isoformat(timespec="seconds")
+            status["api"] = metrics.totals()
+            server.publish({
+                "/status.json": Document(json.dumps(status, default=str).encode("utf-8"), "application/json"),
+            })
+            time.sleep(delay)
+    except KeyboardInterrupt:
+        print("\nStopping the report server")
+    finally:
+        server.stop()
+        if db is not None:
+            db.close()
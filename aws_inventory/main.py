@@ -1,57 +1,140 @@
 import argparse
-from tqdm import tqdm
-from aws_inventory.regional.ec2 import collect_ec2
-from aws_inventory.utils.html_report import render_html, save_output
-from aws_inventory.utils.boto_helpers import create_session, get_all_regions
+import os
+import sys
+from aws_inventory.commands import reach, render, serve
+from aws_inventory.commands.arguments import (
+    add_collection_arguments, add_database_arguments, add_report_arguments, parse_collection_args,
+    parse_format_args
+)
+from aws_inventory.commands.collection import collect_inventory
+from aws_inventory.renderers.environment import enable_bytecode_cache
+from aws_inventory.utils.html_report import build_inventories, render_html, save_output
+from aws_inventory.utils.export import open_exporters
+from aws_inventory.utils.metrics import RunMetrics
+from aws_inventory.utils.stats import calculate_ec2_stats
+from aws_inventory.utils.inventory_db import InventoryDatabase
 
 
-def parse_regions(regions_arg, session):
-    """Parse the regions argument into a list of region names."""
-    if regions_arg.lower() == "all":
-        return get_all_regions("ec2", session)
-    return [r.strip() for r in regions_arg.split(",")]
+def _sum_stats(counters):
+    """Sum per-account counter dicts, skipping missing ones."""
+    total = {}
+    for stats in counters:
+        for key, value in (stats or {}).items():
+            total[key] = total.get(key, 0) + value
+    return total
 
 
-def main():
-    parser = argparse.ArgumentParser(description="AWS Inventory Tool")
-    parser.add_argument("--profile", required=True, help="AWS profile name")
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in COMMANDS:
+        return COMMANDS[argv[0]](argv[1:])
+
+    parser = argparse.ArgumentParser(
+        description="AWS Inventory Tool",
+        epilog=f"Other commands: {', '.join(COMMANDS)} (aws-inventory <command> --help)"
+    )
+    add_collection_arguments(parser)
+    add_report_arguments(parser)
+    add_database_arguments(parser, "SQLite database the inventory of every run is stored in")
+    parser.add_argument(
+        "--metrics-file",
+        metavar="PATH",
+        help="Write phase and per-API timings of the run to this JSON file"
+    )
     parser.add_argument(
-        "--regions", 
-        default="us-east-1", 
-        help="Comma-separated regions or 'all'"
+        "--diagnostics",
+        action="store_true",
+        help="Append a 'Run diagnostics' section with phase and API timings to the HTML report"
     )
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+
+    profiles, filters, region_statuses = parse_collection_args(parser, args)
+    formats = parse_format_args(parser, args)
+    if args.db_keep < 0:
+        parser.error("--db-keep must be 0 or a positive number of runs")
+
+    metrics = RunMetrics()
 
-    session = create_session(args.profile)
-    regions = parse_regions(args.regions, session)
+    # Records are exported region by region, as soon as each one is collected
+    exporters = open_exporters(formats)
 
-    print(f"\nStarting AWS inventory collection for {len(regions)} region(s)...\n")
+    def export_region(profile, region, inventory):
+        for exporter in exporters:
+            exporter.write_region(region, inventory, account=profile)
 
-    # Collect inventories grouped by service type
-    inventories_by_service = {}
+    try:
+        accounts, ec2_regions_data = collect_inventory(
+            profiles, args, filters, metrics,
+            on_region=export_region if exporters else None,
+            region_statuses=region_statuses
+        )
+    finally:
+        for exporter in exporters:
+            exporter.close()
 
-    # Collect EC2 data for all regions with progress bar
-    ec2_regions_data = {}
-    for region in tqdm(regions, desc="Collecting EC2 data", unit="region"):
-        ec2_data = collect_ec2(args.profile, region)
-        ec2_regions_data[region] = ec2_data
+    for exporter in exporters:
+        print(f"Exported {exporter.count} record(s) to {exporter.path}")
 
-    # Group by service
-    if ec2_regions_data:
-        inventories_by_service["EC2"] = {
-            "type": "ec2",
-            "regions": ec2_regions_data
-        }
+    with metrics.phase("stats"):
+        ec2_stats = calculate_ec2_stats(ec2_regions_data)
 
-    print("\nGenerating HTML report...")
+    if ec2_regions_data and not args.no_db:
+        with metrics.phase("database"):
+            with InventoryDatabase(args.db) as db:
+                run_id = db.save_run(profiles, ec2_regions_data, metrics.started, args.db_keep)
+        print(f"Inventory stored as run {run_id} in {args.db}")
 
-    # Render HTML from structured data
-    html_content = render_html(inventories_by_service, args.profile)
-    filename = "inventory_report.html"
-    save_output(html_content, filename)
+    scheduler_stats = _sum_stats(result["scheduler"] for result in accounts.values())
+    cache_stats = _sum_stats(result["cache"] for result in accounts.values())
+    if scheduler_stats:
+        print(
+            f"\nAPI calls: {scheduler_stats['calls']} "
+            f"(throttled: {scheduler_stats['throttled']}, retried: {scheduler_stats['retried']})"
+        )
+    if cache_stats:
+        print(f"Cached responses used: {cache_stats['hits']} (misses: {cache_stats['misses']})")
+
+    if "html" in formats:
+        print("\nGenerating HTML report...")
+
+        if not args.no_cache:
+            enable_bytecode_cache(os.path.join(args.cache_dir, "templates"))
+
+        # Render HTML from structured data; fragments are rendered as they are written
+        html_content = render_html(
+            build_inventories(ec2_regions_data, accounts), ", ".join(accounts), lazy=args.lazy,
+            metrics=metrics if args.diagnostics else None
+        )
+        filename = "inventory_report.html"
+        with metrics.phase("save"):
+            save_output(metrics.timed("render", html_content), filename)
+
+    if args.metrics_file:
+        extra = {}
+        if len(profiles) > 1:
+            # Worker processes overlap, so their phases are kept per account
+            extra["accounts"] = {profile: result["phases"] for profile, result in accounts.items()}
+        metrics.save(
+            args.metrics_file,
+            profiles=profiles,
+            regions=list(ec2_regions_data),
+            scheduler=scheduler_stats,
+            cache=cache_stats or None,
+            resources={key: value for key, value in ec2_stats.items() if key != "regions"},
+            **extra,
+        )
+        print(f"Run metrics written to {args.metrics_file}")
 
     print("Inventory collection complete!\n")
 
 
+# Subcommands of aws-inventory; without one, main() collects and writes the report
+COMMANDS = {
+    "reach": reach.main,
+    "render": render.main,
+    "serve": serve.main,
+}
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
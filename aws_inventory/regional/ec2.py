@@ -1,14 +1,146 @@
 # EC2 inventory collector - orchestrates all EC2 resource collection
-from aws_inventory.utils.boto_helpers import create_session
-from aws_inventory.collectors.security_groups import collect_security_groups
-from aws_inventory.collectors.instances import collect_instances
+from concurrent.futures import ThreadPoolExecutor
+from aws_inventory.utils.boto_helpers import DEFAULT_PAGE_SIZE, build_ec2_filters
+from aws_inventory.utils.snapshot import fingerprint
+from aws_inventory.collectors.security_groups import (
+    collect_security_groups,
+    group_security_groups_by_vpc
+)
+from aws_inventory.collectors.instances import (
+    collect_instances,
+    collect_instance_states,
+    group_instances_by_subnet,
+    parse_instances
+)
 from aws_inventory.collectors.vpcs import (
     collect_internet_gateways,
     collect_subnets,
-    collect_vpcs
+    collect_vpcs,
+    group_subnets_by_vpc,
+    build_region_inventory,
+    parse_vpc
 )
+from aws_inventory.collectors.model import MODEL_VERSION, RegionInventory
+
+# Smallest MaxResults accepted by describe_instances and describe_vpcs
+PROBE_PAGE_SIZE = 5
 
-def collect_ec2(profile, region):
+
+def probe_region(ec2_client, executor, filters=None):
+    """
+    Classify a region from the first page of its instances and VPCs.
+
+    Both calls request PROBE_PAGE_SIZE items only, so they are cheap even
+    in large regions, and are issued concurrently.
+
+    Args:
+        ec2_client: boto3 EC2 client of the region
+        executor: Executor running describe_instances alongside describe_vpcs
+        filters: Inventory filters, applied like in the full collection
+
+    Returns:
+        tuple: (summary, vpcs, instances). ``summary`` is "empty" when the
+        region has no VPC and no instance (or no instance matching the tag
+        filters), "default-only" when it has only
+        its default VPC and no instance, None otherwise. ``vpcs`` and
+        ``instances`` are the records of the probe pages when they hold
+        every item, None when there are more pages.
+    """
+    instances_future = executor.submit(
+        ec2_client.describe_instances, MaxResults=PROBE_PAGE_SIZE,
+        **build_ec2_filters(filters, with_states=True)
+    )
+    vpcs_page = ec2_client.describe_vpcs(MaxResults=PROBE_PAGE_SIZE, **build_ec2_filters(filters))
+    return classify_probe(vpcs_page, instances_future.result(), filters)
+
+
+def has_tag_filters(filters):
+    """Whether the inventory only keeps the resources used by tag-filtered instances."""
+    return bool(filters and filters.get("tags"))
+
+
+def classify_probe(vpcs_page, instances_page, filters=None):
+    """Classify a region from its probe pages; see probe_region for the result."""
+    vpcs = None
+    if not vpcs_page.get("NextToken"):
+        vpcs = [parse_vpc(vpc) for vpc in vpcs_page["Vpcs"]]
+    instances = None
+    if not instances_page.get("NextToken"):
+        instances = list(parse_instances(instances_page["Reservations"]))
+
+    summary = None
+    if instances == [] and has_tag_filters(filters):
+        # No instance has the tags, so no VPC would be kept after the join
+        summary, vpcs = "empty", []
+    elif instances == [] and vpcs is not None:
+        if not vpcs:
+            summary = "empty"
+        elif len(vpcs) == 1 and vpcs_page["Vpcs"][0].get("IsDefault"):
+            summary = "default-only"
+    return summary, vpcs, instances
+
+
+def region_fingerprint(filters, vpcs, instances):
+    """
+    Fingerprint what an incremental run compares with the previous run.
+
+    Only light signals are covered: the VPCs of the probe page when it holds
+    every VPC (None otherwise), and either the instances of the probe page
+    when it holds them all, or the instance IDs and states returned by
+    describe_instance_status. Security groups, subnets and internet
+    gateways aren't fetched to build it.
+    """
+    return fingerprint(MODEL_VERSION, filters, vpcs, instances)
+
+
+def select_used_resources(vpcs, subnets, instances, sg_map, igws_by_vpc):
+    """
+    Keep only the VPCs, subnets, security groups and internet gateways
+    used by ``instances``.
+
+    Tag filters only apply to describe_instances: the other resources are
+    fetched for the whole region (or the filtered VPCs) and narrowed down
+    here, so an instance is never dropped because its subnet or VPC lacks
+    the tags.
+
+    Returns:
+        tuple: (vpcs, subnets, sg_map, igws_by_vpc), filtered
+    """
+    subnet_ids = {instance.subnet_id for instance in instances}
+    sg_ids = {sg_id for instance in instances for sg_id in instance.security_group_ids}
+    subnets = [subnet for subnet in subnets if subnet.id in subnet_ids]
+    vpc_ids = {subnet.vpc_id for subnet in subnets}
+    return (
+        [vpc for vpc in vpcs if vpc.id in vpc_ids],
+        subnets,
+        {sg_id: sg for sg_id, sg in sg_map.items() if sg_id in sg_ids},
+        {vpc_id: igws for vpc_id, igws in igws_by_vpc.items() if vpc_id in vpc_ids},
+    )
+
+
+def join_region(vpcs, subnets, instances, sg_map, igws_by_vpc, filters=None):
+    """
+    Join phase: index the fetched records of a region by ID.
+
+    With tag filters, only the resources used by the matching instances are
+    kept (see select_used_resources).
+    """
+    if has_tag_filters(filters):
+        vpcs, subnets, sg_map, igws_by_vpc = select_used_resources(
+            vpcs, subnets, instances, sg_map, igws_by_vpc
+        )
+    return build_region_inventory(
+        vpcs,
+        group_subnets_by_vpc(subnets),
+        group_instances_by_subnet(instances),
+        sg_map,
+        group_security_groups_by_vpc(sg_map),
+        igws_by_vpc,
+    )
+
+
+def collect_ec2(client_factory, region, page_size=DEFAULT_PAGE_SIZE, filters=None, snapshots=None,
+                probe=True):
     """
     Collect EC2 inventory for a given region
 
@@ -19,21 +151,73 @@ def collect_ec2(profile, region):
     - Subnets
     - Internet Gateways
 
+    The describe calls don't depend on each other, so they are all issued
+    concurrently; the results are then joined in memory.
+
+    Unless ``probe`` is False, the region is first probed with
+    probe_region: regions that are empty or hold only the default VPC are
+    returned right away, without their default subnets and security
+    groups, as a RegionInventory whose ``summary`` says which. Probe pages
+    holding every VPC or instance are reused instead of being fetched again.
+
+    In incremental mode (``snapshots`` given), the region is fingerprinted
+    from the probe pages and, when they don't hold every instance, the much
+    lighter describe_instance_status (see region_fingerprint). If the
+    fingerprint matches the previous run and the snapshot is younger than
+    the store's ``max_age``, the stored inventory is returned as is, without
+    fetching anything else; otherwise the region is collected in full.
+
     Args:
-        profile AWS profile name
+        client_factory: ClientFactory providing the shared EC2 clients
         region: AWS region name
+        page_size: Number of items requested per describe_* page
+        filters: Optional dict of "vpc_ids", "instance_states" and "tags"
+            translated into server-side EC2 filters
+        snapshots: Optional SnapshotStore holding the previous run
+        probe: Skip the full collection of empty and default-only regions
 
     Returns: 
-        list: List of VPC dictionaries with all nested resources
+        RegionInventory: Normalized records of the region
     """
-    session = create_session(profile)
-    ec2 = session.client("ec2", region_name=region)
+    ec2 = client_factory.client("ec2", region)
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        vpcs = instances = None
+        if probe:
+            summary, vpcs, instances = probe_region(ec2, executor, filters)
+            if summary:
+                return RegionInventory(vpcs=vpcs, summary=summary)
+
+        if snapshots is not None:
+            # A complete probe page already holds every instance
+            states = instances
+            if states is None:
+                states = collect_instance_states(ec2, page_size)
+            current = region_fingerprint(filters, vpcs, states)
+            previous = snapshots.get(region, current)
+            if previous is not None:
+                return RegionInventory.from_dict(previous)
+
+        # Fetch phase: one round-trip per resource type, in parallel
+        sg_future = executor.submit(collect_security_groups, ec2, page_size, filters)
+        igws_future = executor.submit(collect_internet_gateways, ec2, page_size, filters)
+        subnets_future = executor.submit(collect_subnets, ec2, page_size, filters)
+        if vpcs is None:
+            vpcs_future = executor.submit(collect_vpcs, ec2, page_size, filters)
+        if instances is None:
+            instances_future = executor.submit(collect_instances, ec2, page_size, filters)
+
+        sg_map = sg_future.result()
+        igws_by_vpc = igws_future.result()
+        subnets = subnets_future.result()
+        if vpcs is None:
+            vpcs = vpcs_future.result()
+        if instances is None:
+            instances = instances_future.result()
+
+    inventory = join_region(vpcs, subnets, instances, sg_map, igws_by_vpc, filters)
 
-    # Collect resources in dependency order
-    sg_map = collect_security_groups(ec2)
-    instances_by_subnet = collect_instances(ec2, sg_map)
-    igws_by_vpc = collect_internet_gateways(ec2)
-    subnets_by_vpc = collect_subnets(ec2, instances_by_subnet)
-    inventory = collect_vpcs(ec2, subnets_by_vpc, igws_by_vpc, sg_map)
+    if snapshots is not None:
+        snapshots.put(region, current, inventory.to_dict())
 
-    return inventory
\ No newline at end of file
+    return inventory
@@ -0,0 +1,201 @@
+# asyncio EC2 collection engine - the aiobotocore counterpart of regional/ec2.py
+import asyncio
+from aws_inventory.utils.aio_helpers import apaginate
+from aws_inventory.utils.boto_helpers import DEFAULT_PAGE_SIZE, build_ec2_filters, skip_region_error
+from aws_inventory.collectors.security_groups import parse_security_group
+from aws_inventory.collectors.instances import parse_instance_state, parse_instances
+from aws_inventory.collectors.vpcs import add_internet_gateway, parse_subnet, parse_vpc
+from aws_inventory.collectors.model import RegionInventory
+from aws_inventory.regional.ec2 import (
+    PROBE_PAGE_SIZE,
+    classify_probe,
+    join_region,
+    region_fingerprint
+)
+
+# The describe calls below are the ones made by the collectors, and their
+# items go through the same parsers, one at a time as they are paged in,
+# so both engines produce identical inventories without holding the raw
+# responses of a region.
+
+
+async def collect_security_groups_async(ec2_client, page_size=None, filters=None):
+    """Async counterpart of collectors.security_groups.collect_security_groups."""
+    return {
+        sg["GroupId"]: parse_security_group(sg)
+        async for sg in apaginate(
+            ec2_client, "describe_security_groups", "SecurityGroups", page_size,
+            **build_ec2_filters(filters)
+        )
+    }
+
+
+async def collect_internet_gateways_async(ec2_client, page_size=None, filters=None):
+    """Async counterpart of collectors.vpcs.collect_internet_gateways."""
+    igws_by_vpc = {}
+    async for igw in apaginate(
+        ec2_client, "describe_internet_gateways", "InternetGateways", page_size,
+        **build_ec2_filters(filters, vpc_filter="attachment.vpc-id")
+    ):
+        add_internet_gateway(igws_by_vpc, igw)
+    return igws_by_vpc
+
+
+async def collect_subnets_async(ec2_client, page_size=None, filters=None):
+    """Async counterpart of collectors.vpcs.collect_subnets."""
+    return [
+        parse_subnet(subnet)
+        async for subnet in apaginate(
+            ec2_client, "describe_subnets", "Subnets", page_size, **build_ec2_filters(filters)
+        )
+    ]
+
+
+async def collect_vpcs_async(ec2_client, page_size=None, filters=None):
+    """Async counterpart of collectors.vpcs.collect_vpcs."""
+    return [
+        parse_vpc(vpc)
+        async for vpc in apaginate(
+            ec2_client, "describe_vpcs", "Vpcs", page_size, **build_ec2_filters(filters)
+        )
+    ]
+
+
+async def collect_instances_async(ec2_client, page_size=None, filters=None):
+    """Async counterpart of collectors.instances.collect_instances."""
+    return [
+        instance
+        async for reservation in apaginate(
+            ec2_client, "describe_instances", "Reservations", page_size,
+            **build_ec2_filters(filters, with_states=True)
+        )
+        for instance in parse_instances((reservation,))
+    ]
+
+
+async def collect_instance_states_async(ec2_client, page_size=None):
+    """Async counterpart of collectors.instances.collect_instance_states."""
+    return dict([
+        parse_instance_state(status)
+        async for status in apaginate(
+            ec2_client, "describe_instance_status", "InstanceStatuses", page_size,
+            IncludeAllInstances=True
+        )
+    ])
+
+
+async def probe_region_async(ec2_client, filters=None):
+    """Async counterpart of regional.ec2.probe_region."""
+    instances_page, vpcs_page = await asyncio.gather(
+        ec2_client.describe_instances(
+            MaxResults=PROBE_PAGE_SIZE, **build_ec2_filters(filters, with_states=True)
+        ),
+        ec2_client.describe_vpcs(MaxResults=PROBE_PAGE_SIZE, **build_ec2_filters(filters)),
+    )
+    return classify_probe(vpcs_page, instances_page, filters)
+
+
+async def collect_ec2_async(client_factory, region, page_size=DEFAULT_PAGE_SIZE, filters=None,
+                            snapshots=None, probe=True):
+    """
+    Collect EC2 inventory for a given region on the running event loop
+
+    Same collection as regional.ec2.collect_ec2 (probe, concurrent fetch
+    phase, incremental fingerprint and join), with the describe calls
+    awaited concurrently instead of run on a thread pool.
+
+    Args:
+        client_factory: AsyncClientFactory providing the shared EC2 clients
+        region: AWS region name
+        page_size: Number of items requested per describe_* page
+        filters: Optional dict of "vpc_ids", "instance_states" and "tags"
+            translated into server-side EC2 filters
+        snapshots: Optional SnapshotStore holding the previous run
+        probe: Skip the full collection of empty and default-only regions
+
+    Returns:
+        RegionInventory: Normalized records of the region
+    """
+    ec2 = await client_factory.client("ec2", region)
+
+    vpcs = instances = None
+    if probe:
+        summary, vpcs, instances = await probe_region_async(ec2, filters)
+        if summary:
+            return RegionInventory(vpcs=vpcs, summary=summary)
+
+    if snapshots is not None:
+        # A complete probe page already holds every instance
+        states = instances
+        if states is None:
+            states = await collect_instance_states_async(ec2, page_size)
+        current = region_fingerprint(filters, vpcs, states)
+        previous = snapshots.get(region, current)
+        if previous is not None:
+            return RegionInventory.from_dict(previous)
+
+    # Fetch phase: one round-trip per resource type, awaited together
+    fetches = {
+        "sg_map": collect_security_groups_async(ec2, page_size, filters),
+        "igws_by_vpc": collect_internet_gateways_async(ec2, page_size, filters),
+        "subnets": collect_subnets_async(ec2, page_size, filters),
+    }
+    if vpcs is None:
+        fetches["vpcs"] = collect_vpcs_async(ec2, page_size, filters)
+    if instances is None:
+        fetches["instances"] = collect_instances_async(ec2, page_size, filters)
+
+    fetched = dict(zip(fetches, await asyncio.gather(*fetches.values())))
+    sg_map = fetched["sg_map"]
+    igws_by_vpc = fetched["igws_by_vpc"]
+    subnets = fetched["subnets"]
+    vpcs = fetched.get("vpcs", vpcs)
+    instances = fetched.get("instances", instances)
+
+    inventory = join_region(vpcs, subnets, instances, sg_map, igws_by_vpc, filters)
+
+    if snapshots is not None:
+        snapshots.put(region, current, inventory.to_dict())
+
+    return inventory
+
+
+async def iter_regions_async(client_factory, regions, max_regions, page_size=DEFAULT_PAGE_SIZE,
+                             filters=None, snapshots=None, probe=True):
+    """
+    Collect regions concurrently, yielding them as they complete.
+
+    Args:
+        client_factory: AsyncClientFactory shared by all regions
+        regions: List of region names
+        max_regions: Maximum number of regions collected at the same time
+        page_size: Number of items requested per describe_* page
+        filters: Server-side filters applied to every describe call
+        snapshots: Optional SnapshotStore enabling incremental collection
+        probe: Skip the full collection of empty and default-only regions
+
+    Yields:
+        tuple: (region, RegionInventory), in completion order; the inventory
+        is None for regions skipped by skip_region_error
+    """
+    semaphore = asyncio.Semaphore(max(1, max_regions))
+
+    async def collect(region):
+        async with semaphore:
+            try:
+                return region, await collect_ec2_async(
+                    client_factory, region, page_size, filters, snapshots, probe
+                )
+            except Exception as e:
+                if not skip_region_error(region, e):
+                    raise
+                return region, None
+
+    tasks = [asyncio.ensure_future(collect(region)) for region in regions]
+    try:
+        for next_region in asyncio.as_completed(tasks):
+            yield await next_region
+    finally:
+        # Stop the remaining regions if the caller gives up or one failed
+        for task in tasks:
+            task.cancel()
@@ -1,7 +1,20 @@
-"""EC2-specific HTML rendering logic."""
-from jinja2 import Template
-from aws_inventory.utils.stats import calculate_ec2_stats, calculate_region_stats
-from aws_inventory.renderers import templates
+"""EC2-specific HTML rendering logic.
+
+Every render function is a generator of HTML fragments, so the report can
+be written to disk piece by piece instead of being built as one string.
+Sections with a template in templates.py are rendered through the shared,
+precompiled Jinja environment.
+
+In lazy mode only the dashboard and region tabs are rendered here; the
+inventory is embedded as compact JSON and the scripts from
+templates.get_lazy_scripts() build each region, VPC and security group
+when it is first opened.
+"""
+import json
+import re
+from functools import partial
+from aws_inventory.utils.stats import calculate_ec2_stats
+from aws_inventory.renderers.environment import get_template
 
 
 def render_sg_rules_table(sg, direction="inbound"):
@@ -9,22 +22,22 @@ def render_sg_rules_table(sg, direction="inbound"):
     Render security group rules table.
     
     Args:
-        sg: Security group dictionary
+        sg: SecurityGroup record
         direction: 'inbound' or 'outbound'
         
-    Returns:
-        str: Rendered HTML table
+    Yields:
+        str: HTML fragments of the table
     """
-    rules = sg.get(f"{direction}_rules", [])
-    source_dest = "sources" if direction == "inbound" else "destinations"
+    rules = sg.inbound_rules if direction == "inbound" else sg.outbound_rules
     label = "Source" if direction == "inbound" else "Destination"
     icon = "arrow-down-circle" if direction == "inbound" else "arrow-up-circle"
     color = "success" if direction == "inbound" else "warning"
     
     if not rules:
-        return f'<p class="text-muted"><em>No {direction} rules</em></p>'
+        yield f'<p class="text-muted"><em>No {direction} rules</em></p>'
+        return
     
-    html = f"""
+    yield f"""
     <h6 class="text-{color}">
       <i class="bi bi-{icon}"></i> {direction.capitalize()} Rules
     </h6>
@@ -41,85 +54,83 @@ def render_sg_rules_table(sg, direction="inbound"):
     """
     
     for rule in rules:
-        from_port = rule.get("from_port", "all")
-        to_port = rule.get("to_port", "all")
+        from_port = rule.from_port
+        to_port = rule.to_port
         port_range = from_port if from_port == to_port else f"{from_port} - {to_port}"
         
-        html += f"""
+        badges = "".join(
+            f'<span class="badge {"bg-info" if peer.type == "cidr" else "bg-primary"}">{peer.value}</span><br>'
+            for peer in rule.peers
+        )
+        descriptions = "".join(
+            f'<small class="text-muted">{peer.description}</small><br>'
+            for peer in rule.peers
+        )
+        
+        yield f"""
         <tr>
-          <td><span class="badge bg-secondary">{rule.get('protocol', 'all')}</span></td>
+          <td><span class="badge bg-secondary">{rule.protocol}</span></td>
           <td>{port_range}</td>
           <td>
-        """
-        
-        for item in rule.get(source_dest, []):
-            badge_class = "bg-info" if item.get("type") == "cidr" else "bg-primary"
-            html += f'<span class="badge {badge_class}">{item.get("value", "")}</span><br>'
-        
-        html += "</td><td>"
-        
-        for item in rule.get(source_dest, []):
-            desc = item.get("description", "-")
-            html += f'<small class="text-muted">{desc}</small><br>'
-        
-        html += "</td></tr>"
+        {badges}</td><td>{descriptions}</td></tr>"""
     
-    html += "</tbody></table>"
-    return html
+    yield "</tbody></table>"
+
+
+def render_sg_rules_tables(sg):
+    """Render the inbound and outbound rules tables of a security group."""
+    yield from render_sg_rules_table(sg, "inbound")
+    yield from render_sg_rules_table(sg, "outbound")
+
+
+def render_sg_badge(sg, sg_cache):
+    """
+    Return the instance-table badge of a security group, rendered once per SG ID.
+
+    Only badges are cached: they are repeated on every instance row of the
+    SG, while its rules tables are rendered once, in the accordion of its
+    VPC, and streamed.
 
+    Args:
+        sg: SecurityGroup record
+        sg_cache: Dict shared by the whole report, keyed by SG ID
+    """
+    badge = sg_cache.get(sg.id)
+    if badge is None:
+        badge = sg_cache[sg.id] = (
+            f'<span class="badge bg-primary" title="{sg.name} - {sg.description}">{sg.id}</span> '
+        )
+    return badge
 
-def render_security_groups(vpc, region_safe, vpc_index):
+
+def render_security_groups(inventory, vpc, region_safe, vpc_index):
     """Render security groups section for a VPC."""
-    if not vpc.get("security_groups"):
-        return ""
+    security_groups = inventory.security_groups_of(vpc.id)
+    if not security_groups:
+        return
     
-    html = '<div class="mb-4"><h5>Security Groups</h5>'
-    html += f'<div class="accordion" id="sgAccordion{region_safe}{vpc_index}">'
+    yield '<div class="mb-4"><h5>Security Groups</h5>'
+    yield f'<div class="accordion" id="sgAccordion{region_safe}{vpc_index}">'
     
-    for sg_index, sg in enumerate(vpc["security_groups"], 1):
-        inbound_table = render_sg_rules_table(sg, "inbound")
-        outbound_table = render_sg_rules_table(sg, "outbound")
-        
-        html += f"""
-        <div class="accordion-item">
-          <h2 class="accordion-header">
-            <button class="accordion-button collapsed" type="button"
-                    data-bs-toggle="collapse"
-                    data-bs-target="#sg{region_safe}{vpc_index}{sg_index}"
-                    aria-expanded="false">
-              <code>{sg['id']}</code>
-              <span class="ms-2"><strong>{sg['name']}</strong></span>
-              <span class="ms-2 text-muted small">{sg['description']}</span>
-              <span class="ms-auto me-2">
-                <span class="badge bg-success" title="Inbound rules">
-                  ↓ {len(sg.get('inbound_rules', []))}
-                </span>
-                <span class="badge bg-warning text-dark" title="Outbound rules">
-                  ↑ {len(sg.get('outbound_rules', []))}
-                </span>
-              </span>
-            </button>
-          </h2>
-          <div id="sg{region_safe}{vpc_index}{sg_index}"
-               class="accordion-collapse collapse">
-            <div class="accordion-body">
-              {inbound_table}
-              {outbound_table}
-            </div>
-          </div>
-        </div>
-        """
+    yield from get_template("ec2_sg.html").generate(
+        security_groups=security_groups,
+        region_safe=region_safe,
+        vpc_index=vpc_index,
+        sg_rules_tables=render_sg_rules_tables
+    )
     
-    html += '</div></div>'
-    return html
+    yield '</div></div>'
 
 
-def render_instances_table(instances):
+def render_instances_table(inventory, instances, sg_cache=None):
     """Render instances table for a subnet."""
     if not instances:
-        return '<p class="text-muted"><em>No instances in this subnet</em></p>'
+        yield '<p class="text-muted"><em>No instances in this subnet</em></p>'
+        return
+    if sg_cache is None:
+        sg_cache = {}
     
-    html = """
+    yield """
     <h6 class="mt-3">EC2 Instances:</h6>
     <div class="table-responsive">
       <table class="table table-sm table-hover">
@@ -138,7 +149,7 @@ def render_instances_table(instances):
     """
     
     for instance in instances:
-        state = instance.get("state", "unknown")
+        state = instance.state or "unknown"
         if state == "running":
             state_badge = f'<span class="badge bg-success">{state}</span>'
         elif state == "stopped":
@@ -146,242 +157,351 @@ def render_instances_table(instances):
         else:
             state_badge = f'<span class="badge bg-warning">{state}</span>'
         
-        sg_badges = ""
-        for sg in instance.get("security_groups", []):
-            title = f"{sg['name']} - {sg['description']}"
-            sg_badges += f'<span class="badge bg-primary" title="{title}">{sg["id"]}</span> '
+        sg_badges = "".join(
+            render_sg_badge(sg, sg_cache) for sg in inventory.instance_security_groups(instance)
+        )
         
-        html += f"""
-        <tr>
-          <td><code>{instance.get('id', '')}</code></td>
-          <td>{instance.get('name') or '-'}</td>
-          <td><span class="badge bg-light text-dark">{instance.get('type', '')}</span></td>
+        yield f"""
+        <tr data-instance="{instance.id}">
+          <td><code>{instance.id}</code></td>
+          <td>{instance.name or '-'}</td>
+          <td><span class="badge bg-light text-dark">{instance.type}</span></td>
           <td>{state_badge}</td>
-          <td><code>{instance.get('private_ip') or '-'}</code></td>
-          <td><code>{instance.get('public_ip') or '-'}</code></td>
+          <td><code>{instance.private_ip or '-'}</code></td>
+          <td><code>{instance.public_ip or '-'}</code></td>
           <td>{sg_badges}</td>
         </tr>
         """
     
-    html += "</tbody></table></div>"
-    return html
+    yield "</tbody></table></div>"
 
 
-def render_subnets(vpc):
+def render_subnets(inventory, vpc, sg_cache=None):
     """Render subnets section for a VPC."""
-    if not vpc.get("subnets"):
-        return '<p class="text-muted"><em>No subnets in this VPC</em></p>'
+    subnets = inventory.subnets_of(vpc.id)
+    if not subnets:
+        yield '<p class="text-muted"><em>No subnets in this VPC</em></p>'
+        return
     
-    html = '<h5>Subnets</h5>'
+    yield '<h5>Subnets</h5>'
     
-    for subnet in vpc["subnets"]:
-        instance_count = len(subnet.get("instances", []))
-        instances_html = render_instances_table(subnet.get("instances", []))
+    for subnet in subnets:
+        instances = inventory.instances_of(subnet.id)
+        instance_count = inventory.stats["subnets"][subnet.id]["instance_count"]
         
-        html += f"""
-        <div class="card mb-2">
+        yield f"""
+        <div class="card mb-2" data-subnet="{subnet.id}">
           <div class="card-body">
             <h6 class="card-subtitle mb-2">
-              <span class="badge bg-secondary">{subnet['id']}</span>
-              {'<strong>' + subnet['name'] + '</strong>' if subnet.get('name') else ''}
+              <span class="badge bg-secondary">{subnet.id}</span>
+              {'<strong>' + subnet.name + '</strong>' if subnet.name else ''}
               <span class="badge bg-primary ms-2">
                 <i class="bi bi-server"></i> {instance_count} instance(s)
               </span>
             </h6>
             <p class="mb-2">
               <small>
-                <strong>CIDR:</strong> {subnet.get('cidr', '')} | 
-                <strong>AZ:</strong> {subnet.get('az', '')}
+                <strong>CIDR:</strong> {subnet.cidr} | 
+                <strong>AZ:</strong> {subnet.az}
               </small>
             </p>
-            {instances_html}
+            """
+        yield from render_instances_table(inventory, instances, sg_cache)
+        yield """
           </div>
         </div>
         """
-    
-    return html
-
-
-def render_vpc_body(vpc, region_safe, vpc_index):
-    """Render the complete body of a VPC accordion."""
-    igws_html = ""
-    if vpc.get("igws"):
-        igws_html = '<div class="mb-3"><strong>Internet Gateways:</strong> '
-        for igw in vpc["igws"]:
-            name_part = f" ({igw['name']})" if igw.get('name') else ""
-            igws_html += f'<span class="badge bg-info">{igw["id"]}{name_part}</span> '
-        igws_html += '</div>'
+
+
+def render_vpc_body(inventory, vpc, region_safe, vpc_index, sg_cache=None):
+    """
+    Render the complete body of a VPC accordion.
+
+    ``sg_cache`` holds the security group badges already rendered for the
+    report, so SGs shared by many instances are only rendered once.
+    """
+    if sg_cache is None:
+        sg_cache = {}
+
+    igws = inventory.igws_of(vpc.id)
+    if igws:
+        yield '<div class="mb-3"><strong>Internet Gateways:</strong> '
+        for igw in igws:
+            name_part = f" ({igw.name})" if igw.name else ""
+            yield f'<span class="badge bg-info">{igw.id}{name_part}</span> '
+        yield '</div>'
     else:
-        igws_html = '<div class="mb-3"><strong>Internet Gateways:</strong> <span class="text-muted">None</span></div>'
+        yield '<div class="mb-3"><strong>Internet Gateways:</strong> <span class="text-muted">None</span></div>'
     
-    sg_html = render_security_groups(vpc, region_safe, vpc_index)
-    subnets_html = render_subnets(vpc)
-    
-    return igws_html + sg_html + subnets_html
+    yield from render_security_groups(inventory, vpc, region_safe, vpc_index)
+    yield from render_subnets(inventory, vpc, sg_cache)
 
 
-def render_region_tabs(regions_data):
+def render_region_tabs(regions_data, stats):
     """Render region tabs with resource counts."""
-    html = '<ul class="nav nav-pills mb-3" id="regionTabs" role="tablist">'
+    yield '<ul class="nav nav-pills mb-3" id="regionTabs" role="tablist">'
     
-    for idx, (region, data) in enumerate(regions_data.items(), 1):
+    for idx, region in enumerate(regions_data, 1):
         active_class = "active" if idx == 1 else ""
-        stats = calculate_region_stats(data)
+        region_stats = stats["regions"][region]
         
-        html += f"""
+        yield f"""
         <li class="nav-item" role="presentation">
           <button class="nav-link {active_class}" id="region-tab-{idx}" 
                   data-bs-toggle="pill" data-bs-target="#region-{idx}" 
                   type="button" role="tab">
             {region}
-            <span class="badge bg-light text-dark ms-1">{stats['vpc_count']} VPC(s)</span>
-            <span class="badge bg-primary ms-1">{stats['instance_count']} EC2</span>
+            <span class="badge bg-light text-dark ms-1">{region_stats['vpc_count']} VPC(s)</span>
+            <span class="badge bg-primary ms-1">{region_stats['instance_count']} EC2</span>
           </button>
         </li>
         """
     
-    html += '</ul>'
-    return html
+    yield '</ul>'
 
 
-def render_region_content(regions_data):
+def render_region_content(regions_data, sg_cache=None):
     """Render content for each region tab."""
-    html = '<div class="tab-content" id="regionTabContent">'
+    if sg_cache is None:
+        sg_cache = {}
+    yield '<div class="tab-content" id="regionTabContent">'
+    vpc_template = get_template("ec2_vpc.html")
     
-    for idx, (region, vpcs) in enumerate(regions_data.items(), 1):
+    for idx, (region, inventory) in enumerate(regions_data.items(), 1):
         active_class = "show active" if idx == 1 else ""
-        region_safe = region.replace("-", "")
-        
-        html += f'<div class="tab-pane fade {active_class}" id="region-{idx}" role="tabpanel">'
-        html += f'<div class="accordion" id="vpcAccordion{region_safe}">'
+        # Region keys of multi-account runs are "<profile>/<region>"
+        region_safe = re.sub(r"\W", "", region)
         
-        if vpcs:
-            for vpc_index, vpc in enumerate(vpcs, 1):
-                instance_count = sum(len(s.get("instances", [])) for s in vpc.get("subnets", []))
-                vpc_name = f" - {vpc['name']}" if vpc.get('name') else ""
-                
-                html += f"""
-                <div class="accordion-item">
-                  <h2 class="accordion-header" id="heading{region_safe}{vpc_index}">
-                    <button class="accordion-button collapsed" type="button" 
-                            data-bs-toggle="collapse" 
-                            data-bs-target="#collapse{region_safe}{vpc_index}"
-                            aria-expanded="false">
-                      <strong>VPC:</strong>&nbsp;{vpc['id']} ({vpc.get('cidr', '')}){vpc_name}
-                      
-                      <span class="ms-3">
-                        <span class="badge bg-info" title="Subnets">
-                          <i class="bi bi-diagram-3"></i> {len(vpc.get('subnets', []))} subnet(s)
-                        </span>
-                        <span class="badge bg-success ms-1" title="Security Groups">
-                          <i class="bi bi-shield-check"></i> {len(vpc.get('security_groups', []))} SG(s)
-                        </span>
-                        <span class="badge bg-primary ms-1" title="Instances">
-                          <i class="bi bi-server"></i> {instance_count} instance(s)
-                        </span>
-                      </span>
-                    </button>
-                  </h2>
-                  <div id="collapse{region_safe}{vpc_index}" 
-                       class="accordion-collapse collapse" 
-                       data-bs-parent="#vpcAccordion{region_safe}">
-                    <div class="accordion-body">
-                      {render_vpc_body(vpc, region_safe, vpc_index)}
-                    </div>
-                  </div>
-                </div>
-                """
-        else:
-            html += '<div class="alert alert-info">No VPCs found in this region.</div>'
-        
-        html += '</div></div>'
+        yield f'<div class="tab-pane fade {active_class}" id="region-{idx}" role="tabpanel">'
+        yield from vpc_template.generate(
+            vpcs=inventory.vpcs,
+            region_safe=region_safe,
+            vpc_stats=inventory.stats["vpcs"],
+            vpc_body=partial(render_vpc_body, inventory, sg_cache=sg_cache)
+        )
+        yield '</div>'
     
-    html += '</div>'
-    return html
+    yield '</div>'
 
 
-def render_ec2_stats(stats):
-    """Render EC2 statistics dashboard."""
-    html = """
-    <div class="row mb-4">
-      <div class="col-md-2">
-        <div class="card text-center">
-          <div class="card-body">
-            <h5 class="card-title text-primary">{}</h5>
-            <p class="card-text small">VPCs</p>
-          </div>
-        </div>
-      </div>
-      <div class="col-md-2">
-        <div class="card text-center">
-          <div class="card-body">
-            <h5 class="card-title text-info">{}</h5>
-            <p class="card-text small">Subnets</p>
-          </div>
-        </div>
-      </div>
-      <div class="col-md-2">
-        <div class="card text-center">
-          <div class="card-body">
-            <h5 class="card-title text-success">{}</h5>
-            <p class="card-text small">Instances</p>
-          </div>
-        </div>
-      </div>
-      <div class="col-md-2">
-        <div class="card text-center">
-          <div class="card-body">
-            <h5 class="card-title text-warning">{}</h5>
-            <p class="card-text small">Security Groups</p>
-          </div>
-        </div>
-      </div>
-      <div class="col-md-4">
-        <div class="card">
-          <div class="card-body">
-            <h6 class="card-subtitle mb-2 text-muted">Instances by State</h6>
-            <p class="mb-0">
-    """.format(
-        stats['total_vpcs'],
-        stats['total_subnets'],
-        stats['total_instances'],
-        stats['total_security_groups']
-    )
-    
-    for state, count in stats['instances_by_state'].items():
-        if state == "running":
-            badge_class = "bg-success"
-        elif state == "stopped":
-            badge_class = "bg-danger"
+def split_summarized_regions(regions_data):
+    """
+    Separate the regions collected in full from those the probe summarized.
+
+    Returns:
+        tuple: ({region: RegionInventory} collected in full,
+        {region: RegionInventory} found empty or default-only)
+    """
+    full = {}
+    summarized = {}
+    for region, inventory in regions_data.items():
+        if inventory.summary:
+            summarized[region] = inventory
         else:
-            badge_class = "bg-warning"
-        html += f'<span class="badge {badge_class} me-1">{state}: {count}</span>'
-    
-    html += """
-            </p>
-          </div>
-        </div>
-      </div>
+            full[region] = inventory
+    return full, summarized
+
+
+def render_region_summary(summarized):
+    """Render the empty and default-only regions as a single line."""
+    if not summarized:
+        return
+
+    labels = ", ".join(
+        f'{region} <small class="text-muted">'
+        f'({"default VPC only" if inventory.summary == "default-only" else "empty"})</small>'
+        for region, inventory in summarized.items()
+    )
+    yield f"""
+    <div class="alert alert-light border py-2 mb-3">
+      <i class="bi bi-info-circle"></i>
+      {len(summarized)} region(s) with no instances and no VPC other than the default one: {labels}
     </div>
     """
-    
-    return html
+
+
+def render_ec2_stats(stats):
+    """Render EC2 statistics dashboard."""
+    yield from get_template("ec2_stats.html").generate(stats=stats)
 
 
 def render_ec2_inventory(regions_data):
     """
     Main function to render EC2 inventory.
+
+    Regions found empty or default-only by the collection probe are listed
+    on one summary line instead of getting a tab.
     
     Args:
-        regions_data: Dict of {region: [vpcs]}
+        regions_data: Dict of {region: RegionInventory}
         
-    Returns:
-        str: Complete HTML for EC2 service
+    Yields:
+        str: HTML fragments for the EC2 service, one VPC at a time
     """
     stats = calculate_ec2_stats(regions_data)
+    regions_data, summarized = split_summarized_regions(regions_data)
     
-    html = render_ec2_stats(stats)
-    html += render_region_tabs(regions_data)
-    html += render_region_content(regions_data)
-    
-    return html
\ No newline at end of file
+    yield from render_ec2_stats(stats)
+    yield from render_region_summary(summarized)
+    yield from render_region_tabs(regions_data, stats)
+    yield from render_region_content(regions_data, sg_cache={})
+
+
+def _compact_rule(rule):
+    """Encode a rule as [protocol, from_port, to_port, [[type, value, description], ...]]."""
+    return [
+        rule.protocol,
+        rule.from_port,
+        rule.to_port,
+        [[peer.type, peer.value, peer.description] for peer in rule.peers],
+    ]
+
+
+def _compact_sg(sg):
+    return {
+        "name": sg.name,
+        "description": sg.description,
+        "inbound_rules": [_compact_rule(rule) for rule in sg.inbound_rules],
+        "outbound_rules": [_compact_rule(rule) for rule in sg.outbound_rules],
+    }
+
+
+def build_ec2_payload(regions_data):
+    """
+    Build the data embedded in a lazy report.
+
+    Security groups are stored once per region and referenced by ID, and
+    instances and rules are encoded as arrays, so field names and shared
+    SGs are not repeated for every record.
+
+    Args:
+        regions_data: Dict of {region: RegionInventory}
+
+    Returns:
+        dict: {region: {"vpcs": [...], "security_groups": {sg_id: {...}}}}
+    """
+    payload = {}
+
+    for region, inventory in regions_data.items():
+        security_groups = {}
+        compact_vpcs = []
+
+        for vpc in inventory.vpcs:
+            vpc_sgs = inventory.security_groups_of(vpc.id)
+            for sg in vpc_sgs:
+                security_groups.setdefault(sg.id, _compact_sg(sg))
+
+            subnets = []
+            for subnet in inventory.subnets_of(vpc.id):
+                instances = []
+                for instance in inventory.instances_of(subnet.id):
+                    instance_sgs = inventory.instance_security_groups(instance)
+                    for sg in instance_sgs:
+                        security_groups.setdefault(sg.id, _compact_sg(sg))
+                    instances.append([
+                        instance.id,
+                        instance.name,
+                        instance.type,
+                        instance.state or "unknown",
+                        instance.private_ip,
+                        instance.public_ip,
+                        [sg.id for sg in instance_sgs],
+                    ])
+                subnets.append({
+                    "id": subnet.id,
+                    "name": subnet.name,
+                    "cidr": subnet.cidr,
+                    "az": subnet.az,
+                    "instances": instances,
+                })
+
+            compact_vpcs.append({
+                "id": vpc.id,
+                "name": vpc.name,
+                "cidr": vpc.cidr,
+                "instance_count": inventory.stats["vpcs"][vpc.id]["instance_count"],
+                "igws": [[igw.id, igw.name] for igw in inventory.igws_of(vpc.id)],
+                "security_groups": [sg.id for sg in vpc_sgs],
+                "subnets": subnets,
+            })
+
+        payload[region] = {"vpcs": compact_vpcs, "security_groups": security_groups}
+
+    return payload
+
+
+def build_ec2_search_index(regions_data, service_index, index):
+    """
+    Add the searchable records of the EC2 service to a report search index.
+
+    Each VPC, subnet, security group and instance becomes one array,
+    [kind, VPC reference, anchor, search terms...], where the VPC reference
+    points into ``index["vpcs"]`` ([region reference, VPC accordion
+    index]) and the region reference into ``index["regions"]`` ([service
+    tab index, region tab index, region key, region_safe]). The anchor is
+    what the report marks within the VPC: a subnet or instance ID, or the
+    security group's accordion index. Terms are the IDs, names and IPs a
+    record is found by.
+
+    Args:
+        regions_data: Dict of {region: RegionInventory}
+        service_index: Index of the EC2 service tab
+        index: Dict of "regions", "vpcs" and "items" lists, extended in place
+    """
+    regions_data, _ = split_summarized_regions(regions_data)
+    items = index["items"]
+
+    for region_index, (region, inventory) in enumerate(regions_data.items(), 1):
+        region_ref = len(index["regions"])
+        index["regions"].append([service_index, region_index, region, re.sub(r"\W", "", region)])
+
+        for vpc_index, vpc in enumerate(inventory.vpcs, 1):
+            vpc_ref = len(index["vpcs"])
+            index["vpcs"].append([region_ref, vpc_index])
+            items.append(["vpc", vpc_ref, None, vpc.id, vpc.name, vpc.cidr])
+
+            for sg_index, sg in enumerate(inventory.security_groups_of(vpc.id), 1):
+                items.append(["sg", vpc_ref, sg_index, sg.id, sg.name])
+
+            for subnet in inventory.subnets_of(vpc.id):
+                items.append(["subnet", vpc_ref, subnet.id, subnet.id, subnet.name, subnet.cidr])
+                for instance in inventory.instances_of(subnet.id):
+                    items.append([
+                        "instance", vpc_ref, instance.id, instance.id, instance.name,
+                        instance.private_ip, instance.public_ip, " ".join(instance.security_group_ids),
+                    ])
+
+
+def render_ec2_inventory_lazy(regions_data):
+    """
+    Render EC2 inventory for client-side rendering.
+
+    The dashboard and region tabs are rendered as usual, while region panes
+    are left empty and filled in the browser from the embedded payload.
+
+    Args:
+        regions_data: Dict of {region: RegionInventory}
+
+    Yields:
+        str: HTML fragments for the EC2 service
+    """
+    stats = calculate_ec2_stats(regions_data)
+    regions_data, summarized = split_summarized_regions(regions_data)
+
+    yield from render_ec2_stats(stats)
+    yield from render_region_summary(summarized)
+    yield from render_region_tabs(regions_data, stats)
+
+    yield '<div class="tab-content" id="regionTabContent">'
+    for idx, region in enumerate(regions_data, 1):
+        active_class = "show active" if idx == 1 else ""
+        yield (
+            f'<div class="tab-pane fade lazy-region {active_class}" id="region-{idx}" '
+            f'role="tabpanel" data-region="{region}"></div>'
+        )
+    yield '</div>'
+
+    # Compact JSON; "</" is escaped so the data can't close the script element
+    data = json.dumps(build_ec2_payload(regions_data), separators=(",", ":"), default=str)
+    data = data.replace("</", "<\\/")
+    yield f'<script type="application/json" id="ec2-data">{data}</script>'
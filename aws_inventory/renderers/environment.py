@@ -0,0 +1,38 @@
+"""Shared Jinja2 environment for the report templates."""
+import os
+from jinja2 import Environment, FileSystemBytecodeCache, FunctionLoader
+from aws_inventory.renderers import templates
+
+# Template name -> function returning its source in templates.py
+TEMPLATE_SOURCES = {
+    "base.html": templates.get_base_html_template,
+    "ec2_stats.html": templates.get_ec2_stats_template,
+    "ec2_sg.html": templates.get_ec2_sg_template,
+    "ec2_vpc.html": templates.get_ec2_vpc_template,
+}
+
+
+def _load_template(name):
+    # Returning only the source marks the template as always up to date,
+    # so it is compiled once and then served from the environment cache
+    source = TEMPLATE_SOURCES.get(name)
+    return source() if source else None
+
+
+env = Environment(loader=FunctionLoader(_load_template))
+
+
+def get_template(name):
+    """Return a compiled template from the shared environment."""
+    return env.get_template(name)
+
+
+def enable_bytecode_cache(directory):
+    """
+    Store compiled templates on disk so later runs skip compilation.
+
+    Args:
+        directory: Folder for the bytecode cache files
+    """
+    os.makedirs(directory, exist_ok=True)
+    env.bytecode_cache = FileSystemBytecodeCache(directory)
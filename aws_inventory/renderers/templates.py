@@ -18,8 +18,10 @@ def get_base_html_template():
     <body class="p-4">
       {{ header | safe }}
       {{ tabs | safe }}
-      {{ content | safe }}
+      {% for fragment in content %}{{ fragment }}{% endfor %}
+      {% for fragment in diagnostics %}{{ fragment }}{% endfor %}
       {{ footer | safe }}
+      {% for fragment in search_index %}{{ fragment }}{% endfor %}
     </body>
     <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js"></script>
     <script src="https://cdnjs.cloudflare.com/ajax/libs/html2pdf.js/0.10.1/html2pdf.bundle.min.js"></script>
@@ -95,8 +97,21 @@ def get_styles():
         .card:hover {
           transform: translateY(-2px);
         }
+        .search-box {
+          max-width: 32rem;
+        }
+        .search-results {
+          z-index: 1000;
+          max-height: 24rem;
+          overflow-y: auto;
+        }
+        .search-hit {
+          outline: 3px solid #667eea;
+          outline-offset: 2px;
+          background-color: #e7f1ff;
+        }
         @media print {
-          .export-buttons, .nav-tabs, .nav-pills {
+          .export-buttons, .search-box, .nav-tabs, .nav-pills {
             display: none;
           }
           .tab-pane {
@@ -114,8 +129,13 @@ def get_styles():
 
 
 def get_scripts():
-    """Return JavaScript for export functionality."""
+    """Return JavaScript for export functionality and the shared HTML escaping helper."""
     return """
+      function esc(value) {
+        return String(value === null || value === undefined ? '' : value).replace(/[&<>"']/g,
+          c => ({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'}[c]));
+      }
+
       function exportToPDF() {
         const element = document.body;
         const opt = {
@@ -126,6 +146,10 @@ def get_scripts():
           jsPDF: { unit: 'mm', format: 'a4', orientation: 'landscape' }
         };
         
+        if (typeof buildAllLazy === 'function') {
+          buildAllLazy();
+        }
+        
         const allTabPanes = document.querySelectorAll('.tab-pane');
         const allAccordions = document.querySelectorAll('.accordion-collapse');
         
@@ -210,13 +234,15 @@ def get_ec2_stats_template():
 
 
 def get_ec2_sg_template():
-    """Return template for security groups section."""
+    """Return template for the security groups accordion items of a VPC."""
     return """
+              {% for sg in security_groups %}
+              {% set sg_index = loop.index %}
                 <div class="accordion-item">
                   <h2 class="accordion-header">
                     <button class="accordion-button collapsed" type="button"
                             data-bs-toggle="collapse"
-                            data-bs-target="#sg{{ region_safe }}{{ vpc_index }}{{ sg_index }}"
+                            data-bs-target="#sg-{{ region_safe }}-{{ vpc_index }}-{{ sg_index }}"
                             aria-expanded="false">
                       <code>{{ sg.id }}</code>
                       <span class="ms-2"><strong>{{ sg.name }}</strong></span>
@@ -231,13 +257,14 @@ def get_ec2_sg_template():
                       </span>
                     </button>
                   </h2>
-                  <div id="sg{{ region_safe }}{{ vpc_index }}{{ sg_index }}"
+                  <div id="sg-{{ region_safe }}-{{ vpc_index }}-{{ sg_index }}"
                        class="accordion-collapse collapse">
                     <div class="accordion-body">
-                      {{ sg_rules_table | safe }}
+                      {% for fragment in sg_rules_tables(sg) %}{{ fragment }}{% endfor %}
                     </div>
                   </div>
                 </div>
+              {% endfor %}
     """
 
 
@@ -246,34 +273,35 @@ def get_ec2_vpc_template():
     return """
     <div class="accordion" id="vpcAccordion{{ region_safe }}">
       {% for vpc in vpcs %}
+      {% set vpc_index = loop.index %}
+      {% set stats = vpc_stats[vpc.id] %}
       <div class="accordion-item">
-        <h2 class="accordion-header" id="heading{{ region_safe }}{{ loop.index }}">
+        <h2 class="accordion-header" id="heading{{ region_safe }}{{ vpc_index }}">
           <button class="accordion-button collapsed" type="button" 
                   data-bs-toggle="collapse" 
-                  data-bs-target="#collapse{{ region_safe }}{{ loop.index }}"
+                  data-bs-target="#collapse{{ region_safe }}{{ vpc_index }}"
                   aria-expanded="false">
             <strong>VPC:</strong>&nbsp;{{ vpc.id }} ({{ vpc.cidr }})
             {% if vpc.name %} - {{ vpc.name }}{% endif %}
             
             <span class="ms-3">
               <span class="badge bg-info" title="Subnets">
-                <i class="bi bi-diagram-3"></i> {{ vpc.subnets|length }} subnet(s)
+                <i class="bi bi-diagram-3"></i> {{ stats.subnet_count }} subnet(s)
               </span>
               <span class="badge bg-success ms-1" title="Security Groups">
-                <i class="bi bi-shield-check"></i> {{ vpc.security_groups|length }} SG(s)
+                <i class="bi bi-shield-check"></i> {{ stats.sg_count }} SG(s)
               </span>
-              {% set instance_count = vpc.subnets|sum(attribute='instances|length', start=0) %}
               <span class="badge bg-primary ms-1" title="Instances">
-                <i class="bi bi-server"></i> {{ instance_count }} instance(s)
+                <i class="bi bi-server"></i> {{ stats.instance_count }} instance(s)
               </span>
             </span>
           </button>
         </h2>
-        <div id="collapse{{ region_safe }}{{ loop.index }}" 
+        <div id="collapse{{ region_safe }}{{ vpc_index }}" 
              class="accordion-collapse collapse" 
              data-bs-parent="#vpcAccordion{{ region_safe }}">
           <div class="accordion-body">
-            {{ vpc_body | safe }}
+            {% for fragment in vpc_body(vpc, region_safe, vpc_index) %}{{ fragment }}{% endfor %}
           </div>
         </div>
       </div>
@@ -284,3 +312,349 @@ def get_ec2_vpc_template():
       <div class="alert alert-info">No VPCs found in this region.</div>
     {% endif %}
     """
+
+
+def get_lazy_scripts():
+    """Return JavaScript that builds the EC2 sections from the embedded data on demand."""
+    return """
+      const ec2Data = JSON.parse(document.getElementById('ec2-data').textContent);
+
+      function stateBadge(state) {
+        const color = state === 'running' ? 'success' : (state === 'stopped' ? 'danger' : 'warning');
+        return `<span class="badge bg-${color}">${esc(state)}</span>`;
+      }
+
+      function renderRulesTable(rules, direction) {
+        if (!rules.length) {
+          return `<p class="text-muted"><em>No ${direction} rules</em></p>`;
+        }
+        const inbound = direction === 'inbound';
+        const rows = rules.map(([protocol, fromPort, toPort, items]) => `
+          <tr>
+            <td><span class="badge bg-secondary">${esc(protocol)}</span></td>
+            <td>${fromPort === toPort ? esc(fromPort) : esc(fromPort) + ' - ' + esc(toPort)}</td>
+            <td>${items.map(([type, value]) =>
+              `<span class="badge ${type === 'cidr' ? 'bg-info' : 'bg-primary'}">${esc(value)}</span><br>`).join('')}</td>
+            <td>${items.map(item => `<small class="text-muted">${esc(item[2])}</small><br>`).join('')}</td>
+          </tr>`).join('');
+        return `
+          <h6 class="text-${inbound ? 'success' : 'warning'}">
+            <i class="bi bi-${inbound ? 'arrow-down-circle' : 'arrow-up-circle'}"></i>
+            ${inbound ? 'Inbound' : 'Outbound'} Rules
+          </h6>
+          <table class="table table-sm table-bordered mb-3">
+            <thead>
+              <tr><th>Protocol</th><th>Port Range</th><th>${inbound ? 'Source' : 'Destination'}</th><th>Description</th></tr>
+            </thead>
+            <tbody>${rows}</tbody>
+          </table>`;
+      }
+
+      function renderInstancesTable(instances, sgs) {
+        if (!instances.length) {
+          return '<p class="text-muted"><em>No instances in this subnet</em></p>';
+        }
+        const rows = instances.map(([id, name, type, state, privateIp, publicIp, sgIds]) => `
+          <tr data-instance="${esc(id)}">
+            <td><code>${esc(id)}</code></td>
+            <td>${esc(name || '-')}</td>
+            <td><span class="badge bg-light text-dark">${esc(type)}</span></td>
+            <td>${stateBadge(state)}</td>
+            <td><code>${esc(privateIp || '-')}</code></td>
+            <td><code>${esc(publicIp || '-')}</code></td>
+            <td>${sgIds.map(sgId => {
+              const sg = sgs[sgId] || {};
+              return `<span class="badge bg-primary" title="${esc(sg.name)} - ${esc(sg.description)}">${esc(sgId)}</span> `;
+            }).join('')}</td>
+          </tr>`).join('');
+        return `
+          <h6 class="mt-3">EC2 Instances:</h6>
+          <div class="table-responsive">
+            <table class="table table-sm table-hover">
+              <thead>
+                <tr>
+                  <th>Instance ID</th><th>Name</th><th>Type</th><th>State</th>
+                  <th>Private IP</th><th>Public IP</th><th>Security Groups</th>
+                </tr>
+              </thead>
+              <tbody>${rows}</tbody>
+            </table>
+          </div>`;
+      }
+
+      function renderVpcBody(region, vpcIndex) {
+        const regionData = ec2Data[region];
+        const vpc = regionData.vpcs[vpcIndex - 1];
+        const regionSafe = region.replace(/\\W/g, '');
+        let html = '<div class="mb-3"><strong>Internet Gateways:</strong> ';
+        html += vpc.igws.length
+          ? vpc.igws.map(([id, name]) => `<span class="badge bg-info">${esc(id)}${name ? ' (' + esc(name) + ')' : ''}</span> `).join('')
+          : '<span class="text-muted">None</span>';
+        html += '</div>';
+
+        if (vpc.security_groups.length) {
+          html += `<div class="mb-4"><h5>Security Groups</h5><div class="accordion" id="sgAccordion${regionSafe}${vpcIndex}">`;
+          vpc.security_groups.forEach((sgId, idx) => {
+            const sg = regionData.security_groups[sgId];
+            const target = `sg-${regionSafe}-${vpcIndex}-${idx + 1}`;
+            html += `
+              <div class="accordion-item">
+                <h2 class="accordion-header">
+                  <button class="accordion-button collapsed" type="button"
+                          data-bs-toggle="collapse" data-bs-target="#${target}" aria-expanded="false">
+                    <code>${esc(sgId)}</code>
+                    <span class="ms-2"><strong>${esc(sg.name)}</strong></span>
+                    <span class="ms-2 text-muted small">${esc(sg.description)}</span>
+                    <span class="ms-auto me-2">
+                      <span class="badge bg-success" title="Inbound rules">↓ ${sg.inbound_rules.length}</span>
+                      <span class="badge bg-warning text-dark" title="Outbound rules">↑ ${sg.outbound_rules.length}</span>
+                    </span>
+                  </button>
+                </h2>
+                <div id="${target}" class="accordion-collapse collapse"
+                     data-lazy="sg" data-region="${esc(region)}" data-sg="${esc(sgId)}">
+                  <div class="accordion-body"></div>
+                </div>
+              </div>`;
+          });
+          html += '</div></div>';
+        }
+
+        if (!vpc.subnets.length) {
+          return html + '<p class="text-muted"><em>No subnets in this VPC</em></p>';
+        }
+        html += '<h5>Subnets</h5>';
+        vpc.subnets.forEach(subnet => {
+          html += `
+            <div class="card mb-2" data-subnet="${esc(subnet.id)}">
+              <div class="card-body">
+                <h6 class="card-subtitle mb-2">
+                  <span class="badge bg-secondary">${esc(subnet.id)}</span>
+                  ${subnet.name ? '<strong>' + esc(subnet.name) + '</strong>' : ''}
+                  <span class="badge bg-primary ms-2"><i class="bi bi-server"></i> ${subnet.instances.length} instance(s)</span>
+                </h6>
+                <p class="mb-2"><small><strong>CIDR:</strong> ${esc(subnet.cidr)} | <strong>AZ:</strong> ${esc(subnet.az)}</small></p>
+                ${renderInstancesTable(subnet.instances, regionData.security_groups)}
+              </div>
+            </div>`;
+        });
+        return html;
+      }
+
+      function renderRegion(pane) {
+        const region = pane.dataset.region;
+        const vpcs = ec2Data[region].vpcs;
+        const regionSafe = region.replace(/\\W/g, '');
+        if (!vpcs.length) {
+          pane.innerHTML = '<div class="alert alert-info">No VPCs found in this region.</div>';
+        } else {
+          pane.innerHTML = `<div class="accordion" id="vpcAccordion${regionSafe}">` + vpcs.map((vpc, idx) => `
+            <div class="accordion-item">
+              <h2 class="accordion-header" id="heading${regionSafe}${idx + 1}">
+                <button class="accordion-button collapsed" type="button"
+                        data-bs-toggle="collapse" data-bs-target="#collapse${regionSafe}${idx + 1}" aria-expanded="false">
+                  <strong>VPC:</strong>&nbsp;${esc(vpc.id)} (${esc(vpc.cidr)})${vpc.name ? ' - ' + esc(vpc.name) : ''}
+                  <span class="ms-3">
+                    <span class="badge bg-info" title="Subnets"><i class="bi bi-diagram-3"></i> ${vpc.subnets.length} subnet(s)</span>
+                    <span class="badge bg-success ms-1" title="Security Groups"><i class="bi bi-shield-check"></i> ${vpc.security_groups.length} SG(s)</span>
+                    <span class="badge bg-primary ms-1" title="Instances"><i class="bi bi-server"></i> ${vpc.instance_count} instance(s)</span>
+                  </span>
+                </button>
+              </h2>
+              <div id="collapse${regionSafe}${idx + 1}" class="accordion-collapse collapse"
+                   data-bs-parent="#vpcAccordion${regionSafe}"
+                   data-lazy="vpc" data-region="${esc(region)}" data-vpc="${idx + 1}">
+                <div class="accordion-body"></div>
+              </div>
+            </div>`).join('') + '</div>';
+        }
+        pane.dataset.rendered = 'true';
+      }
+
+      function renderCollapse(collapse) {
+        const body = collapse.querySelector('.accordion-body');
+        const region = collapse.dataset.region;
+        if (collapse.dataset.lazy === 'vpc') {
+          body.innerHTML = renderVpcBody(region, Number(collapse.dataset.vpc));
+        } else {
+          const sg = ec2Data[region].security_groups[collapse.dataset.sg];
+          body.innerHTML = renderRulesTable(sg.inbound_rules, 'inbound') + renderRulesTable(sg.outbound_rules, 'outbound');
+        }
+        collapse.dataset.rendered = 'true';
+      }
+
+      function buildAllLazy() {
+        document.querySelectorAll('.lazy-region:not([data-rendered])').forEach(renderRegion);
+        // VPC bodies add the SG collapses, so keep going until nothing is left
+        let pending = document.querySelectorAll('[data-lazy]:not([data-rendered])');
+        while (pending.length) {
+          pending.forEach(renderCollapse);
+          pending = document.querySelectorAll('[data-lazy]:not([data-rendered])');
+        }
+      }
+
+      document.addEventListener('show.bs.tab', event => {
+        const pane = document.querySelector(event.target.dataset.bsTarget);
+        if (pane && pane.classList.contains('lazy-region') && !pane.dataset.rendered) {
+          renderRegion(pane);
+        }
+      });
+
+      document.addEventListener('show.bs.collapse', event => {
+        const collapse = event.target;
+        if (collapse.dataset.lazy && !collapse.dataset.rendered) {
+          renderCollapse(collapse);
+        }
+      });
+
+      window.addEventListener('beforeprint', buildAllLazy);
+      document.querySelectorAll('.lazy-region.active').forEach(renderRegion);
+    """
+
+
+def get_search_scripts():
+    """Return JavaScript for the header search box, backed by the embedded search index."""
+    return """
+      const searchIndex = JSON.parse(document.getElementById('search-index').textContent);
+      const SEARCH_LIMIT = 50;
+      const SEARCH_LABELS = {vpc: 'VPC', subnet: 'Subnet', sg: 'Security group', instance: 'Instance'};
+      let searchTerms = null;
+      let searchExact = null;
+      let searchMatches = [];
+      let searchTimer = null;
+
+      function buildSearchTerms() {
+        // Built once on first use: one lowercase string per record for
+        // substring matches, and a map of every single term (ID, name, IP)
+        // to its records for exact matches
+        searchTerms = new Array(searchIndex.items.length);
+        searchExact = new Map();
+        searchIndex.items.forEach((item, i) => {
+          const terms = item.slice(3).filter(Boolean).map(term => String(term).toLowerCase());
+          searchTerms[i] = terms.join(' ');
+          terms.forEach(term => term.split(' ').forEach(word => {
+            const records = searchExact.get(word);
+            if (records) {
+              if (records[records.length - 1] !== i) {
+                records.push(i);
+              }
+            } else {
+              searchExact.set(word, [i]);
+            }
+          }));
+        });
+      }
+
+      function runSearch(query) {
+        const q = query.trim().toLowerCase();
+        if (q.length < 2) {
+          return [];
+        }
+        if (!searchTerms) {
+          buildSearchTerms();
+        }
+        // Exact matches first, then a linear scan of the prebuilt strings
+        // stopping at SEARCH_LIMIT matches
+        const exact = (searchExact.get(q) || []).slice(0, SEARCH_LIMIT);
+        const seen = new Set(exact);
+        const matches = exact.slice();
+        for (let i = 0; i < searchTerms.length && matches.length < SEARCH_LIMIT; i++) {
+          if (!seen.has(i) && searchTerms[i].indexOf(q) !== -1) {
+            matches.push(i);
+          }
+        }
+        return matches.map(i => searchIndex.items[i]);
+      }
+
+      function describeMatch(item) {
+        const [kind, vpcRef] = item;
+        const region = searchIndex.regions[searchIndex.vpcs[vpcRef][0]][2];
+        const terms = item.slice(3, kind === 'instance' ? 6 : 5).filter(Boolean).map(esc).join(' &middot; ');
+        return `<span class="badge bg-secondary me-2">${SEARCH_LABELS[kind]}</span>${terms}` +
+          `<small class="text-muted ms-2">${esc(region)}</small>`;
+      }
+
+      function showSearchResults(query) {
+        const results = document.getElementById('search-results');
+        searchMatches = runSearch(query);
+        if (!searchMatches.length) {
+          results.innerHTML = query.trim().length < 2 ? '' :
+            '<div class="list-group-item text-muted">No match</div>';
+          return;
+        }
+        results.innerHTML = searchMatches.map((item, idx) =>
+          `<button type="button" class="list-group-item list-group-item-action" data-match="${idx}">${describeMatch(item)}</button>`
+        ).join('');
+      }
+
+      function expandCollapse(collapse) {
+        // The lazy report renders a collapse from its show event
+        if (!collapse.classList.contains('show')) {
+          bootstrap.Collapse.getOrCreateInstance(collapse, {toggle: false}).show();
+        }
+      }
+
+      function jumpToMatch(item) {
+        const [kind, vpcRef, anchor] = item;
+        const [regionRef, vpcIndex] = searchIndex.vpcs[vpcRef];
+        const [serviceTab, regionTab, , regionSafe] = searchIndex.regions[regionRef];
+
+        bootstrap.Tab.getOrCreateInstance(document.getElementById(`tab${serviceTab}`)).show();
+        bootstrap.Tab.getOrCreateInstance(document.getElementById(`region-tab-${regionTab}`)).show();
+        const pane = document.getElementById(`region-${regionTab}`);
+        if (pane.classList.contains('lazy-region') && !pane.dataset.rendered) {
+          renderRegion(pane);
+        }
+
+        const vpcCollapse = document.getElementById(`collapse${regionSafe}${vpcIndex}`);
+        let target = document.getElementById(`heading${regionSafe}${vpcIndex}`);
+        if (kind !== 'vpc') {
+          expandCollapse(vpcCollapse);
+          if (kind === 'sg') {
+            const sgCollapse = document.getElementById(`sg-${regionSafe}-${vpcIndex}-${anchor}`);
+            expandCollapse(sgCollapse);
+            target = sgCollapse.closest('.accordion-item');
+          } else {
+            const attribute = kind === 'instance' ? 'data-instance' : 'data-subnet';
+            target = vpcCollapse.querySelector(`[${attribute}="${CSS.escape(anchor)}"]`) || target;
+          }
+        }
+
+        document.getElementById('search-results').innerHTML = '';
+        // Wait for the tab and collapse transitions before scrolling
+        setTimeout(() => {
+          target.scrollIntoView({behavior: 'smooth', block: 'center'});
+          target.classList.add('search-hit');
+          setTimeout(() => target.classList.remove('search-hit'), 2500);
+        }, 400);
+      }
+
+      const searchInput = document.getElementById('search-input');
+      searchInput.addEventListener('focus', () => {
+        if (!searchTerms) {
+          buildSearchTerms();
+        }
+      }, {once: true});
+      searchInput.addEventListener('input', () => {
+        clearTimeout(searchTimer);
+        searchTimer = setTimeout(() => showSearchResults(searchInput.value), 120);
+      });
+      searchInput.addEventListener('keydown', event => {
+        if (event.key === 'Enter') {
+          event.preventDefault();
+          clearTimeout(searchTimer);
+          showSearchResults(searchInput.value);
+          if (searchMatches.length) {
+            jumpToMatch(searchMatches[0]);
+          }
+        } else if (event.key === 'Escape') {
+          document.getElementById('search-results').innerHTML = '';
+        }
+      });
+      document.getElementById('search-results').addEventListener('click', event => {
+        const button = event.target.closest('[data-match]');
+        if (button) {
+          jumpToMatch(searchMatches[Number(button.dataset.match)]);
+        }
+      });
+    """
@@ -0,0 +1,95 @@
+"""aiobotocore counterparts of boto_helpers, used by the asyncio engine."""
+import asyncio
+from contextlib import AsyncExitStack
+
+try:
+    from aiobotocore.config import AioConfig
+    from aiobotocore.session import AioSession
+except ImportError:  # optional, pip install aws_inventory[async]
+    AioConfig = AioSession = None
+
+# One event loop serves every region, so each client gets a larger pool of
+# connections than the thread engine's; retries are the same
+ASYNC_CLIENT_OPTIONS = {
+    "max_pool_connections": 50,
+    "retries": {"mode": "standard", "max_attempts": 10},
+}
+
+
+class AsyncClientFactory:
+    """
+    Create aiobotocore clients from a single shared session.
+
+    The async counterpart of ClientFactory: clients are cached per
+    (service, region) and registered with the same RequestScheduler,
+    ResponseCache and RunMetrics. Use it as an async context manager; the
+    clients and their connection pools are closed on exit.
+    """
+
+    def __init__(self, profile=None, scheduler=None, cache=None, metrics=None,
+                 max_pool_connections=None):
+        if AioSession is None:
+            raise RuntimeError("The async engine requires aiobotocore: pip install aws_inventory[async]")
+        self.profile = profile
+        self.session = AioSession(profile=profile)
+        options = dict(ASYNC_CLIENT_OPTIONS)
+        if max_pool_connections:
+            options["max_pool_connections"] = max_pool_connections
+        self.config = AioConfig(**options)
+        self.scheduler = scheduler
+        self.cache = cache
+        self.metrics = metrics
+        self._clients = {}
+        self._lock = None
+        self._stack = AsyncExitStack()
+
+    async def __aenter__(self):
+        # Created here so the lock belongs to the running event loop
+        self._lock = asyncio.Lock()
+        await self._stack.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc):
+        return await self._stack.__aexit__(*exc)
+
+    async def client(self, service_name, region):
+        """Return the cached client for a service and region."""
+        key = (service_name, region)
+        async with self._lock:
+            if key not in self._clients:
+                client = await self._stack.enter_async_context(
+                    self.session.create_client(service_name, region_name=region, config=self.config)
+                )
+                account = self.profile or "default"
+                if self.scheduler:
+                    self.scheduler.register(client, account, asynchronous=True)
+                if self.cache:
+                    self.cache.register(client, account, asynchronous=True)
+                if self.metrics:
+                    self.metrics.register(client, account, asynchronous=True)
+                self._clients[key] = client
+            return self._clients[key]
+
+
+async def apaginate(client, operation, result_key, page_size=None, **params):
+    """
+    Async generator of the items of every page returned by a paginated operation.
+
+    The async counterpart of boto_helpers.paginate.
+
+    Args:
+        client: aiobotocore client
+        operation: Client method name, e.g. "describe_instances"
+        result_key: Key holding the items in each page, e.g. "Reservations"
+        page_size: Number of items requested per page
+        **params: Extra parameters passed to the operation
+
+    Yields:
+        dict: Raw items from the response pages
+    """
+    paginator = client.get_paginator(operation)
+    pagination_config = {"PageSize": page_size} if page_size else {}
+
+    async for page in paginator.paginate(PaginationConfig=pagination_config, **params):
+        for item in page.get(result_key, []):
+            yield item
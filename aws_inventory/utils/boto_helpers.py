@@ -1,12 +1,142 @@
+import threading
 import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+# EC2 describe_* calls accept MaxResults between 5 and 1000
+MIN_PAGE_SIZE = 5
+MAX_PAGE_SIZE = 1000
+DEFAULT_PAGE_SIZE = MAX_PAGE_SIZE
+
+# Shared by every client: enough pooled connections for the concurrent
+# describe_* calls of a region, kept alive between pages, and retries
+# that back off on throttling instead of failing the run. Request pacing
+# is left to the RequestScheduler, hence "standard" rather than "adaptive".
+DEFAULT_CLIENT_CONFIG = Config(
+    max_pool_connections=25,
+    tcp_keepalive=True,
+    retries={"mode": "standard", "max_attempts": 10},
+)
+
+# Errors of a region the credentials can't use (not enabled for the account,
+# denied by a policy): the region is skipped instead of failing the run
+REGION_AUTH_ERRORS = ("AuthFailure", "UnauthorizedOperation", "OptInRequired")
+
 
 def create_session(profile):
     """Create a boto3 session using a profile"""
     return boto3.Session(profile_name=profile)
 
-def get_all_regions(service_name="ec2", session=None):
-    """Return list of all regions for a given service"""
-    if not session:
-        session = boto3.Session()
-    ec2 = session.client(service_name, region_name="us-east-1")
-    return [r["RegionName"] for r in ec2.describe_regions()["Regions"]]
+class ClientFactory:
+    """
+    Create boto3 clients from a single shared session.
+
+    Clients are cached per (service, region), so every worker collecting
+    the same region reuses the same connection pool. boto3 sessions are not
+    thread-safe, hence client creation is serialized with a lock; the
+    clients themselves can be shared between threads.
+
+    When a RequestScheduler is given, every new client is registered with
+    it so all API calls are rate limited per (account, region, API). When
+    a ResponseCache is given, responses are served from and stored to it.
+    When a RunMetrics is given, every call is timed.
+    """
+
+    def __init__(self, profile=None, config=DEFAULT_CLIENT_CONFIG, scheduler=None, cache=None,
+                 metrics=None):
+        self.profile = profile
+        self.session = create_session(profile)
+        self.config = config
+        self.scheduler = scheduler
+        self.cache = cache
+        self.metrics = metrics
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def client(self, service_name, region):
+        """Return the cached client for a service and region."""
+        key = (service_name, region)
+        with self._lock:
+            if key not in self._clients:
+                client = self.session.client(
+                    service_name, region_name=region, config=self.config
+                )
+                if self.scheduler:
+                    self.scheduler.register(client, self.profile or "default")
+                if self.cache:
+                    self.cache.register(client, self.profile or "default")
+                if self.metrics:
+                    self.metrics.register(client, self.profile or "default")
+                self._clients[key] = client
+            return self._clients[key]
+
+def paginate(client, operation, result_key, page_size=None, **params):
+    """
+    Yield the items of every page returned by a paginated operation.
+
+    Pages are fetched lazily, so only one raw response is held in memory
+    at a time no matter how many resources the account has.
+
+    Args:
+        client: boto3 client
+        operation: Client method name, e.g. "describe_instances"
+        result_key: Key holding the items in each page, e.g. "Reservations"
+        page_size: Number of items requested per page
+        **params: Extra parameters passed to the operation
+
+    Yields:
+        dict: Raw items from the response pages
+    """
+    paginator = client.get_paginator(operation)
+    pagination_config = {"PageSize": page_size} if page_size else {}
+
+    for page in paginator.paginate(PaginationConfig=pagination_config, **params):
+        yield from page.get(result_key, [])
+
+def build_ec2_filters(filters=None, vpc_filter="vpc-id", with_states=False):
+    """
+    Translate inventory filters into the EC2 ``Filters`` parameter.
+
+    Instance states and tags only filter instances (``with_states``): VPCs,
+    subnets and security groups are kept when a matching instance uses them,
+    which the collection decides after the join.
+
+    Args:
+        filters: dict with optional "vpc_ids", "instance_states" and
+            "tags" ({key: [values]}) entries
+        vpc_filter: Name of the VPC ID filter for the describe call
+        with_states: Whether the describe call lists instances, filtered
+            by instance state and tags
+
+    Returns:
+        dict: Keyword arguments for the describe call, empty when nothing is filtered
+    """
+    if not filters:
+        return {}
+
+    ec2_filters = []
+    if filters.get("vpc_ids"):
+        ec2_filters.append({"Name": vpc_filter, "Values": list(filters["vpc_ids"])})
+    if with_states:
+        if filters.get("instance_states"):
+            ec2_filters.append({"Name": "instance-state-name", "Values": list(filters["instance_states"])})
+        for key, values in sorted(filters.get("tags", {}).items()):
+            ec2_filters.append({"Name": f"tag:{key}", "Values": list(values)})
+
+    return {"Filters": ec2_filters} if ec2_filters else {}
+
+
+def skip_region_error(region, error):
+    """
+    Tell whether a region failing with ``error`` should be skipped.
+
+    Only authorization errors (REGION_AUTH_ERRORS) skip a region, with a
+    warning; any other error fails the run.
+    """
+    if not isinstance(error, ClientError):
+        return False
+    code = error.response.get("Error", {}).get("Code")
+    if code not in REGION_AUTH_ERRORS:
+        return False
+    print(f"Warning: skipping region {region}, not authorized ({code})")
+    return True
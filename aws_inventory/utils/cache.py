@@ -0,0 +1,106 @@
+"""On-disk TTL cache of raw AWS API responses."""
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from botocore.awsrequest import AWSResponse
+from aws_inventory.utils.common import write_json_atomic
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "aws-inventory")
+DEFAULT_CACHE_TTL = 900
+
+
+class ResponseCache:
+    """
+    Cache parsed describe_* responses on local disk.
+
+    Collectors and paginators are unaware of it: a hook on each client
+    answers the call from a fresh cached response before any request is
+    sent, and another stores every successful response afterwards. Entries are keyed by profile, region, API and the serialized
+    request parameters (filters, page size and page token included), and
+    expire after ``ttl`` seconds.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, ttl=DEFAULT_CACHE_TTL):
+        self.path = os.path.join(cache_dir, "responses")
+        self.ttl = ttl
+        self.stats = {"hits": 0, "misses": 0}
+        self._lock = threading.Lock()
+        os.makedirs(self.path, exist_ok=True)
+
+    def register(self, client, profile, asynchronous=False):
+        """
+        Serve and store the responses of ``client`` through the cache.
+
+        ``asynchronous`` is set for aiobotocore clients, whose cache files
+        are then read and written on a worker thread instead of blocking
+        the event loop.
+        """
+        region = client.meta.region_name
+        service_id = client.meta.service_model.service_id.hyphenize()
+        events = client.meta.events
+
+        lookup = self._make_lookup(profile, region)
+        store = self._store
+        if asynchronous:
+            lookup, store = _in_thread(lookup), _in_thread(store)
+        events.register(f"before-call.{service_id}", lookup)
+        events.register(f"after-call.{service_id}", store)
+
+    def key(self, profile, region, operation, params):
+        """Return the cache key of a request."""
+        request = json.dumps(
+            [profile, region, operation, params.get("query_string"), params.get("body")],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(request.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Return the cached response for ``key``, or None if missing or expired."""
+        path = os.path.join(self.path, f"{key}.json")
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                return None
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key, parsed):
+        """Store a parsed response atomically."""
+        response = {k: v for k, v in parsed.items() if k != "ResponseMetadata"}
+        write_json_atomic(os.path.join(self.path, f"{key}.json"), response)
+
+    def _count(self, counter):
+        with self._lock:
+            self.stats[counter] += 1
+
+    def _make_lookup(self, profile, region):
+        def lookup(model, params, context, **kwargs):
+            key = self.key(profile, region, model.name, params)
+            context["response_cache_key"] = key
+            parsed = self.get(key)
+            if parsed is None:
+                self._count("misses")
+                return None
+            self._count("hits")
+            context["response_cache_hit"] = True
+            return AWSResponse(None, 200, {}, None), parsed
+        return lookup
+
+    def _store(self, http_response, parsed, context, **kwargs):
+        key = context.get("response_cache_key")
+        if not key or context.get("response_cache_hit") or http_response.status_code >= 300:
+            return
+        self.put(key, parsed)
+
+
+def _in_thread(hook):
+    # aiobotocore awaits coroutine handlers: run the blocking hook on the
+    # default executor and await its result
+    async def run(**kwargs):
+        return await asyncio.to_thread(hook, **kwargs)
+    return run
@@ -1,3 +1,8 @@
+import json
+import os
+import tempfile
+
+
 def get_name(tags):
     """
     Extract the 'Name' tag from a list of tags.
@@ -9,3 +14,39 @@ def get_name(tags):
         if tag["Key"] == "Name":
             return tag["Value"]
     return None
+
+
+def region_key(profile, region, profiles):
+    """
+    Key of a region in the inventory of a run: the region name, or
+    "<profile>/<region>" when the run covers several profiles.
+    """
+    return f"{profile}/{region}" if len(profiles) > 1 else region
+
+
+def split_region_key(key, profiles):
+    """Return (profile, region) from a key built by region_key."""
+    if len(profiles) > 1:
+        profile, region = key.split("/", 1)
+        return profile, region
+    return profiles[0], key
+
+
+def write_json_atomic(path, data):
+    """
+    Write ``data`` as JSON to ``path`` through a temporary file in the same
+    folder, so readers never see a partially written file.
+    """
+    folder = os.path.dirname(path) or "."
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=folder, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, default=str)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
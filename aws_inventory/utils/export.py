@@ -0,0 +1,202 @@
+"""Streaming JSON Lines and CSV export of the inventory."""
+import csv
+import json
+import os
+
+try:
+    import orjson
+except ImportError:  # optional, pip install aws_inventory[fast]
+    orjson = None
+
+# Fields of each resource type, after "resource", "account" and "region"
+RESOURCE_FIELDS = {
+    "vpc": ["id", "name", "cidr"],
+    "internet_gateway": ["id", "name", "vpc_id"],
+    "subnet": ["id", "vpc_id", "name", "cidr", "az"],
+    "security_group": ["id", "name", "description", "vpc_id"],
+    "rule": ["security_group_id", "direction", "protocol", "from_port", "to_port", "peers"],
+    "instance": [
+        "id", "name", "type", "state", "private_ip", "public_ip",
+        "subnet_id", "security_group_ids",
+    ],
+}
+
+EXPORT_FORMATS = ("jsonl", "csv")
+
+
+def iter_resources(region, inventory, account=None):
+    """
+    Yield one flat record per resource of a region.
+
+    Records are built straight from the normalized records of the
+    RegionInventory, in VPC order.
+
+    Args:
+        region: AWS region name
+        inventory: RegionInventory of the region
+        account: AWS profile the region was collected with
+
+    Yields:
+        dict: Record with "resource", "account", "region" and the fields
+        listed in RESOURCE_FIELDS for its type
+    """
+    for vpc in inventory.vpcs:
+        yield {
+            "resource": "vpc", "account": account, "region": region,
+            "id": vpc.id, "name": vpc.name, "cidr": vpc.cidr,
+        }
+
+        for igw in inventory.igws_of(vpc.id):
+            yield {
+                "resource": "internet_gateway", "account": account, "region": region,
+                "id": igw.id, "name": igw.name, "vpc_id": vpc.id,
+            }
+
+        for sg in inventory.security_groups_of(vpc.id):
+            yield {
+                "resource": "security_group", "account": account, "region": region,
+                "id": sg.id, "name": sg.name, "description": sg.description, "vpc_id": sg.vpc_id,
+            }
+            for direction, rules in (("inbound", sg.inbound_rules), ("outbound", sg.outbound_rules)):
+                for rule in rules:
+                    yield {
+                        "resource": "rule", "account": account, "region": region,
+                        "security_group_id": sg.id,
+                        "direction": direction,
+                        "protocol": rule.protocol,
+                        "from_port": rule.from_port,
+                        "to_port": rule.to_port,
+                        "peers": [
+                            {"type": peer.type, "value": peer.value, "description": peer.description}
+                            for peer in rule.peers
+                        ],
+                    }
+
+        for subnet in inventory.subnets_of(vpc.id):
+            yield {
+                "resource": "subnet", "account": account, "region": region,
+                "id": subnet.id, "vpc_id": subnet.vpc_id, "name": subnet.name,
+                "cidr": subnet.cidr, "az": subnet.az,
+            }
+            for instance in inventory.instances_of(subnet.id):
+                yield {
+                    "resource": "instance", "account": account, "region": region,
+                    "id": instance.id,
+                    "name": instance.name,
+                    "type": instance.type,
+                    "state": instance.state,
+                    "private_ip": instance.private_ip,
+                    "public_ip": instance.public_ip,
+                    "subnet_id": instance.subnet_id,
+                    "security_group_ids": list(instance.security_group_ids),
+                }
+
+
+def dumps(record):
+    """Encode a record as one line of compact JSON, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(record, separators=(",", ":"), default=str) + "\n").encode("utf-8")
+
+
+def dumps_inventory(regions, **header):
+    """
+    Encode an inventory as a single JSON document.
+
+    Args:
+        regions: Iterable of (account, region, RegionInventory)
+        **header: Top-level entries written before the resources, e.g.
+            "generated" or "stats"
+
+    Returns:
+        bytes: {**header, "resources": [records of iter_resources]}
+    """
+    head = json.dumps(header, separators=(",", ":"), default=str)
+    separator = b"," if header else b""
+    records = b",".join(
+        dumps(record).rstrip(b"\n")
+        for account, region, inventory in regions
+        for record in iter_resources(region, inventory, account)
+    )
+    return head[:-1].encode("utf-8") + separator + b'"resources":[' + records + b"]}"
+
+
+class JsonLinesExporter:
+    """Write every resource as one JSON object per line, region by region."""
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._file = open(path, "wb")
+
+    def write_region(self, region, inventory, account=None):
+        """Append the resources of a region to the file."""
+        for record in iter_resources(region, inventory, account):
+            self._file.write(dumps(record))
+            self.count += 1
+
+    def close(self):
+        self._file.close()
+
+
+def _csv_value(value):
+    # Lists are flattened so every record fits on one CSV row
+    if isinstance(value, list):
+        return ";".join(
+            f"{item['type']}:{item['value']}" if isinstance(item, dict) else str(item)
+            for item in value
+        )
+    return value
+
+
+class CsvExporter:
+    """Write one CSV file per resource type, region by region."""
+
+    def __init__(self, folder, prefix="inventory"):
+        self.path = os.path.join(folder, f"{prefix}_*.csv")
+        self.paths = {}
+        self.count = 0
+        self._files = []
+        self._writers = {}
+
+        for resource, fields in RESOURCE_FIELDS.items():
+            path = os.path.join(folder, f"{prefix}_{resource}s.csv")
+            f = open(path, "w", encoding="utf-8", newline="")
+            writer = csv.DictWriter(f, fieldnames=["account", "region"] + fields, extrasaction="ignore")
+            writer.writeheader()
+            self.paths[resource] = path
+            self._files.append(f)
+            self._writers[resource] = writer
+
+    def write_region(self, region, inventory, account=None):
+        """Append the resources of a region to the CSV files."""
+        for record in iter_resources(region, inventory, account):
+            self._writers[record["resource"]].writerow(
+                {key: _csv_value(value) for key, value in record.items()}
+            )
+            self.count += 1
+
+    def close(self):
+        for f in self._files:
+            f.close()
+
+
+def open_exporters(formats, folder="reports", prefix="inventory"):
+    """
+    Create the exporters for the requested formats.
+
+    Args:
+        formats: Iterable of format names; "html" and unknown names are ignored
+        folder: Output folder
+        prefix: File name prefix
+
+    Returns:
+        list: Exporters, each with write_region(region, inventory, account) and close()
+    """
+    os.makedirs(folder, exist_ok=True)
+    exporters = []
+    if "jsonl" in formats:
+        exporters.append(JsonLinesExporter(os.path.join(folder, f"{prefix}.jsonl")))
+    if "csv" in formats:
+        exporters.append(CsvExporter(folder, prefix))
+    return exporters
@@ -1,24 +1,43 @@
 # Main HTML report generation.
+import json
 import os
 from datetime import datetime
-from jinja2 import Template
-from aws_inventory.renderers.ec2_renderer import render_ec2_inventory
+from aws_inventory.renderers.ec2_renderer import (
+    build_ec2_search_index, render_ec2_inventory, render_ec2_inventory_lazy
+)
+from aws_inventory.renderers.environment import get_template
 from aws_inventory.renderers import templates
 
 
 def save_output(content, filename, folder="reports"):
-    """Save HTML content to a file."""
+    """
+    Save HTML content to a file.
+
+    ``content`` can be a string or an iterable of string fragments (such as
+    the generator returned by render_html), which is written as it is
+    produced so the full report never has to be held in memory.
+    """
     os.makedirs(folder, exist_ok=True)
     path = os.path.join(folder, filename)
+    if isinstance(content, str):
+        content = [content]
     with open(path, "w", encoding="utf-8") as f:
-        f.write(content)
+        for fragment in content:
+            f.write(fragment)
     print(f"Inventory written to {path}")
     return path
 
 
-def render_header(profile_name, timestamp):
-    """Render the header section."""
+def render_header(profile_name, timestamp, search=False):
+    """Render the header section, with the search box when the report has a search index."""
     profile_html = f'<p class="mb-1"><strong>Profile:</strong> {profile_name}</p>' if profile_name else ''
+    search_html = """
+      <div class="search-box position-relative mt-3">
+        <input type="search" id="search-input" class="form-control" autocomplete="off"
+               placeholder="Search instances, subnets, VPCs and security groups by ID, name or IP">
+        <div id="search-results" class="search-results list-group position-absolute w-100 shadow"></div>
+      </div>
+    """ if search else ''
     
     return f"""
     <div class="header-section position-relative">
@@ -33,6 +52,7 @@ def render_header(profile_name, timestamp):
       <h1 class="mb-2">AWS Inventory Report</h1>
       {profile_html}
       <p class="timestamp mb-0">Generated on: {timestamp}</p>
+      {search_html}
     </div>
     """
 
@@ -60,35 +80,56 @@ def render_service_tabs(inventories_by_service):
     return html
 
 
-def render_service_content(inventories_by_service):
+def render_service_content(inventories_by_service, lazy=False):
     """Render content for each service tab."""
-    html = '<div class="tab-content mt-3 p-3 bg-white rounded shadow-sm">'
+    yield '<div class="tab-content mt-3 p-3 bg-white rounded shadow-sm">'
     
     for idx, (service, inventory_info) in enumerate(inventories_by_service.items(), 1):
         active_class = "show active" if idx == 1 else ""
         service_type = inventory_info.get("type", "unknown")
         
+        yield f"""
+        <div class="tab-pane fade {active_class}" 
+             id="content{idx}"
+             role="tabpanel">
+          """
+        
         if "regions" in inventory_info:
             # Regional service
             regions_data = inventory_info["regions"]
             if service_type.lower() == "ec2":
-                rendered_html = render_ec2_inventory(regions_data)
+                if lazy:
+                    yield from render_ec2_inventory_lazy(regions_data)
+                else:
+                    yield from render_ec2_inventory(regions_data)
             else:
-                rendered_html = f'<div class="alert alert-warning">Rendering for {service_type} not implemented yet.</div>'
+                yield f'<div class="alert alert-warning">Rendering for {service_type} not implemented yet.</div>'
         else:
             # Global service
-            rendered_html = '<div class="alert alert-info">Global service rendering coming soon</div>'
+            yield '<div class="alert alert-info">Global service rendering coming soon</div>'
         
-        html += f"""
-        <div class="tab-pane fade {active_class}" 
-             id="content{idx}"
-             role="tabpanel">
-          {rendered_html}
+        yield """
         </div>
         """
     
-    html += '</div>'
-    return html
+    yield '</div>'
+
+
+def render_search_index(inventories_by_service):
+    """
+    Render the search index of the report as an embedded JSON script.
+
+    The index is built while the report is streamed, after the service
+    content; see build_ec2_search_index for its layout.
+    """
+    index = {"regions": [], "vpcs": [], "items": []}
+    for idx, inventory_info in enumerate(inventories_by_service.values(), 1):
+        if inventory_info.get("type", "").lower() == "ec2" and "regions" in inventory_info:
+            build_ec2_search_index(inventory_info["regions"], idx, index)
+
+    # Compact JSON; "</" is escaped so the data can't close the script element
+    data = json.dumps(index, separators=(",", ":"), default=str).replace("</", "<\\/")
+    yield f'<script type="application/json" id="search-index">{data}</script>'
 
 
 def render_footer():
@@ -100,7 +141,88 @@ def render_footer():
     """
 
 
-def render_html(inventories_by_service, profile_name=None):
+def render_diagnostics(metrics):
+    """
+    Render the "Run diagnostics" section from a RunMetrics.
+
+    The section is produced while the report is streamed, so it shows the
+    phases finished before rendering started; the final render and save
+    times are only in the metrics file.
+    """
+    totals = metrics.totals()
+    phase_rows = "".join(
+        f"<tr><td>{name}</td><td class=\"text-end\">{seconds:.3f}</td></tr>"
+        for name, seconds in metrics.phases.items()
+    )
+
+    yield f"""
+    <div class="mt-4 p-3 bg-white rounded shadow-sm" id="run-diagnostics">
+      <h4 class="mb-3"><i class="bi bi-speedometer2"></i> Run diagnostics</h4>
+      <p class="text-muted mb-2">
+        Started {metrics.started:%Y-%m-%d %H:%M:%S} &middot;
+        {totals["pages"]} API page(s), {totals["cache_hits"]} from cache,
+        {totals["retries"]} retried, {totals["errors"]} error(s),
+        {totals["bytes"] / 1024:.1f} KB received
+      </p>
+      <h6>Phases</h6>
+      <table class="table table-sm table-bordered w-auto">
+        <thead class="table-light"><tr><th>Phase</th><th>Seconds</th></tr></thead>
+        <tbody>{phase_rows}</tbody>
+      </table>
+      <h6>API calls (slowest first)</h6>
+      <div class="table-responsive">
+        <table class="table table-sm table-hover">
+          <thead class="table-light">
+            <tr>
+              <th>Account</th><th>Region</th><th>API</th><th>Pages</th><th>Cache hits</th>
+              <th>Retries</th><th>Errors</th><th>KB</th><th>Total (s)</th><th>Avg (ms)</th><th>Max (ms)</th>
+            </tr>
+          </thead>
+          <tbody>
+    """
+
+    for entry in metrics.to_dict()["api"]:
+        yield f"""
+            <tr>
+              <td>{entry["account"]}</td><td>{entry["region"]}</td><td>{entry["operation"]}</td>
+              <td>{entry["pages"]}</td><td>{entry["cache_hits"]}</td><td>{entry["retries"]}</td>
+              <td>{entry["errors"]}</td><td>{entry["bytes"] / 1024:.1f}</td>
+              <td>{entry["latency_total"]:.3f}</td><td>{entry["latency_avg"] * 1000:.0f}</td>
+              <td>{entry["latency_max"] * 1000:.0f}</td>
+            </tr>
+        """
+
+    yield """
+          </tbody>
+        </table>
+      </div>
+    </div>
+    """
+
+
+def build_inventories(regions_data, accounts):
+    """
+    Group the EC2 inventory of a run by service, as render_html expects it.
+
+    Args:
+        regions_data: Map of region key to RegionInventory
+        accounts: AWS profiles of the run
+
+    Returns:
+        dict: {"EC2": {...}}, or an empty dict when no region was collected
+    """
+    if not regions_data:
+        return {}
+    return {
+        "EC2": {
+            "type": "ec2",
+            "regions": regions_data,
+            "accounts": list(accounts),
+        }
+    }
+
+
+def render_html(inventories_by_service, profile_name=None, lazy=False, metrics=None, timestamp=None):
     """
     Render the complete HTML report with all service inventories.
     
@@ -117,26 +239,44 @@ def render_html(inventories_by_service, profile_name=None):
             "IAM": {"type": "iam", "global": True, "data": [...]}
         }
         profile_name: AWS profile name used
+        lazy: Embed the inventory as JSON and build the EC2 sections in
+            the browser when they are opened, instead of rendering every
+            VPC, subnet and security group up front
+        metrics: Optional RunMetrics, appended as a "Run diagnostics" section
+        timestamp: Date shown in the header, e.g. when a stored run was
+            collected (default: now)
         
     Returns:
-        str: Complete HTML document
+        generator: HTML document as a stream of fragments, to be passed
+        to save_output
     """
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    timestamp = timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
+    searchable = any(
+        info.get("type", "").lower() == "ec2" and "regions" in info for info in inventories_by_service.values()
+    )
+
     # Build the page sections
-    header = render_header(profile_name, timestamp)
+    header = render_header(profile_name, timestamp, search=searchable)
     tabs = render_service_tabs(inventories_by_service)
-    content = render_service_content(inventories_by_service)
+    content = render_service_content(inventories_by_service, lazy)
     footer = render_footer()
     
-    # Combine everything
-    base_template = Template(templates.get_base_html_template())
+    # Stream everything through the base template; content is consumed lazily
+    base_template = get_template("base.html")
+    scripts = templates.get_scripts()
+    if lazy and any(info.get("type", "").lower() == "ec2" for info in inventories_by_service.values()):
+        scripts += templates.get_lazy_scripts()
+    if searchable:
+        scripts += templates.get_search_scripts()
     
-    return base_template.render(
+    return base_template.generate(
         styles=templates.get_styles(),
-        scripts=templates.get_scripts(),
+        scripts=scripts,
         header=header,
         tabs=tabs,
         content=content,
-        footer=footer
+        diagnostics=render_diagnostics(metrics) if metrics else (),
+        footer=footer,
+        search_index=render_search_index(inventories_by_service) if searchable else ()
     )
\ No newline at end of file
@@ -0,0 +1,390 @@
+"""
+SQLite database of the inventories collected by each run.
+
+Every run is stored as normalized, indexed tables (regions, VPCs, subnets,
+instances and their security groups, security groups, rules and their
+peers, internet gateways), so reports can be regenerated and past
+inventories queried without calling AWS. Regions are read back one at a
+time, by iterating the cursors of a few indexed queries.
+"""
+import json
+import os
+import sqlite3
+from datetime import datetime
+from itertools import groupby
+from aws_inventory.collectors.model import (
+    InternetGateway, Instance, Peer, RegionInventory, Rule, SecurityGroup, Subnet, Vpc
+)
+from aws_inventory.collectors.instances import group_instances_by_subnet
+from aws_inventory.collectors.security_groups import group_security_groups_by_vpc
+from aws_inventory.collectors.vpcs import build_region_inventory, group_subnets_by_vpc
+from aws_inventory.utils.cache import DEFAULT_CACHE_DIR
+from aws_inventory.utils.common import split_region_key
+
+DEFAULT_DB_PATH = os.path.join(DEFAULT_CACHE_DIR, "inventory.db")
+
+# Runs kept by save_run; older ones are deleted so the database doesn't
+# grow without bound (``serve`` stores a run on every change)
+DEFAULT_DB_KEEP = 50
+
+# Bumped whenever the tables change; older databases are migrated by
+# recreating them, since they can be regenerated by collecting again
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started TEXT NOT NULL,
+    profiles TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS regions (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    key TEXT NOT NULL,
+    account TEXT,
+    region TEXT NOT NULL,
+    summary TEXT
+);
+CREATE TABLE IF NOT EXISTS vpcs (
+    region_id INTEGER NOT NULL REFERENCES regions(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    id TEXT NOT NULL,
+    name TEXT,
+    cidr TEXT
+);
+CREATE TABLE IF NOT EXISTS subnets (
+    region_id INTEGER NOT NULL REFERENCES regions(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    id TEXT NOT NULL,
+    vpc_id TEXT,
+    name TEXT,
+    cidr TEXT,
+    az TEXT
+);
+CREATE TABLE IF NOT EXISTS instances (
+    region_id INTEGER NOT NULL REFERENCES regions(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    id TEXT NOT NULL,
+    name TEXT,
+    type TEXT,
+    state TEXT,
+    private_ip TEXT,
+    public_ip TEXT,
+    subnet_id TEXT
+);
+CREATE TABLE IF NOT EXISTS instance_security_groups (
+    region_id INTEGER NOT NULL REFERENCES regions(id) ON DELETE CASCADE,
+    instance_id TEXT NOT NULL,
+    sg_id TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS security_groups (
+    region_id INTEGER NOT NULL REFERENCES regions(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    id TEXT NOT NULL,
+    name TEXT,
+    description TEXT,
+    vpc_id TEXT
+);
+CREATE TABLE IF NOT EXISTS rules (
+    id INTEGER PRIMARY KEY,
+    region_id INTEGER NOT NULL REFERENCES regions(id) ON DELETE CASCADE,
+    sg_id TEXT NOT NULL,
+    direction TEXT NOT NULL,
+    protocol TEXT,
+    from_port,
+    to_port
+);
+CREATE TABLE IF NOT EXISTS rule_peers (
+    rule_id INTEGER NOT NULL REFERENCES rules(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    value TEXT,
+    description TEXT
+);
+CREATE TABLE IF NOT EXISTS internet_gateways (
+    region_id INTEGER NOT NULL REFERENCES regions(id) ON DELETE CASCADE,
+    vpc_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    name TEXT
+);
+CREATE INDEX IF NOT EXISTS regions_run ON regions (run_id, position);
+CREATE INDEX IF NOT EXISTS vpcs_region ON vpcs (region_id, position);
+CREATE INDEX IF NOT EXISTS subnets_region ON subnets (region_id, position);
+CREATE INDEX IF NOT EXISTS instances_region ON instances (region_id, position);
+CREATE INDEX IF NOT EXISTS instances_id ON instances (id);
+CREATE INDEX IF NOT EXISTS instances_private_ip ON instances (private_ip);
+CREATE INDEX IF NOT EXISTS instance_security_groups_region ON instance_security_groups (region_id, instance_id);
+CREATE INDEX IF NOT EXISTS instance_security_groups_sg ON instance_security_groups (sg_id);
+CREATE INDEX IF NOT EXISTS security_groups_region ON security_groups (region_id, position);
+CREATE INDEX IF NOT EXISTS security_groups_id ON security_groups (id);
+CREATE INDEX IF NOT EXISTS rules_region ON rules (region_id, id);
+CREATE INDEX IF NOT EXISTS rule_peers_rule ON rule_peers (rule_id, position);
+CREATE INDEX IF NOT EXISTS rule_peers_value ON rule_peers (value);
+CREATE INDEX IF NOT EXISTS internet_gateways_region ON internet_gateways (region_id);
+"""
+
+
+class InventoryDatabase:
+    """
+    Runs and their inventories, in a SQLite database file.
+
+    Args:
+        path: Database file, created with its tables if missing
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self._create_schema()
+
+    def _create_schema(self):
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, SCHEMA_VERSION):
+            tables = [
+                name for (name,) in self.connection.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table'"
+                )
+            ]
+            with self.connection:
+                for name in tables:
+                    self.connection.execute(f'DROP TABLE "{name}"')
+        with self.connection:
+            self.connection.executescript(SCHEMA)
+            self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def save_run(self, profiles, regions_data, started=None, keep=DEFAULT_DB_KEEP):
+        """
+        Store the inventory of a run in a single transaction.
+
+        Args:
+            profiles: AWS profiles of the run
+            regions_data: Map of region to RegionInventory, keyed by
+                utils.common.region_key
+            started: datetime the run started (default: now)
+            keep: Number of most recent runs kept, this one included; older
+                runs are deleted (0 or None keeps every run)
+
+        Returns:
+            int: ID of the run
+        """
+        started = started or datetime.now()
+        with self.connection:
+            run_id = self.connection.execute(
+                "INSERT INTO runs (started, profiles) VALUES (?, ?)",
+                (started.isoformat(timespec="seconds"), json.dumps(list(profiles))),
+            ).lastrowid
+            for position, (key, inventory) in enumerate(regions_data.items()):
+                account, region = split_region_key(key, profiles)
+                self._insert_region(run_id, position, key, account, region, inventory)
+            if keep:
+                self._prune(keep)
+        return run_id
+
+    def _prune(self, keep):
+        # Regions, their records and rule peers go with their run (ON DELETE CASCADE)
+        self.connection.execute(
+            "DELETE FROM runs WHERE id NOT IN (SELECT id FROM runs ORDER BY id DESC LIMIT ?)",
+            (keep,),
+        )
+
+    def _insert_region(self, run_id, position, key, account, region, inventory):
+        execute = self.connection.execute
+        executemany = self.connection.executemany
+        region_id = execute(
+            "INSERT INTO regions (run_id, position, key, account, region, summary) VALUES (?, ?, ?, ?, ?, ?)",
+            (run_id, position, key, account, region, inventory.summary),
+        ).lastrowid
+
+        executemany(
+            "INSERT INTO vpcs VALUES (?, ?, ?, ?, ?)",
+            ((region_id, i, *vpc.to_list()) for i, vpc in enumerate(inventory.vpcs)),
+        )
+        subnets = [subnet for group in inventory.subnets_by_vpc.values() for subnet in group]
+        executemany(
+            "INSERT INTO subnets VALUES (?, ?, ?, ?, ?, ?, ?)",
+            ((region_id, i, *subnet.to_list()) for i, subnet in enumerate(subnets)),
+        )
+        instances = [instance for group in inventory.instances_by_subnet.values() for instance in group]
+        executemany(
+            "INSERT INTO instances VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            ((region_id, i, *instance.to_list()[:-1]) for i, instance in enumerate(instances)),
+        )
+        executemany(
+            "INSERT INTO instance_security_groups VALUES (?, ?, ?)",
+            (
+                (region_id, instance.id, sg_id)
+                for instance in instances for sg_id in instance.security_group_ids
+            ),
+        )
+        executemany(
+            "INSERT INTO internet_gateways VALUES (?, ?, ?, ?)",
+            (
+                (region_id, vpc_id, igw.id, igw.name)
+                for vpc_id, igws in inventory.igws_by_vpc.items()
+                for igw in igws
+            ),
+        )
+
+        for i, sg in enumerate(inventory.security_groups.values()):
+            execute(
+                "INSERT INTO security_groups VALUES (?, ?, ?, ?, ?, ?)",
+                (region_id, i, sg.id, sg.name, sg.description, sg.vpc_id),
+            )
+            for direction, rules in (("inbound", sg.inbound_rules), ("outbound", sg.outbound_rules)):
+                for rule in rules:
+                    rule_id = execute(
+                        "INSERT INTO rules (region_id, sg_id, direction, protocol, from_port, to_port) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (region_id, sg.id, direction, rule.protocol, rule.from_port, rule.to_port),
+                    ).lastrowid
+                    executemany(
+                        "INSERT INTO rule_peers VALUES (?, ?, ?, ?, ?)",
+                        ((rule_id, j, *peer.to_list()) for j, peer in enumerate(rule.peers)),
+                    )
+
+    def runs(self):
+        """
+        List the stored runs, most recent first.
+
+        Returns:
+            list: {"id", "started", "profiles", "regions", "instances"} per run
+        """
+        rows = self.connection.execute(
+            """
+            SELECT runs.id, runs.started, runs.profiles, COUNT(DISTINCT regions.id),
+                   (SELECT COUNT(*) FROM instances JOIN regions r ON instances.region_id = r.id
+                    WHERE r.run_id = runs.id)
+            FROM runs LEFT JOIN regions ON regions.run_id = runs.id
+            GROUP BY runs.id ORDER BY runs.id DESC
+            """
+        )
+        return [
+            {
+                "id": run_id, "started": started, "profiles": json.loads(profiles),
+                "regions": region_count, "instances": instance_count,
+            }
+            for run_id, started, profiles, region_count, instance_count in rows
+        ]
+
+    def get_run(self, run_id=None):
+        """Return the run ``run_id``, or the latest one, as listed by runs(); None if missing."""
+        query = "SELECT id, started, profiles FROM runs"
+        if run_id is None:
+            row = self.connection.execute(query + " ORDER BY id DESC LIMIT 1").fetchone()
+        else:
+            row = self.connection.execute(query + " WHERE id = ?", (run_id,)).fetchone()
+        if row is None:
+            return None
+        return {"id": row[0], "started": row[1], "profiles": json.loads(row[2])}
+
+    def iter_regions(self, run_id):
+        """
+        Read the regions of a run back, one at a time.
+
+        Yields:
+            tuple: (key, account, region, RegionInventory), in the order
+            the run reported them
+        """
+        regions = self.connection.execute(
+            "SELECT id, key, account, region, summary FROM regions WHERE run_id = ? ORDER BY position",
+            (run_id,),
+        ).fetchall()
+        for region_id, key, account, region, summary in regions:
+            yield key, account, region, self._load_region(region_id, summary)
+
+    def _rows(self, query, region_id):
+        # Cursors are iterated as they are read, not fetched into lists
+        return self.connection.execute(query, (region_id,))
+
+    def _load_region(self, region_id, summary):
+        vpcs = [
+            Vpc(*row)
+            for row in self._rows("SELECT id, name, cidr FROM vpcs WHERE region_id = ? ORDER BY position", region_id)
+        ]
+        subnets = [
+            Subnet(*row)
+            for row in self._rows(
+                "SELECT id, vpc_id, name, cidr, az FROM subnets WHERE region_id = ? ORDER BY position", region_id
+            )
+        ]
+
+        sg_ids = {}
+        for instance_id, group in groupby(
+            self._rows(
+                "SELECT instance_id, sg_id FROM instance_security_groups WHERE region_id = ? "
+                "ORDER BY instance_id, rowid",
+                region_id,
+            ),
+            key=lambda row: row[0],
+        ):
+            sg_ids[instance_id] = [sg_id for _, sg_id in group]
+        instances = [
+            Instance(*row, security_group_ids=sg_ids.get(row[0]))
+            for row in self._rows(
+                "SELECT id, name, type, state, private_ip, public_ip, subnet_id FROM instances "
+                "WHERE region_id = ? ORDER BY position",
+                region_id,
+            )
+        ]
+
+        peers = {
+            rule_id: tuple(Peer(*row[1:]) for row in group)
+            for rule_id, group in groupby(
+                self._rows(
+                    "SELECT rule_peers.rule_id, type, value, description FROM rule_peers "
+                    "JOIN rules ON rule_peers.rule_id = rules.id "
+                    "WHERE rules.region_id = ? ORDER BY rule_peers.rule_id, rule_peers.position",
+                    region_id,
+                ),
+                key=lambda row: row[0],
+            )
+        }
+        rules = {}
+        for rule_id, sg_id, direction, protocol, from_port, to_port in self._rows(
+            "SELECT id, sg_id, direction, protocol, from_port, to_port FROM rules WHERE region_id = ? ORDER BY id",
+            region_id,
+        ):
+            rules.setdefault((sg_id, direction), []).append(
+                Rule(protocol, from_port, to_port, peers.get(rule_id, ()))
+            )
+        sg_map = {}
+        for sg_id, name, description, vpc_id in self._rows(
+            "SELECT id, name, description, vpc_id FROM security_groups WHERE region_id = ? ORDER BY position",
+            region_id,
+        ):
+            sg_map[sg_id] = SecurityGroup(
+                sg_id, name, description, vpc_id,
+                tuple(rules.get((sg_id, "inbound"), ())),
+                tuple(rules.get((sg_id, "outbound"), ())),
+            )
+
+        igws_by_vpc = {}
+        for vpc_id, igw_id, name in self._rows(
+            "SELECT vpc_id, id, name FROM internet_gateways WHERE region_id = ? ORDER BY rowid", region_id
+        ):
+            igws_by_vpc.setdefault(vpc_id, []).append(InternetGateway(igw_id, name))
+
+        if summary:
+            return RegionInventory(vpcs=vpcs, summary=summary)
+        return build_region_inventory(
+            vpcs,
+            group_subnets_by_vpc(subnets),
+            group_instances_by_subnet(instances),
+            sg_map,
+            group_security_groups_by_vpc(sg_map),
+            igws_by_vpc,
+        )
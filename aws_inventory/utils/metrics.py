@@ -0,0 +1,201 @@
+"""Timing instrumentation of a run: the phases of main() and every AWS API call."""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from functools import partial
+
+# Bumped whenever the layout of the metrics file changes
+METRICS_VERSION = 1
+
+_DONE = object()
+
+
+def _response_size(http_response):
+    # Responses served without a request (response cache, Stubber) have no body
+    if http_response.raw is None:
+        return 0
+    return len(http_response.content or b"")
+
+
+class RunMetrics:
+    """
+    Timings of the phases of a run and of every AWS API call it makes.
+
+    Phases are timed from the main thread with ``phase(name)`` and
+    ``timed(name, fragments)``. A phase records its own time only: time
+    attributed to another phase nested in it (e.g. rendering the fragments
+    a save writes) is subtracted, so the phases add up to the run time.
+
+    API calls are timed by hooks on each registered client, from the moment
+    a call's parameters are built until its response is parsed, so the
+    latency includes rate limiting waits and retries. Calls are aggregated
+    per (account, region, API).
+    """
+
+    def __init__(self):
+        self.started = datetime.now()
+        self.phases = {}
+        self.api = {}
+        self._nested = 0.0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name):
+        """Time the enclosed block as phase ``name``."""
+        outer = self._nested
+        self._nested = 0.0
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._add_phase(name, elapsed - self._nested)
+            self._nested = outer + elapsed
+
+    def timed(self, name, fragments):
+        """Yield from ``fragments``, timing the production of each item as phase ``name``."""
+        iterator = iter(fragments)
+        elapsed = 0.0
+        try:
+            while True:
+                start = time.perf_counter()
+                fragment = next(iterator, _DONE)
+                elapsed += time.perf_counter() - start
+                if fragment is _DONE:
+                    return
+                yield fragment
+        finally:
+            self._add_phase(name, elapsed)
+            self._nested += elapsed
+
+    def _add_phase(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def register(self, client, account, asynchronous=False):
+        """Time every call made by ``client``; ``asynchronous`` is set for aiobotocore clients."""
+        region = client.meta.region_name
+        service_id = client.meta.service_model.service_id.hyphenize()
+        events = client.meta.events
+
+        after_call = self._after_call_async if asynchronous else self._after_call
+        events.register(f"before-parameter-build.{service_id}", self._start_call)
+        events.register(f"after-call.{service_id}", partial(after_call, account, region))
+        events.register(f"after-call-error.{service_id}", partial(self._after_error, account, region))
+
+    def _start_call(self, context, **kwargs):
+        context["metrics_start"] = time.perf_counter()
+
+    def _record(self, account, region, event_name, context, **counts):
+        # event_name is "after-call.<service>.<Operation>"
+        operation = event_name.rsplit(".", 1)[-1]
+        latency = time.perf_counter() - context.get("metrics_start", time.perf_counter())
+        key = (account, region, operation)
+
+        with self._lock:
+            if key not in self.api:
+                self.api[key] = {
+                    "pages": 0, "cache_hits": 0, "retries": 0, "errors": 0,
+                    "bytes": 0, "latency_total": 0.0, "latency_max": 0.0,
+                }
+            entry = self.api[key]
+            # Every describe_* call returns one page
+            entry["pages"] += 1
+            entry["latency_total"] += latency
+            entry["latency_max"] = max(entry["latency_max"], latency)
+            for counter, amount in counts.items():
+                entry[counter] += amount
+
+    def _after_call(self, account, region, event_name, http_response, parsed, context, **kwargs):
+        cache_hit = bool(context.get("response_cache_hit"))
+        size = 0 if cache_hit else _response_size(http_response)
+        self._record_response(account, region, event_name, http_response, parsed, context, size)
+
+    async def _after_call_async(self, account, region, event_name, http_response, parsed, context, **kwargs):
+        # aiobotocore responses expose their (already read) body as an awaitable
+        size = 0
+        if not context.get("response_cache_hit") and http_response.raw is not None:
+            size = len(await http_response.content or b"")
+        self._record_response(account, region, event_name, http_response, parsed, context, size)
+
+    def _record_response(self, account, region, event_name, http_response, parsed, context, size):
+        cache_hit = bool(context.get("response_cache_hit"))
+        self._record(
+            account, region, event_name, context,
+            cache_hits=int(cache_hit),
+            retries=0 if cache_hit else parsed.get("ResponseMetadata", {}).get("RetryAttempts", 0),
+            errors=int(http_response.status_code >= 300),
+            bytes=size,
+        )
+
+    def _after_error(self, account, region, event_name, context, **kwargs):
+        # Connection errors and timeouts that outlived botocore's retries
+        self._record(account, region, event_name, context, errors=1)
+
+    def merge(self, api):
+        """Add the ``api`` counters of another RunMetrics, e.g. from a worker process."""
+        with self._lock:
+            for key, other in api.items():
+                if key not in self.api:
+                    self.api[key] = dict(other)
+                    continue
+                entry = self.api[key]
+                for counter, value in other.items():
+                    if counter == "latency_max":
+                        entry[counter] = max(entry[counter], value)
+                    else:
+                        entry[counter] += value
+
+    def totals(self):
+        """Return the API counters summed over every (account, region, API)."""
+        totals = {
+            "pages": 0, "cache_hits": 0, "retries": 0, "errors": 0,
+            "bytes": 0, "latency_total": 0.0,
+        }
+        with self._lock:
+            for entry in self.api.values():
+                for counter in totals:
+                    totals[counter] += entry[counter]
+        return totals
+
+    def to_dict(self, **extra):
+        """
+        Return the metrics as a JSON-serializable dict.
+
+        Args:
+            **extra: Additional top-level entries, e.g. scheduler or cache stats
+
+        Returns:
+            dict: Phase durations in seconds, and API calls sorted by total
+            latency, slowest first
+        """
+        with self._lock:
+            api = [
+                dict(
+                    account=account, region=region, operation=operation, **entry,
+                    latency_avg=entry["latency_total"] / entry["pages"],
+                )
+                for (account, region, operation), entry in self.api.items()
+            ]
+        api.sort(key=lambda entry: entry["latency_total"], reverse=True)
+
+        data = {
+            "version": METRICS_VERSION,
+            "started": self.started.isoformat(timespec="seconds"),
+            "phases": dict(self.phases),
+            "api": api,
+            "totals": self.totals(),
+        }
+        data.update(extra)
+        return data
+
+    def save(self, path, **extra):
+        """Write the metrics to ``path`` as JSON and return the path."""
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(**extra), f, indent=2, default=str)
+        return path
@@ -0,0 +1,120 @@
+"""Discovery of the regions to inventory, cached between runs."""
+import json
+import os
+import time
+from botocore.exceptions import BotoCoreError, ClientError
+from aws_inventory.utils.common import write_json_atomic
+
+# Regions only change when AWS launches one or the account opts in
+DEFAULT_REGIONS_TTL = 86400
+
+# OptInStatus values returned by describe_regions(AllRegions=True)
+REGION_STATUSES = ("opt-in-not-required", "opted-in", "not-opted-in")
+ENABLED_REGION_STATUSES = ("opt-in-not-required", "opted-in")
+
+# Commercial regions launched before March 20, 2019 are enabled in every
+# account; the later ones are opt-in. botocore's endpoint data doesn't say
+# which is which, and this list never grows.
+DEFAULT_ENABLED_REGIONS = frozenset((
+    "ap-northeast-1", "ap-northeast-2", "ap-northeast-3", "ap-south-1",
+    "ap-southeast-1", "ap-southeast-2", "ca-central-1", "eu-central-1",
+    "eu-north-1", "eu-west-1", "eu-west-2", "eu-west-3", "sa-east-1",
+    "us-east-1", "us-east-2", "us-west-1", "us-west-2",
+))
+
+
+def describe_regions(client_factory, service_name="ec2"):
+    """
+    List every region of the account with its opt-in status.
+
+    Returns:
+        list: [{"name": region, "status": opt-in status}, ...]
+    """
+    client = client_factory.client(service_name, "us-east-1")
+    response = client.describe_regions(AllRegions=True)
+    return [
+        {"name": region["RegionName"], "status": region.get("OptInStatus")}
+        for region in response["Regions"]
+    ]
+
+
+def bundled_regions(session, service_name="ec2"):
+    """
+    List the regions of a service from the endpoint data bundled with botocore.
+
+    Used when describe_regions can't be called. Regions enabled by default
+    (DEFAULT_ENABLED_REGIONS, and every region outside the commercial
+    partition) are "opt-in-not-required"; the status of the other
+    commercial regions is unknown (None).
+
+    Returns:
+        list: [{"name": region, "status": opt-in status or None}, ...]
+    """
+    partition = session.get_partition_for_region(session.region_name or "us-east-1")
+    return [
+        {
+            "name": region,
+            "status": "opt-in-not-required"
+            if partition != "aws" or region in DEFAULT_ENABLED_REGIONS else None,
+        }
+        for region in session.get_available_regions(service_name, partition_name=partition)
+    ]
+
+
+def _load(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def discover_regions(client_factory, cache_dir=None, ttl=DEFAULT_REGIONS_TTL,
+                     statuses=ENABLED_REGION_STATUSES, service_name="ec2"):
+    """
+    Return the names of the regions to inventory.
+
+    The region list of each profile is cached in ``<cache_dir>/regions`` and
+    reused for ``ttl`` seconds, so most runs make no describe_regions call.
+    When the API can't be reached, an expired cached list is used, and
+    failing that botocore's bundled endpoint data.
+
+    Args:
+        client_factory: ClientFactory of the account
+        cache_dir: Cache directory, or None to always call the API
+        ttl: Seconds the cached region list is reused
+        statuses: Opt-in statuses to keep; regions from the bundled
+            endpoint data whose status is unknown are only kept when
+            "not-opted-in" is asked for
+        service_name: Service whose regions are listed
+
+    Returns:
+        list: Region names
+    """
+    path = None
+    cached = None
+    if cache_dir:
+        path = os.path.join(cache_dir, "regions", f"{client_factory.profile or 'default'}.json")
+        cached = _load(path)
+
+    if cached and time.time() - cached["fetched"] <= ttl:
+        regions = cached["regions"]
+    else:
+        try:
+            regions = describe_regions(client_factory, service_name)
+            if path:
+                write_json_atomic(path, {"fetched": time.time(), "regions": regions})
+        except (BotoCoreError, ClientError) as e:
+            if cached:
+                print(f"Region discovery failed ({e}), using the cached region list")
+                regions = cached["regions"]
+            else:
+                print(f"Region discovery failed ({e}), using botocore's bundled region list")
+                regions = bundled_regions(client_factory.session, service_name)
+
+    return [
+        region["name"]
+        for region in regions
+        if region["status"] in statuses
+        or (region["status"] is None and "not-opted-in" in statuses)
+    ]
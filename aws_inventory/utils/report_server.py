@@ -0,0 +1,185 @@
+"""
+Local HTTP server publishing the latest report of ``aws-inventory serve``.
+
+Documents are rendered, hashed and gzipped once when they are published;
+requests only pick the stored representation, so clients polling the
+server never cause collection or rendering. Conditional requests are
+answered with 304 Not Modified from the ETag and Last-Modified headers.
+"""
+import gzip
+import hashlib
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+GZIP_LEVEL = 6
+
+
+class Document:
+    """
+    A published document: its body, precompressed, with its validators.
+
+    Args:
+        body: Document bytes
+        content_type: Content-Type header value
+        modified: Last modification time, in seconds since the epoch
+            (default: now)
+    """
+
+    __slots__ = ("body", "gzipped", "content_type", "etag", "modified")
+
+    def __init__(self, body, content_type, modified=None):
+        self.body = body
+        self.gzipped = gzip.compress(body, GZIP_LEVEL)
+        self.content_type = content_type
+        self.etag = hashlib.sha256(body).hexdigest()[:32]
+        # HTTP dates have a one second resolution
+        self.modified = int(modified if modified is not None else time.time())
+
+
+def _etag_matches(header, etags):
+    # If-None-Match: "*", or a list of (possibly weak) entity tags
+    if header.strip() == "*":
+        return True
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag.strip('"') in etags:
+            return True
+    return False
+
+
+def _accepts_gzip(header):
+    # Accept-Encoding: gzip, or "*", with a non-zero quality
+    for coding in header.split(","):
+        name, _, params = coding.partition(";")
+        if name.strip().lower() not in ("gzip", "*"):
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        return quality > 0
+    return False
+
+
+class ReportRequestHandler(BaseHTTPRequestHandler):
+    """Serve the documents published on the ReportServer."""
+
+    server_version = "aws-inventory"
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def _respond(self, send_body):
+        path = urlsplit(self.path).path
+        document = self.server.get(path)
+        if document is None:
+            if self.server.get("/") is None and path in self.server.paths:
+                self._send_error(503, "The first collection is still running", retry_after=True)
+            else:
+                self._send_error(404, f"Not found: {path}")
+            return
+
+        # Each encoding is its own representation, with its own entity tag
+        compressed = _accepts_gzip(self.headers.get("Accept-Encoding", ""))
+        etag = f"{document.etag}-gzip" if compressed else document.etag
+
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            not_modified = _etag_matches(if_none_match, (document.etag, f"{document.etag}-gzip"))
+        else:
+            not_modified = self._not_modified_since(document.modified)
+
+        self.send_response(304 if not_modified else 200)
+        self.send_header("ETag", f'"{etag}"')
+        self.send_header("Last-Modified", formatdate(document.modified, usegmt=True))
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+        if not_modified:
+            self.end_headers()
+            return
+
+        body = document.gzipped if compressed else document.body
+        self.send_header("Content-Type", document.content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if compressed:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _not_modified_since(self, modified):
+        header = self.headers.get("If-Modified-Since")
+        if not header:
+            return False
+        try:
+            since = parsedate_to_datetime(header).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return modified <= since
+
+    def _send_error(self, status, message, retry_after=False):
+        body = f"{message}\n".encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if retry_after:
+            self.send_header("Retry-After", "30")
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Dashboards poll the server; only errors are worth logging
+        pass
+
+
+class ReportServer(ThreadingHTTPServer):
+    """
+    HTTP server of the documents published by the serve loop.
+
+    Args:
+        address: (host, port) to listen on
+        paths: Paths that will be published, answered with 503 until the
+            first report is ready
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, paths=("/",)):
+        super().__init__(address, ReportRequestHandler)
+        self.paths = tuple(paths)
+        self._documents = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def publish(self, documents):
+        """Replace documents, given as {path: Document}, all at once."""
+        with self._lock:
+            self._documents = {**self._documents, **documents}
+
+    def get(self, path):
+        """Return the document published at ``path``, or None."""
+        with self._lock:
+            return self._documents.get(path)
+
+    def start(self):
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, name="report-server", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop serving and close the socket."""
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,154 @@
+"""Throttling-aware scheduling of AWS API calls."""
+import asyncio
+import threading
+import time
+from functools import partial
+
+# Error codes EC2 and other services return when a caller is rate limited
+THROTTLING_ERRORS = {
+    "RequestLimitExceeded",
+    "Throttling",
+    "ThrottlingException",
+    "ThrottledException",
+    "RequestThrottled",
+    "TooManyRequestsException",
+    "EC2ThrottledException",
+}
+
+# Requests per second allowed for each (account, region, API) before any
+# throttling is observed, and how many requests can be sent in a burst
+DEFAULT_RATE = 5.0
+DEFAULT_BURST = 10
+MIN_RATE = 0.5
+
+
+class TokenBucket:
+    """
+    Token bucket with additive-increase / multiplicative-decrease rate.
+
+    Every request takes one token. A throttled response halves the refill
+    rate, and each successful response slowly restores it towards the
+    configured maximum.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST):
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self):
+        # Take a token if one is available, else return the seconds to wait
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self):
+        """Block until a token is available and take it."""
+        while True:
+            wait = self._take()
+            if not wait:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Wait for a token without blocking the event loop, and take it."""
+        while True:
+            wait = self._take()
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+    def throttled(self):
+        """Back off after a throttled response."""
+        with self._lock:
+            self.rate = max(MIN_RATE, self.rate / 2)
+            self._tokens = min(self._tokens, 0.0)
+
+    def succeeded(self):
+        """Recover part of the rate after a successful response."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+
+
+class RequestScheduler:
+    """
+    Central rate limiter for every API call made by the inventory.
+
+    Collectors keep calling plain boto3 methods; each HTTP attempt of a
+    registered client first takes a token from the bucket of its (account,
+    region, API), and responses feed the bucket's adaptive rate and the
+    throttling counters.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST):
+        self.rate = rate
+        self.burst = burst
+        self.stats = {"calls": 0, "throttled": 0, "retried": 0}
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, account, region, operation):
+        """Return the token bucket for an (account, region, API) key."""
+        key = (account, region, operation)
+        with self._lock:
+            if key not in self._buckets:
+                self._buckets[key] = TokenBucket(self.rate, self.burst)
+            return self._buckets[key]
+
+    def register(self, client, account, asynchronous=False):
+        """
+        Route every request made by ``client`` through the scheduler.
+
+        ``asynchronous`` is set for aiobotocore clients, whose requests wait
+        for their token without blocking the event loop.
+        """
+        region = client.meta.region_name
+        service_id = client.meta.service_model.service_id.hyphenize()
+        events = client.meta.events
+
+        before_send = self._before_send_async if asynchronous else self._before_send
+        events.register(f"before-send.{service_id}", partial(before_send, account, region))
+        events.register(f"needs-retry.{service_id}", partial(self._on_response, account, region))
+        events.register(f"after-call.{service_id}", self._after_call)
+
+    def _count(self, counter, amount=1):
+        with self._lock:
+            self.stats[counter] += amount
+
+    def _before_send(self, account, region, event_name, **kwargs):
+        # event_name is "before-send.<service>.<Operation>"
+        operation = event_name.rsplit(".", 1)[-1]
+        self.bucket(account, region, operation).acquire()
+
+    async def _before_send_async(self, account, region, event_name, **kwargs):
+        operation = event_name.rsplit(".", 1)[-1]
+        await self.bucket(account, region, operation).acquire_async()
+
+    def _on_response(self, account, region, response, operation, **kwargs):
+        if response is None:
+            return None
+        http_response, parsed = response
+        bucket = self.bucket(account, region, operation.name)
+        if parsed.get("Error", {}).get("Code") in THROTTLING_ERRORS:
+            self._count("throttled")
+            bucket.throttled()
+        elif http_response.status_code < 300:
+            bucket.succeeded()
+        # Leave the retry decision to botocore's retry handler
+        return None
+
+    def _after_call(self, parsed, context, **kwargs):
+        if context.get("response_cache_hit"):
+            return
+        self._count("calls")
+        retries = parsed.get("ResponseMetadata", {}).get("RetryAttempts", 0)
+        if retries:
+            self._count("retried", retries)
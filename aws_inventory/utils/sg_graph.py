@@ -0,0 +1,287 @@
+"""
+Security group reference graph and instance reachability queries.
+
+Security group rules reference other groups ("sg" peers) or address ranges
+("cidr" peers). SecurityGroupGraph indexes the rules of a region once, as
+SG -> SG edges labeled with their protocol and port range, together with
+the instances that are members of each group and their private IPs, so
+reachability questions only touch the groups involved instead of scanning
+every rule of the region.
+
+An instance A can reach an instance B on a port when a security group of
+B allows it inbound from A (one of A's groups, or a CIDR holding A's
+private IP) and, unless egress checks are disabled, a security group of A
+allows it outbound to B in the same way.
+"""
+import bisect
+import ipaddress
+import socket
+from aws_inventory.collectors.model import Record
+
+# IpProtocol values; "-1" (all traffic) is stored as "all" by the collector
+PROTOCOL_NAMES = {"-1": "all", "6": "tcp", "17": "udp", "1": "icmp", "58": "icmpv6"}
+PORT_PROTOCOLS = ("tcp", "udp")
+
+
+def normalize_protocol(protocol):
+    """Return the protocol name of an IpProtocol value or protocol number."""
+    protocol = str(protocol).lower()
+    return PROTOCOL_NAMES.get(protocol, protocol)
+
+
+def rule_matches(rule, protocol, port):
+    """
+    Whether a rule allows ``protocol`` (normalized) traffic on ``port``.
+
+    The "all" protocol matches rules of any protocol; with a port, only the
+    rules of port-based protocols covering it (and all-traffic rules).
+    """
+    rule_protocol = normalize_protocol(rule.protocol)
+    if rule_protocol == "all":
+        return True
+    if protocol == "all":
+        if rule_protocol not in PORT_PROTOCOLS:
+            return port is None
+    elif rule_protocol != protocol:
+        return False
+    elif protocol not in PORT_PROTOCOLS:
+        return True
+    if port is None or rule.from_port in (None, "all", -1):
+        return True
+    return int(rule.from_port) <= port <= int(rule.to_port)
+
+
+def traffic_protocol(rule, protocol):
+    """The protocol of the traffic a rule matched for a query on ``protocol`` (normalized)."""
+    return normalize_protocol(rule.protocol) if protocol == "all" else protocol
+
+
+class Grant(Record):
+    """
+    One way traffic is allowed: ``rule`` of security group ``sg_id`` names
+    ``peer``, which covers ``instance_id`` (None for an address range that
+    holds no instance of the region, e.g. 0.0.0.0/0).
+    """
+
+    __slots__ = ("instance_id", "sg_id", "rule", "peer")
+
+    def __init__(self, instance_id, sg_id, rule, peer):
+        # Queries may return one grant per instance of the region: skip the
+        # generic Record constructor
+        self.instance_id = instance_id
+        self.sg_id = sg_id
+        self.rule = rule
+        self.peer = peer
+
+
+class SecurityGroupGraph:
+    """
+    Reachability index of the security groups and instances of a region.
+
+    Args:
+        inventory: RegionInventory of the region
+    """
+
+    def __init__(self, inventory):
+        self.instances = {}
+        self.members = {}
+        self.edges_into = {}
+        self.edges_from = {}
+        self._cidr_ingress = {}
+        self._egress = {}
+        self._ips = []
+
+        for instances in inventory.instances_by_subnet.values():
+            for instance in instances:
+                self.instances[instance.id] = instance
+                for sg_id in instance.security_group_ids:
+                    self.members.setdefault(sg_id, []).append(instance.id)
+                address = _ipv4(instance.private_ip)
+                if address is not None:
+                    self._ips.append((address, instance.id))
+        self._ips.sort()
+        self._ip_keys = [address for address, _ in self._ips]
+
+        self.security_groups = inventory.security_groups
+        for sg in inventory.security_groups.values():
+            for rule in sg.inbound_rules:
+                for peer in rule.peers:
+                    if peer.type == "sg":
+                        # Edge from the referenced group to the group it may reach
+                        self.edges_into.setdefault(sg.id, []).append((peer.value, rule, peer))
+                        self.edges_from.setdefault(peer.value, []).append((sg.id, rule, peer))
+                    elif peer.type == "cidr":
+                        # Source addresses are IPv4: index the IPv4 ranges by
+                        # prefix length, then by network address
+                        network = _network(peer.value)
+                        if network is not None and network.version == 4:
+                            self._cidr_ingress.setdefault(network.prefixlen, {}).setdefault(
+                                int(network.network_address), []
+                            ).append((sg.id, rule, peer))
+            # Outbound rules, with their peers split into group IDs and IPv4 ranges
+            self._egress[sg.id] = [
+                (
+                    rule,
+                    frozenset(peer.value for peer in rule.peers if peer.type == "sg"),
+                    [
+                        (int(network.network_address), int(network.broadcast_address))
+                        for network in (_network(peer.value) for peer in rule.peers if peer.type == "cidr")
+                        if network is not None and network.version == 4
+                    ],
+                )
+                for rule in sg.outbound_rules
+            ]
+
+    def _instances_in(self, network):
+        # Instances of the region whose private IPv4 address is in ``network``
+        if network.version != 4:
+            return []
+        start = bisect.bisect_left(self._ip_keys, int(network.network_address))
+        end = bisect.bisect_right(self._ip_keys, int(network.broadcast_address))
+        return [instance_id for _, instance_id in self._ips[start:end]]
+
+    def egress_allows(self, source, target, protocol, port):
+        """Whether a security group of instance ``source`` lets traffic out to instance ``target``."""
+        return self._egress_allows(source.security_group_ids, target, _ipv4(target.private_ip), protocol, port)
+
+    def _egress_allows(self, sg_ids, target, address, protocol, port):
+        for sg_id in sg_ids:
+            for rule, peer_groups, ranges in self._egress.get(sg_id, ()):
+                if not rule_matches(rule, protocol, port):
+                    continue
+                if not peer_groups.isdisjoint(target.security_group_ids):
+                    return True
+                if address is not None and any(low <= address <= high for low, high in ranges):
+                    return True
+        return False
+
+    def _egress_filter(self, target, port):
+        # Egress only depends on the source's security groups, so sources
+        # sharing the same groups (e.g. an auto scaling group) are checked once
+        address = _ipv4(target.private_ip)
+        verdicts = {}
+
+        def allowed(source_id, protocol):
+            key = (self.instances[source_id].security_group_ids, protocol)
+            if key not in verdicts:
+                verdicts[key] = self._egress_allows(key[0], target, address, protocol, port)
+            return verdicts[key]
+        return allowed
+
+    def sources_of(self, instance_id, port=None, protocol="tcp", check_egress=True):
+        """
+        Return how an instance can be reached on a port.
+
+        Args:
+            instance_id: ID of the target instance
+            port: Destination port; None matches any port
+            protocol: Protocol name or number; "all" (or -1) matches any protocol
+            check_egress: Also require the source's security groups to allow
+                the traffic outbound
+
+        Returns:
+            list: Grant records, one per (source instance, rule, peer),
+            plus one per address range holding no instance
+        """
+        target = self.instances.get(instance_id)
+        if target is None:
+            raise KeyError(f"Unknown instance {instance_id}")
+        protocol = normalize_protocol(protocol)
+        grants = []
+
+        for sg_id in target.security_group_ids:
+            for source_sg, rule, peer in self.edges_into.get(sg_id, ()):
+                if not rule_matches(rule, protocol, port):
+                    continue
+                for source_id in self.members.get(source_sg, ()):
+                    grants.append(Grant(source_id, sg_id, rule, peer))
+
+            sg = self.security_groups.get(sg_id)
+            for rule in sg.inbound_rules if sg else ():
+                if not rule_matches(rule, protocol, port):
+                    continue
+                for peer in rule.peers:
+                    network = _network(peer.value) if peer.type == "cidr" else None
+                    if network is None:
+                        continue
+                    sources = self._instances_in(network)
+                    grants.extend(Grant(source_id, sg_id, rule, peer) for source_id in sources)
+                    if not sources or network.num_addresses > len(sources):
+                        grants.append(Grant(None, sg_id, rule, peer))
+
+        allowed = self._egress_filter(target, port)
+        return [
+            grant for grant in grants
+            if grant.instance_id != instance_id
+            and (
+                grant.instance_id is None or not check_egress
+                or allowed(grant.instance_id, traffic_protocol(grant.rule, protocol))
+            )
+        ]
+
+    def targets_of(self, instance_id, port=None, protocol="tcp", check_egress=True):
+        """
+        Return the instances an instance can reach on a port.
+
+        Args:
+            instance_id: ID of the source instance
+            port: Destination port; None matches any port
+            protocol: Protocol name or number; "all" (or -1) matches any protocol
+            check_egress: Also require the source's security groups to allow
+                the traffic outbound
+
+        Returns:
+            list: Grant records, one per (target instance, rule, peer);
+            ``sg_id`` is the target's security group allowing the traffic
+        """
+        source = self.instances.get(instance_id)
+        if source is None:
+            raise KeyError(f"Unknown instance {instance_id}")
+        protocol = normalize_protocol(protocol)
+        grants = []
+
+        for sg_id in source.security_group_ids:
+            for target_sg, rule, peer in self.edges_from.get(sg_id, ()):
+                if rule_matches(rule, protocol, port):
+                    grants.extend(
+                        Grant(target_id, target_sg, rule, peer)
+                        for target_id in self.members.get(target_sg, ())
+                    )
+
+        address = _ipv4(source.private_ip)
+        if address is not None:
+            # One lookup per prefix length used by the region's rules
+            for prefixlen, networks in self._cidr_ingress.items():
+                mask = (0xFFFFFFFF << (32 - prefixlen)) & 0xFFFFFFFF
+                for target_sg, rule, peer in networks.get(address & mask, ()):
+                    if rule_matches(rule, protocol, port):
+                        grants.extend(
+                            Grant(target_id, target_sg, rule, peer)
+                            for target_id in self.members.get(target_sg, ())
+                        )
+
+        return [
+            grant for grant in grants
+            if grant.instance_id != instance_id
+            and (
+                not check_egress
+                or self.egress_allows(
+                    source, self.instances[grant.instance_id], traffic_protocol(grant.rule, protocol), port
+                )
+            )
+        ]
+
+
+def _ipv4(value):
+    # Integer value of a dotted IPv4 address, or None
+    try:
+        return int.from_bytes(socket.inet_pton(socket.AF_INET, value), "big")
+    except (TypeError, OSError):
+        return None
+
+
+def _network(value):
+    try:
+        return ipaddress.ip_network(value, strict=False)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,88 @@
+"""Inventory snapshots used to skip unchanged regions between runs."""
+import hashlib
+import json
+import threading
+import time
+from aws_inventory.utils.common import write_json_atomic
+
+# Seconds a region's snapshot is reused before it is collected in full again
+DEFAULT_SNAPSHOT_MAX_AGE = 3600
+
+
+def _serialize(value):
+    # Inventory records are hashed by their field values
+    to_list = getattr(value, "to_list", None)
+    return to_list() if to_list else str(value)
+
+
+def fingerprint(*parts):
+    """Return a stable hash of JSON-serializable data and inventory records."""
+    data = json.dumps(parts, sort_keys=True, default=_serialize)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class SnapshotStore:
+    """
+    Inventory of the previous run, per region, with the fingerprint of the
+    resources it was built from.
+
+    The fingerprint only covers what the light incremental calls return
+    (the probe pages, or instance IDs and states; never security groups,
+    subnets or internet gateways), so a snapshot is reused for ``max_age``
+    seconds at most after the region was collected in full; older snapshots
+    are collected in full again.
+
+    The store is a single JSON file. Regions are updated in memory by the
+    collection workers and written back with ``save()`` at the end of the
+    run, when any of them changed.
+    """
+
+    def __init__(self, path, max_age=DEFAULT_SNAPSHOT_MAX_AGE):
+        self.path = path
+        self.max_age = max_age
+        self._regions = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        try:
+            with open(path, encoding="utf-8") as f:
+                self._regions = json.load(f)
+        except (OSError, ValueError):
+            self._regions = {}
+
+    def get(self, region, region_fingerprint):
+        """Return the stored inventory of a region if its fingerprint matches and it isn't too old."""
+        with self._lock:
+            entry = self._regions.get(region)
+        if not entry or entry.get("fingerprint") != region_fingerprint:
+            return None
+        # Snapshots written before entries were dated are collected again
+        if time.time() - entry.get("collected", 0) > self.max_age:
+            return None
+        return entry["inventory"]
+
+    def digest_of(self, region):
+        """Return the hash of the inventory stored for a region, or None."""
+        with self._lock:
+            entry = self._regions.get(region)
+        return entry.get("digest") if entry else None
+
+    def put(self, region, region_fingerprint, inventory):
+        """Record the inventory collected for a region."""
+        with self._lock:
+            self._regions[region] = {
+                "fingerprint": region_fingerprint,
+                "collected": time.time(),
+                # Tells whether a full collection changed the inventory,
+                # which the fingerprint can't (see max_age)
+                "digest": fingerprint(inventory),
+                "inventory": inventory,
+            }
+            self._dirty = True
+
+    def save(self):
+        """Write the snapshot file atomically, if a region was updated since it was read."""
+        if not self._dirty:
+            return
+        with self._lock:
+            write_json_atomic(self.path, self._regions)
+            self._dirty = False
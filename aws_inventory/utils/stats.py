@@ -1,83 +1,98 @@
-"""Statistics calculation utilities."""
+"""Statistics calculation utilities.
 
+Statistics are computed once per region, in a single pass over its
+records, when its RegionInventory is assembled; the report totals are then
+summed from the per-region figures. Renderers only read these values.
+"""
 
-def calculate_ec2_stats(regions_data):
+
+def _count_state(counts, state):
+    counts[state] = counts.get(state, 0) + 1
+
+
+def calculate_region_stats(inventory):
     """
-    Calculate statistics for EC2 resources across all regions.
-    
+    Calculate every statistic of a region in a single pass.
+
     Args:
-        regions_data: Dictionary of {region: [vpcs]} data
-        
+        inventory: RegionInventory of the region
+
     Returns:
-        dict: Statistics including totals and breakdowns
+        dict: Region totals, plus per-VPC ("vpcs") and per-subnet ("subnets")
+        breakdowns keyed by ID, each with its instances by state
     """
     stats = {
-        "total_vpcs": 0,
-        "total_subnets": 0,
-        "total_instances": 0,
-        "total_security_groups": 0,
+        "vpc_count": len(inventory.vpcs),
+        "subnet_count": 0,
+        "sg_count": 0,
+        "instance_count": 0,
         "instances_by_state": {},
-        "regions_with_resources": 0
+        "vpcs": {},
+        "subnets": {},
     }
-    
-    for region, vpcs in regions_data.items():
-        if vpcs:
-            stats["regions_with_resources"] += 1
-            
-        for vpc in vpcs:
-            stats["total_vpcs"] += 1
-            stats["total_subnets"] += len(vpc.get("subnets", []))
-            stats["total_security_groups"] += len(vpc.get("security_groups", []))
-            
-            for subnet in vpc.get("subnets", []):
-                for instance in subnet.get("instances", []):
-                    stats["total_instances"] += 1
-                    state = instance.get("state", "unknown")
-                    stats["instances_by_state"][state] = stats["instances_by_state"].get(state, 0) + 1
-    
+
+    for vpc in inventory.vpcs:
+        subnets = inventory.subnets_of(vpc.id)
+        vpc_stats = {
+            "subnet_count": len(subnets),
+            "sg_count": len(inventory.security_groups_of(vpc.id)),
+            "instance_count": 0,
+            "instances_by_state": {},
+        }
+
+        for subnet in subnets:
+            instances = inventory.instances_of(subnet.id)
+            subnet_stats = {"instance_count": len(instances), "instances_by_state": {}}
+
+            for instance in instances:
+                state = instance.state or "unknown"
+                _count_state(subnet_stats["instances_by_state"], state)
+                _count_state(vpc_stats["instances_by_state"], state)
+                _count_state(stats["instances_by_state"], state)
+
+            vpc_stats["instance_count"] += subnet_stats["instance_count"]
+            stats["subnets"][subnet.id] = subnet_stats
+
+        stats["subnet_count"] += vpc_stats["subnet_count"]
+        stats["sg_count"] += vpc_stats["sg_count"]
+        stats["instance_count"] += vpc_stats["instance_count"]
+        stats["vpcs"][vpc.id] = vpc_stats
+
     return stats
 
 
-def calculate_vpc_stats(vpc):
+def calculate_ec2_stats(regions_data):
     """
-    Calculate statistics for a single VPC.
-    
+    Sum the precomputed region statistics into report-wide totals.
+
     Args:
-        vpc: VPC dictionary
-        
+        regions_data: Dictionary of {region: RegionInventory} data
+
     Returns:
-        dict: VPC-level statistics
+        dict: Statistics including totals and breakdowns, with the
+        statistics of every region under "regions"
     """
-    instance_count = sum(
-        len(subnet.get("instances", [])) 
-        for subnet in vpc.get("subnets", [])
-    )
-    
-    return {
-        "subnet_count": len(vpc.get("subnets", [])),
-        "sg_count": len(vpc.get("security_groups", [])),
-        "instance_count": instance_count
+    stats = {
+        "total_vpcs": 0,
+        "total_subnets": 0,
+        "total_instances": 0,
+        "total_security_groups": 0,
+        "instances_by_state": {},
+        "regions_with_resources": 0,
+        "regions": {},
     }
 
+    for region, inventory in regions_data.items():
+        region_stats = inventory.stats
+        if region_stats["vpc_count"]:
+            stats["regions_with_resources"] += 1
 
-def calculate_region_stats(vpcs):
-    """
-    Calculate statistics for a single region.
-    
-    Args:
-        vpcs: List of VPC dictionaries
-        
-    Returns:
-        dict: Region-level statistics
-    """
-    vpc_count = len(vpcs)
-    instance_count = sum(
-        len(subnet.get("instances", []))
-        for vpc in vpcs
-        for subnet in vpc.get("subnets", [])
-    )
-    
-    return {
-        "vpc_count": vpc_count,
-        "instance_count": instance_count
-    }
\ No newline at end of file
+        stats["total_vpcs"] += region_stats["vpc_count"]
+        stats["total_subnets"] += region_stats["subnet_count"]
+        stats["total_instances"] += region_stats["instance_count"]
+        stats["total_security_groups"] += region_stats["sg_count"]
+        for state, count in region_stats["instances_by_state"].items():
+            stats["instances_by_state"][state] = stats["instances_by_state"].get(state, 0) + count
+        stats["regions"][region] = region_stats
+
+    return stats
@@ -0,0 +1,140 @@
+"""
+Compare the memory used by the normalized inventory model with the nested
+dict tree collect_ec2 used to return.
+
+Run from the project root:
+
+    python -m benchmarks.bench_memory --vpcs 20 --instances 250
+"""
+import argparse
+import sys
+from benchmarks.synthetic import generate_inventory
+from aws_inventory.collectors.model import Record, RegionInventory
+
+
+def fresh(value):
+    """Copy strings into new objects, like values parsed from an API response."""
+    if isinstance(value, str):
+        return value.encode("utf-8").decode("utf-8")
+    if isinstance(value, list):
+        return [fresh(item) for item in value]
+    if isinstance(value, dict):
+        return {fresh(key): fresh(item) for key, item in value.items()}
+    return value
+
+
+def legacy_tree(inventory):
+    """Rebuild the previous {vpc: subnets: instances: security_groups} dict tree."""
+    def rule(rule, key):
+        return {
+            "protocol": fresh(rule.protocol),
+            "from_port": fresh(rule.from_port),
+            "to_port": fresh(rule.to_port),
+            key: [
+                {"type": fresh(p.type), "value": fresh(p.value), "description": fresh(p.description)}
+                for p in rule.peers
+            ],
+        }
+
+    # Security group dicts were shared between the VPC and its instances
+    sg_dicts = {
+        sg.id: {
+            "id": fresh(sg.id),
+            "name": fresh(sg.name),
+            "description": fresh(sg.description),
+            "vpc_id": fresh(sg.vpc_id),
+            "inbound_rules": [rule(r, "sources") for r in sg.inbound_rules],
+            "outbound_rules": [rule(r, "destinations") for r in sg.outbound_rules],
+        }
+        for sg in inventory.security_groups.values()
+    }
+
+    return [
+        {
+            "id": fresh(vpc.id),
+            "name": fresh(vpc.name),
+            "cidr": fresh(vpc.cidr),
+            "subnets": [
+                {
+                    "id": fresh(subnet.id),
+                    "name": fresh(subnet.name),
+                    "cidr": fresh(subnet.cidr),
+                    "az": fresh(subnet.az),
+                    "instances": [
+                        {
+                            "id": fresh(i.id),
+                            "name": fresh(i.name),
+                            "type": fresh(i.type),
+                            "state": fresh(i.state),
+                            "private_ip": fresh(i.private_ip),
+                            "public_ip": fresh(i.public_ip),
+                            "security_groups": [sg_dicts[sg_id] for sg_id in i.security_group_ids],
+                        }
+                        for i in inventory.instances_of(subnet.id)
+                    ],
+                }
+                for subnet in inventory.subnets_of(vpc.id)
+            ],
+            "igws": [{"id": fresh(igw.id), "name": fresh(igw.name)} for igw in inventory.igws_of(vpc.id)],
+            "security_groups": [sg_dicts[sg.id] for sg in inventory.security_groups_of(vpc.id)],
+        }
+        for vpc in inventory.vpcs
+    ]
+
+
+def deep_size(root):
+    """Total size in bytes of every distinct object reachable from ``root``."""
+    seen = set()
+    stack = [root]
+    total = 0
+
+    while stack:
+        obj = stack.pop()
+        if obj is None or id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple)):
+            stack.extend(obj)
+        elif isinstance(obj, (Record, RegionInventory)):
+            stack.extend(getattr(obj, name) for name in obj.__slots__)
+
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare inventory memory layouts")
+    parser.add_argument("--regions", type=int, default=2)
+    parser.add_argument("--vpcs", type=int, default=10)
+    parser.add_argument("--subnets", type=int, default=4)
+    parser.add_argument("--instances", type=int, default=50, help="Instances per subnet")
+    parser.add_argument("--sgs", type=int, default=20, help="Security groups per VPC")
+    parser.add_argument("--rules", type=int, default=5, help="Rules per direction per SG")
+    args = parser.parse_args()
+
+    regions_data = generate_inventory(
+        args.regions, args.vpcs, args.subnets, args.instances, args.sgs, args.rules
+    )
+    total_instances = args.regions * args.vpcs * args.subnets * args.instances
+
+    # Both layouts start from freshly parsed strings; the model interns them
+    model = {
+        region: RegionInventory.from_dict(fresh(inventory.to_dict()))
+        for region, inventory in regions_data.items()
+    }
+    tree = {region: legacy_tree(inventory) for region, inventory in regions_data.items()}
+
+    tree_size = deep_size(tree)
+    model_size = deep_size(model)
+    print(f"Synthetic inventory: {total_instances} instances")
+    print(f" dict tree: {tree_size / 1e6:8.1f} MB  ({tree_size / total_instances:.0f} B/instance)")
+    print(f"     model: {model_size / 1e6:8.1f} MB  ({model_size / total_instances:.0f} B/instance)")
+    print(f"     ratio: {tree_size / model_size:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
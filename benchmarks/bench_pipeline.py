@@ -0,0 +1,183 @@
+"""
+Benchmark the whole pipeline on a synthetic account, with no network.
+
+EC2 responses are generated at the requested scale and served by
+botocore's Stubber, then every phase is timed and its peak memory
+measured with tracemalloc (in a second pass, so tracing doesn't skew the
+timings):
+
+    collect      collect_ec2 for every region
+    stats        calculate_ec2_stats
+    render_ec2   render_ec2_inventory, fully consumed
+    render_html  render_html, fully consumed
+
+Run from the project root:
+
+    python -m benchmarks.bench_pipeline --scales 1k,10k,100k
+"""
+import argparse
+import time
+import tracemalloc
+from concurrent.futures import Future
+from unittest import mock
+from botocore.stub import Stubber
+from benchmarks.synthetic import generate_responses
+from aws_inventory.regional import ec2 as regional_ec2
+from aws_inventory.regional.ec2 import collect_ec2, PROBE_PAGE_SIZE
+from aws_inventory.renderers.ec2_renderer import render_ec2_inventory
+from aws_inventory.utils.boto_helpers import ClientFactory, DEFAULT_PAGE_SIZE
+from aws_inventory.utils.html_report import render_html
+from aws_inventory.utils.stats import calculate_ec2_stats
+
+PHASES = ("collect", "stats", "render_ec2", "render_html")
+
+RESULT_KEYS = {
+    "describe_security_groups": "SecurityGroups",
+    "describe_internet_gateways": "InternetGateways",
+    "describe_subnets": "Subnets",
+    "describe_vpcs": "Vpcs",
+    "describe_instances": "Reservations",
+}
+
+# Shape of the synthetic account; the number of VPCs grows with the scale
+REGIONS = 2
+SUBNETS_PER_VPC = 4
+INSTANCES_PER_SUBNET = 25
+SGS_PER_VPC = 10
+RULES_PER_SG = 5
+
+
+class SerialExecutor:
+    """
+    Stand-in for collect_ec2's thread pool that runs each task on submit.
+
+    Stubber serves responses in the order they were queued, so the describe
+    calls have to be issued in a fixed order.
+    """
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+
+def stub_region(client, items_by_method, page_size):
+    """Queue every page of the synthetic responses on a client's Stubber."""
+    stubber = Stubber(client)
+    complete = set()
+
+    # Probe pages, in the order probe_region issues them
+    for method in ("describe_instances", "describe_vpcs"):
+        items = items_by_method[method]
+        response = {RESULT_KEYS[method]: items[:PROBE_PAGE_SIZE]}
+        if len(items) > PROBE_PAGE_SIZE:
+            response["NextToken"] = "probe"
+        else:
+            complete.add(method)
+        stubber.add_response(method, response)
+
+    # Same order as the fetch phase of collect_ec2, which reuses complete probe pages
+    for method, result_key in RESULT_KEYS.items():
+        if method in complete:
+            continue
+        items = items_by_method[method]
+        pages = [items[i:i + page_size] for i in range(0, len(items), page_size)] or [[]]
+        for number, page in enumerate(pages, 1):
+            response = {result_key: page}
+            if number < len(pages):
+                response["NextToken"] = f"page-{number + 1}"
+            stubber.add_response(method, response)
+    stubber.activate()
+    return stubber
+
+
+def consume(fragments):
+    return sum(len(fragment) for fragment in fragments)
+
+
+def run_phases(responses, page_size, trace_memory):
+    """Run every phase once, returning {phase: (seconds, peak bytes or None)}."""
+    client_factory = ClientFactory()
+    stubbers = [
+        stub_region(client_factory.client("ec2", region), items, page_size)
+        for region, items in responses.items()
+    ]
+    state = {}
+
+    def collect():
+        with mock.patch.object(regional_ec2, "ThreadPoolExecutor", SerialExecutor):
+            state["regions"] = {
+                region: collect_ec2(client_factory, region, page_size) for region in responses
+            }
+
+    def stats():
+        calculate_ec2_stats(state["regions"])
+
+    def render_ec2():
+        consume(render_ec2_inventory(state["regions"]))
+
+    def render_full():
+        inventories_by_service = {"EC2": {"type": "ec2", "regions": state["regions"]}}
+        consume(render_html(inventories_by_service, "bench"))
+
+    results = {}
+    for phase, func in zip(PHASES, (collect, stats, render_ec2, render_full)):
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        peak = None
+        if trace_memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        results[phase] = (elapsed, peak)
+
+    for stubber in stubbers:
+        stubber.assert_no_pending_responses()
+    return results
+
+
+def parse_scale(value):
+    value = value.strip().lower()
+    if value.endswith("k"):
+        return int(float(value[:-1]) * 1000)
+    return int(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark collection, stats and rendering")
+    parser.add_argument("--scales", default="1k,10k", help="Comma-separated instance counts, e.g. 1k,10k,100k")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE)
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass")
+    args = parser.parse_args()
+
+    print(f"{'instances':>10} {'phase':<12} {'time (s)':>10} {'peak (MB)':>10}")
+    for scale in args.scales.split(","):
+        instances = parse_scale(scale)
+        vpcs = max(1, instances // (REGIONS * SUBNETS_PER_VPC * INSTANCES_PER_SUBNET))
+        responses = generate_responses(
+            REGIONS, vpcs, SUBNETS_PER_VPC, INSTANCES_PER_SUBNET, SGS_PER_VPC, RULES_PER_SG
+        )
+        total = REGIONS * vpcs * SUBNETS_PER_VPC * INSTANCES_PER_SUBNET
+
+        timings = run_phases(responses, args.page_size, trace_memory=False)
+        memory = {} if args.no_memory else run_phases(responses, args.page_size, trace_memory=True)
+
+        for phase in PHASES:
+            peak = memory.get(phase, (None, None))[1]
+            peak_text = f"{peak / 1e6:10.1f}" if peak is not None else f"{'-':>10}"
+            print(f"{total:>10} {phase:<12} {timings[phase][0]:10.3f} {peak_text}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Compare report rendering through the shared Jinja environment with the
+previous f-string renderer on a synthetic inventory.
+
+Usage (from the project root):
+    python -m benchmarks.bench_render --vpcs 20 --instances 100
+"""
+import argparse
+import time
+from unittest import mock
+from jinja2 import Template
+from aws_inventory.renderers import ec2_renderer, templates
+from aws_inventory.utils import html_report
+from benchmarks import fstring_renderer
+from benchmarks.synthetic import generate_inventory
+
+
+def consume(fragments):
+    """Drain a fragment stream, returning the report size in characters."""
+    return sum(len(fragment) for fragment in fragments)
+
+
+def render_fstring(inventories_by_service):
+    """Previous path: f-string sections and a base template parsed per call."""
+    with mock.patch.multiple(
+        ec2_renderer,
+        render_security_groups=fstring_renderer.render_security_groups,
+        render_region_content=fstring_renderer.render_region_content,
+        render_ec2_stats=fstring_renderer.render_ec2_stats,
+    ), mock.patch.object(
+        html_report, "get_template",
+        lambda name: Template(templates.get_base_html_template()),
+    ):
+        return consume(html_report.render_html(inventories_by_service, "bench"))
+
+
+def render_jinja(inventories_by_service):
+    """Current path: precompiled templates from the shared environment."""
+    return consume(html_report.render_html(inventories_by_service, "bench"))
+
+
+def best_of(func, inventories_by_service, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = func(inventories_by_service)
+        timings.append(time.perf_counter() - start)
+    return min(timings), size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML rendering paths")
+    parser.add_argument("--regions", type=int, default=2)
+    parser.add_argument("--vpcs", type=int, default=10)
+    parser.add_argument("--subnets", type=int, default=4)
+    parser.add_argument("--instances", type=int, default=50, help="Instances per subnet")
+    parser.add_argument("--sgs", type=int, default=20, help="Security groups per VPC")
+    parser.add_argument("--rules", type=int, default=5, help="Rules per direction per SG")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    regions_data = generate_inventory(
+        args.regions, args.vpcs, args.subnets, args.instances, args.sgs, args.rules
+    )
+    inventories_by_service = {"EC2": {"type": "ec2", "regions": regions_data}}
+    total_instances = args.regions * args.vpcs * args.subnets * args.instances
+    print(f"Synthetic inventory: {total_instances} instances, "
+          f"{args.regions * args.vpcs * args.sgs} security groups")
+
+    for label, func in (("f-string", render_fstring), ("jinja env", render_jinja)):
+        seconds, size = best_of(func, inventories_by_service, args.repeat)
+        print(f"{label:>10}: {seconds * 1000:8.1f} ms  ({size / 1e6:.1f} MB of HTML)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Check that the thread and asyncio engines build identical inventories.
+
+The same synthetic EC2 responses are served, page by page, by botocore's
+Stubber to collect_ec2 and by aiobotocore's AioStubber to
+collect_ec2_async, and the inventories of every region are compared. Each
+scenario runs with small pages so every describe call is paginated:
+
+    full          probe, then every resource type
+    tag filter    same, with instances filtered by tag
+    incremental   first incremental run (fingerprint, then full collection)
+    unchanged     second incremental run, answered from the snapshots
+
+Requires aiobotocore (pip install aws_inventory[async]). Run from the
+project root:
+
+    python -m benchmarks.check_engines --instances 500 --page-size 7
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+from unittest import mock
+from botocore.stub import Stubber
+from aiobotocore.stub import AioStubber
+from benchmarks.bench_pipeline import RESULT_KEYS, SerialExecutor
+from benchmarks.synthetic import generate_responses
+from aws_inventory.regional import ec2 as regional_ec2
+from aws_inventory.regional import ec2_async
+from aws_inventory.regional.ec2 import PROBE_PAGE_SIZE, collect_ec2
+from aws_inventory.utils.aio_helpers import AsyncClientFactory
+from aws_inventory.utils.boto_helpers import ClientFactory
+from aws_inventory.utils.snapshot import SnapshotStore
+
+# Shape of the synthetic account
+REGIONS = 2
+VPCS = 3
+SUBNETS_PER_VPC = 3
+SGS_PER_VPC = 6
+RULES_PER_SG = 3
+
+# name: (filters, incremental, collected twice)
+SCENARIOS = {
+    "full": (None, False, False),
+    "tag filter": ({"tags": {"Env": ["prod"]}}, False, False),
+    "incremental": (None, True, False),
+    "unchanged": (None, True, True),
+}
+
+
+def with_instance_statuses(items_by_method):
+    """Add the describe_instance_status items matching the synthetic instances."""
+    items_by_method["describe_instance_status"] = [
+        {"InstanceId": instance["InstanceId"], "InstanceState": instance["State"]}
+        for reservation in items_by_method["describe_instances"]
+        for instance in reservation["Instances"]
+    ]
+    return items_by_method
+
+
+def queue_pages(stubber, method, items, page_size):
+    """Queue every page of a describe call's items."""
+    result_key = RESULT_KEYS.get(method, "InstanceStatuses")
+    pages = [items[i:i + page_size] for i in range(0, len(items), page_size)] or [[]]
+    for number, page in enumerate(pages, 1):
+        response = {result_key: page}
+        if number < len(pages):
+            response["NextToken"] = f"page-{number + 1}"
+        stubber.add_response(method, response)
+
+
+def queue_region(stubber, items_by_method, page_size, incremental, reused):
+    """
+    Queue the responses of one collection of a region, in the order both
+    engines issue the calls when run serially.
+
+    ``reused`` is set when the region's snapshot matches, so only the probe
+    and fingerprint calls are made.
+    """
+    complete = set()
+    for method in ("describe_instances", "describe_vpcs"):
+        items = items_by_method[method]
+        response = {RESULT_KEYS[method]: items[:PROBE_PAGE_SIZE]}
+        if len(items) > PROBE_PAGE_SIZE:
+            response["NextToken"] = "probe"
+        else:
+            complete.add(method)
+        stubber.add_response(method, response)
+
+    if incremental and "describe_instances" not in complete:
+        queue_pages(stubber, "describe_instance_status", items_by_method["describe_instance_status"], page_size)
+    if reused:
+        return
+    for method in RESULT_KEYS:
+        if method not in complete:
+            queue_pages(stubber, method, items_by_method[method], page_size)
+
+
+def collect_threads(responses, page_size, filters, snapshot_path, runs):
+    """Collect every region with collect_ec2, ``runs`` times; return the last inventories."""
+    snapshots = SnapshotStore(snapshot_path) if snapshot_path else None
+    for run in range(runs):
+        client_factory = ClientFactory()
+        stubbers = []
+        for region, items in responses.items():
+            stubber = Stubber(client_factory.client("ec2", region))
+            queue_region(stubber, items, page_size, snapshots is not None, run > 0)
+            stubber.activate()
+            stubbers.append(stubber)
+        # Stubber serves responses in the order they were queued
+        with mock.patch.object(regional_ec2, "ThreadPoolExecutor", SerialExecutor):
+            regions = {
+                region: collect_ec2(client_factory, region, page_size, filters, snapshots)
+                for region in responses
+            }
+        for stubber in stubbers:
+            stubber.assert_no_pending_responses()
+    return regions
+
+
+async def _gather_serially(*awaitables):
+    # AioStubber serves responses in the order they were queued
+    return [await awaitable for awaitable in awaitables]
+
+
+async def collect_async(responses, page_size, filters, snapshot_path, runs):
+    """Collect every region with collect_ec2_async, ``runs`` times; return the last inventories."""
+    snapshots = SnapshotStore(snapshot_path) if snapshot_path else None
+    for run in range(runs):
+        async with AsyncClientFactory() as client_factory:
+            stubbers = []
+            for region, items in responses.items():
+                stubber = AioStubber(await client_factory.client("ec2", region))
+                queue_region(stubber, items, page_size, snapshots is not None, run > 0)
+                stubber.activate()
+                stubbers.append(stubber)
+            with mock.patch.object(ec2_async.asyncio, "gather", _gather_serially):
+                regions = {
+                    region: await ec2_async.collect_ec2_async(
+                        client_factory, region, page_size, filters, snapshots
+                    )
+                    for region in responses
+                }
+            for stubber in stubbers:
+                stubber.assert_no_pending_responses()
+    return regions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that both collection engines build the same inventory")
+    parser.add_argument("--instances", type=int, default=500, help="Instances per region (default: 500)")
+    parser.add_argument("--page-size", type=int, default=7, help="Items per stubbed page (default: 7)")
+    args = parser.parse_args()
+
+    # Credentials are never used: every call is answered by a stubber
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "check")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "check")
+
+    per_subnet = max(1, args.instances // (VPCS * SUBNETS_PER_VPC))
+    responses = generate_responses(REGIONS, VPCS, SUBNETS_PER_VPC, per_subnet, SGS_PER_VPC, RULES_PER_SG)
+    for items in responses.values():
+        with_instance_statuses(items)
+
+    failed = False
+    print(f"{'scenario':<12} {'regions':>8} {'instances':>10}  result")
+    with tempfile.TemporaryDirectory() as folder:
+        for name, (filters, incremental, twice) in SCENARIOS.items():
+            runs = 2 if twice else 1
+            threads = collect_threads(
+                responses, args.page_size, filters,
+                os.path.join(folder, f"{name}-threads.json") if incremental else None, runs
+            )
+            coroutines = asyncio.run(collect_async(
+                responses, args.page_size, filters,
+                os.path.join(folder, f"{name}-async.json") if incremental else None, runs
+            ))
+            same = all(threads[region].to_dict() == coroutines[region].to_dict() for region in responses)
+            failed = failed or not same
+            instances = sum(inventory.stats["instance_count"] for inventory in coroutines.values())
+            print(f"{name:<12} {len(coroutines):>8} {instances:>10}  {'identical' if same else 'DIFFERENT'}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
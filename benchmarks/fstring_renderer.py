@@ -0,0 +1,175 @@
+"""
+F-string versions of the EC2 sections that are now rendered with Jinja
+templates, kept as the baseline for bench_render.py.
+"""
+from aws_inventory.renderers.ec2_renderer import render_sg_rules_table, render_vpc_body
+
+
+def render_security_groups(inventory, vpc, region_safe, vpc_index):
+    """Render security groups section for a VPC."""
+    security_groups = inventory.security_groups_of(vpc.id)
+    if not security_groups:
+        return
+    
+    yield '<div class="mb-4"><h5>Security Groups</h5>'
+    yield f'<div class="accordion" id="sgAccordion{region_safe}{vpc_index}">'
+    
+    for sg_index, sg in enumerate(security_groups, 1):
+        yield f"""
+        <div class="accordion-item">
+          <h2 class="accordion-header">
+            <button class="accordion-button collapsed" type="button"
+                    data-bs-toggle="collapse"
+                    data-bs-target="#sg-{region_safe}-{vpc_index}-{sg_index}"
+                    aria-expanded="false">
+              <code>{sg.id}</code>
+              <span class="ms-2"><strong>{sg.name}</strong></span>
+              <span class="ms-2 text-muted small">{sg.description}</span>
+              <span class="ms-auto me-2">
+                <span class="badge bg-success" title="Inbound rules">
+                  ↓ {len(sg.inbound_rules)}
+                </span>
+                <span class="badge bg-warning text-dark" title="Outbound rules">
+                  ↑ {len(sg.outbound_rules)}
+                </span>
+              </span>
+            </button>
+          </h2>
+          <div id="sg-{region_safe}-{vpc_index}-{sg_index}"
+               class="accordion-collapse collapse">
+            <div class="accordion-body">
+              """
+        yield from render_sg_rules_table(sg, "inbound")
+        yield """
+              """
+        yield from render_sg_rules_table(sg, "outbound")
+        yield """
+            </div>
+          </div>
+        </div>
+        """
+    
+    yield '</div></div>'
+
+
+def render_region_content(regions_data, sg_cache=None):
+    """Render content for each region tab."""
+    yield '<div class="tab-content" id="regionTabContent">'
+    
+    for idx, (region, inventory) in enumerate(regions_data.items(), 1):
+        active_class = "show active" if idx == 1 else ""
+        region_safe = region.replace("-", "")
+        
+        yield f'<div class="tab-pane fade {active_class}" id="region-{idx}" role="tabpanel">'
+        yield f'<div class="accordion" id="vpcAccordion{region_safe}">'
+        
+        if inventory.vpcs:
+            for vpc_index, vpc in enumerate(inventory.vpcs, 1):
+                stats = inventory.stats["vpcs"][vpc.id]
+                vpc_name = f" - {vpc.name}" if vpc.name else ""
+                
+                yield f"""
+                <div class="accordion-item">
+                  <h2 class="accordion-header" id="heading{region_safe}{vpc_index}">
+                    <button class="accordion-button collapsed" type="button" 
+                            data-bs-toggle="collapse" 
+                            data-bs-target="#collapse{region_safe}{vpc_index}"
+                            aria-expanded="false">
+                      <strong>VPC:</strong>&nbsp;{vpc.id} ({vpc.cidr}){vpc_name}
+                      
+                      <span class="ms-3">
+                        <span class="badge bg-info" title="Subnets">
+                          <i class="bi bi-diagram-3"></i> {stats['subnet_count']} subnet(s)
+                        </span>
+                        <span class="badge bg-success ms-1" title="Security Groups">
+                          <i class="bi bi-shield-check"></i> {stats['sg_count']} SG(s)
+                        </span>
+                        <span class="badge bg-primary ms-1" title="Instances">
+                          <i class="bi bi-server"></i> {stats['instance_count']} instance(s)
+                        </span>
+                      </span>
+                    </button>
+                  </h2>
+                  <div id="collapse{region_safe}{vpc_index}" 
+                       class="accordion-collapse collapse" 
+                       data-bs-parent="#vpcAccordion{region_safe}">
+                    <div class="accordion-body">
+                      """
+                yield from render_vpc_body(inventory, vpc, region_safe, vpc_index, sg_cache)
+                yield """
+                    </div>
+                  </div>
+                </div>
+                """
+        else:
+            yield '<div class="alert alert-info">No VPCs found in this region.</div>'
+        
+        yield '</div></div>'
+    
+    yield '</div>'
+
+
+def render_ec2_stats(stats):
+    """Render EC2 statistics dashboard."""
+    yield """
+    <div class="row mb-4">
+      <div class="col-md-2">
+        <div class="card text-center">
+          <div class="card-body">
+            <h5 class="card-title text-primary">{}</h5>
+            <p class="card-text small">VPCs</p>
+          </div>
+        </div>
+      </div>
+      <div class="col-md-2">
+        <div class="card text-center">
+          <div class="card-body">
+            <h5 class="card-title text-info">{}</h5>
+            <p class="card-text small">Subnets</p>
+          </div>
+        </div>
+      </div>
+      <div class="col-md-2">
+        <div class="card text-center">
+          <div class="card-body">
+            <h5 class="card-title text-success">{}</h5>
+            <p class="card-text small">Instances</p>
+          </div>
+        </div>
+      </div>
+      <div class="col-md-2">
+        <div class="card text-center">
+          <div class="card-body">
+            <h5 class="card-title text-warning">{}</h5>
+            <p class="card-text small">Security Groups</p>
+          </div>
+        </div>
+      </div>
+      <div class="col-md-4">
+        <div class="card">
+          <div class="card-body">
+            <h6 class="card-subtitle mb-2 text-muted">Instances by State</h6>
+            <p class="mb-0">
+    """.format(
+        stats['total_vpcs'],
+        stats['total_subnets'],
+        stats['total_instances'],
+        stats['total_security_groups']
+    )
+    
+    for state, count in stats['instances_by_state'].items():
+        if state == "running":
+            badge_class = "bg-success"
+        elif state == "stopped":
+            badge_class = "bg-danger"
+        else:
+            badge_class = "bg-warning"
+        yield f'<span class="badge {badge_class} me-1">{state}: {count}</span>'
+    
+    yield """
+            </p>
+          </div>
+        </div>
+      </div>
+    </div>
+    """
@@ -0,0 +1,201 @@
+"""Synthetic EC2 inventories for benchmarks."""
+import random
+from aws_inventory.collectors.model import (
+    Instance,
+    InternetGateway,
+    Peer,
+    Rule,
+    SecurityGroup,
+    Subnet,
+    Vpc,
+)
+from aws_inventory.collectors.instances import group_instances_by_subnet
+from aws_inventory.collectors.security_groups import group_security_groups_by_vpc
+from aws_inventory.collectors.vpcs import build_region_inventory, group_subnets_by_vpc
+
+STATES = ["running", "running", "running", "stopped", "pending"]
+
+
+def generate_inventory(regions=2, vpcs=5, subnets=4, instances=50, sgs=10, rules=5, seed=0):
+    """
+    Build a {region: RegionInventory} inventory shaped like collect_ec2's output.
+
+    Records go through the same join functions as collect_ec2.
+
+    Args:
+        regions: Number of regions
+        vpcs: VPCs per region
+        subnets: Subnets per VPC
+        instances: Instances per subnet
+        sgs: Security groups per VPC
+        rules: Inbound and outbound rules per security group
+        seed: Random seed, so runs are comparable
+
+    Returns:
+        dict: Map of region name to RegionInventory
+    """
+    rnd = random.Random(seed)
+    regions_data = {}
+
+    for r in range(regions):
+        region = f"region-{r}"
+        region_vpcs = []
+        region_subnets = []
+        region_instances = []
+        sg_map = {}
+        igws_by_vpc = {}
+        for v in range(vpcs):
+            vpc_id = f"vpc-{r:02d}{v:04d}"
+            vpc_sg_ids = [f"sg-{r:02d}{v:04d}{g:04d}" for g in range(sgs)]
+            for sg_id in vpc_sg_ids:
+                sg_map[sg_id] = _security_group(rnd, sg_id, f"vpc-{r:02d}{v:04d}", rules, sgs)
+            for s in range(subnets):
+                subnet_id = f"subnet-{r:02d}{v:04d}{s:04d}"
+                region_subnets.append(Subnet(
+                    id=subnet_id,
+                    vpc_id=f"vpc-{r:02d}{v:04d}",
+                    name=f"subnet-{s}",
+                    cidr=f"10.{v % 256}.{s % 256}.0/24",
+                    az=f"{region}{'abc'[s % 3]}",
+                ))
+                region_instances.extend(
+                    _instance(rnd, f"i-{r:02d}{v:04d}{s:04d}{i:05d}", f"subnet-{r:02d}{v:04d}{s:04d}",
+                              v, s, i, vpc_sg_ids)
+                    for i in range(instances)
+                )
+            region_vpcs.append(Vpc(id=vpc_id, name=f"vpc-{v}", cidr=f"10.{v % 256}.0.0/16"))
+            igws_by_vpc[vpc_id] = [InternetGateway(id=f"igw-{r:02d}{v:04d}", name=None)]
+
+        regions_data[region] = build_region_inventory(
+            region_vpcs,
+            group_subnets_by_vpc(region_subnets),
+            group_instances_by_subnet(region_instances),
+            sg_map,
+            group_security_groups_by_vpc(sg_map),
+            igws_by_vpc,
+        )
+
+    return regions_data
+
+
+def _security_group(rnd, sg_id, vpc_id, rules, sgs):
+    def rule():
+        port = rnd.choice([22, 80, 443, 5432, 6379, 8080])
+        return Rule(
+            protocol="tcp",
+            from_port=port,
+            to_port=port,
+            peers=(
+                Peer(type="cidr", value=f"10.{rnd.randrange(256)}.0.0/16", description="office"),
+                Peer(type="sg", value=f"{sg_id[:-4]}{rnd.randrange(sgs):04d}", description=""),
+            ),
+        )
+
+    return SecurityGroup(
+        id=sg_id,
+        name=f"sg-{sg_id[-4:]}",
+        description="synthetic security group",
+        vpc_id=vpc_id,
+        inbound_rules=tuple(rule() for _ in range(rules)),
+        outbound_rules=tuple(rule() for _ in range(rules)),
+    )
+
+
+def _instance(rnd, instance_id, subnet_id, v, s, i, vpc_sg_ids):
+    return Instance(
+        id=instance_id,
+        name=f"host-{i}",
+        type=rnd.choice(["t3.micro", "m5.large", "c6i.xlarge"]),
+        state=rnd.choice(STATES),
+        private_ip=f"10.{v % 256}.{s % 256}.{i % 250 + 4}",
+        public_ip=None,
+        subnet_id=subnet_id,
+        security_group_ids=rnd.sample(vpc_sg_ids, min(2, len(vpc_sg_ids))),
+    )
+
+
+def generate_responses(regions=2, vpcs=5, subnets=4, instances=50, sgs=10, rules=5, seed=0):
+    """
+    Build raw describe_* items, shaped like EC2 API responses.
+
+    Args:
+        Same as generate_inventory
+
+    Returns:
+        dict: Map of region name to {client method: list of raw items}, where
+        describe_instances items are reservations of one instance each
+    """
+    rnd = random.Random(seed)
+    responses = {}
+
+    for r in range(regions):
+        region = f"region-{r}"
+        items = {
+            "describe_security_groups": [],
+            "describe_internet_gateways": [],
+            "describe_subnets": [],
+            "describe_vpcs": [],
+            "describe_instances": [],
+        }
+        for v in range(vpcs):
+            vpc_id = f"vpc-{r:02d}{v:04d}"
+            sg_ids = [f"sg-{r:02d}{v:04d}{g:04d}" for g in range(sgs)]
+            items["describe_vpcs"].append({
+                "VpcId": vpc_id,
+                "CidrBlock": f"10.{v % 256}.0.0/16",
+                "Tags": [{"Key": "Name", "Value": f"vpc-{v}"}],
+            })
+            items["describe_internet_gateways"].append({
+                "InternetGatewayId": f"igw-{r:02d}{v:04d}",
+                "Attachments": [{"VpcId": vpc_id, "State": "available"}],
+            })
+            for sg_id in sg_ids:
+                items["describe_security_groups"].append(_raw_security_group(rnd, sg_id, vpc_id, sg_ids, rules))
+            for s in range(subnets):
+                subnet_id = f"subnet-{r:02d}{v:04d}{s:04d}"
+                items["describe_subnets"].append({
+                    "SubnetId": subnet_id,
+                    "VpcId": vpc_id,
+                    "CidrBlock": f"10.{v % 256}.{s % 256}.0/24",
+                    "AvailabilityZone": f"{region}{'abc'[s % 3]}",
+                    "Tags": [{"Key": "Name", "Value": f"subnet-{s}"}],
+                })
+                for i in range(instances):
+                    state = rnd.choice(STATES)
+                    items["describe_instances"].append({"Instances": [{
+                        "InstanceId": f"i-{r:02d}{v:04d}{s:04d}{i:05d}",
+                        "InstanceType": rnd.choice(["t3.micro", "m5.large", "c6i.xlarge"]),
+                        "State": {"Name": state, "Code": 16},
+                        "PrivateIpAddress": f"10.{v % 256}.{s % 256}.{i % 250 + 4}",
+                        "SubnetId": subnet_id,
+                        "VpcId": vpc_id,
+                        "SecurityGroups": [
+                            {"GroupId": sg_id, "GroupName": f"sg-{sg_id[-4:]}"}
+                            for sg_id in rnd.sample(sg_ids, min(2, len(sg_ids)))
+                        ],
+                        "Tags": [{"Key": "Name", "Value": f"host-{i}"}],
+                    }]})
+        responses[region] = items
+
+    return responses
+
+
+def _raw_security_group(rnd, sg_id, vpc_id, sg_ids, rules):
+    def permission():
+        port = rnd.choice([22, 80, 443, 5432, 6379, 8080])
+        return {
+            "IpProtocol": "tcp",
+            "FromPort": port,
+            "ToPort": port,
+            "IpRanges": [{"CidrIp": f"10.{rnd.randrange(256)}.0.0/16", "Description": "office"}],
+            "UserIdGroupPairs": [{"GroupId": rnd.choice(sg_ids)}],
+        }
+
+    return {
+        "GroupId": sg_id,
+        "GroupName": f"sg-{sg_id[-4:]}",
+        "Description": "synthetic security group",
+        "VpcId": vpc_id,
+        "IpPermissions": [permission() for _ in range(rules)],
+        "IpPermissionsEgress": [permission() for _ in range(rules)],
+    }
@@ -10,6 +10,10 @@ setup(
         "tqdm>=4.66.0",
         "python-dateutil>=2.9.0"
     ],
+    extras_require={
+        "fast": ["orjson>=3.9"],
+        "async": ["aiobotocore>=2.5"],
+    },
     python_requires=">=3.9",
     entry_points={
         "console_scripts": [